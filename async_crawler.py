@@ -0,0 +1,517 @@
+"""
+Asyncio fetch engine for the crawler.
+
+A small HTTP/1.1 client on asyncio streams (standard library only) with:
+
+  - keep-alive connection pooling per (scheme, host, port)
+  - a global cap on in-flight fetches plus a per-host cap
+  - redirects, chunked / Content-Length bodies and gzip/deflate decoding
+  - a per-page byte budget and Content-Type check before the body is read
+
+This is the engine behind SimpleCrawler.crawl_urls and iter_crawl. Fetches
+go through the crawler's host health (retries with backoff, circuit
+breaker) and page cache, and pages are parsed with
+SimpleCrawler.extract_page_info on a thread pool (which hands them to the
+extraction processes when those are enabled).
+
+Every request takes a global slot and then a slot of its host, always in
+that order, and the timeout starts only once both are held: requests
+queued behind a busy host wait for it instead of timing out.
+
+    crawler = AsyncCrawler(max_concurrency=200, per_host=8)
+    articles = crawler.crawl_urls(urls)
+"""
+import asyncio
+import concurrent.futures
+import queue
+import ssl
+import threading
+import zlib
+from collections import defaultdict, namedtuple
+from datetime import datetime
+from typing import List, Dict, Tuple, Optional, Callable
+from urllib.parse import urlsplit, urljoin
+
+from crawl_frontier import CrawlFrontier
+from crawler3 import SimpleCrawler
+from host_health import RETRYABLE_STATUSES
+
+# status is None when no response arrived; retryable marks connection errors
+FetchResult = namedtuple('FetchResult', ['url', 'status', 'headers', 'body', 'error', 'retryable'],
+                         defaults=(False,))
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+class HTTPError(Exception):
+    pass
+
+
+class ContentRejected(Exception):
+    """The response headers show a body the crawler does not want"""
+
+    def __init__(self, message: str, status: int, headers: Dict[str, str]):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers
+
+
+class _Connection:
+    """One open keep-alive connection"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ConnectionPool:
+    """Idle keep-alive connections, keyed by (scheme, host, port)"""
+
+    def __init__(self, max_idle_per_host: int = 8):
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[Tuple[str, str, int], List[_Connection]] = defaultdict(list)
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self.opened = 0
+        self.reused = 0
+
+    async def acquire(self, key: Tuple[str, str, int]) -> Tuple[_Connection, bool]:
+        """An idle connection for the key, or a new one; returns (connection, reused)"""
+        idle = self._idle.get(key)
+        while idle:
+            conn = idle.pop()
+            if not conn.reader.at_eof() and not conn.writer.is_closing():
+                self.reused += 1
+                return conn, True
+            conn.close()
+
+        scheme, host, port = key
+        if scheme == 'https':
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            reader, writer = await asyncio.open_connection(host, port, ssl=self._ssl_context, server_hostname=host)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        self.opened += 1
+        return _Connection(reader, writer), False
+
+    def release(self, key: Tuple[str, str, int], conn: _Connection, reusable: bool) -> None:
+        idle = self._idle[key]
+        if reusable and len(idle) < self.max_idle_per_host:
+            idle.append(conn)
+        else:
+            conn.close()
+
+    def close(self) -> None:
+        for idle in self._idle.values():
+            for conn in idle:
+                conn.close()
+        self._idle.clear()
+
+
+class AsyncFetcher:
+    """Concurrent HTTP/1.1 GET client with pooled connections"""
+
+    def __init__(self, max_concurrency: int = 200, per_host: int = 8, timeout: float = 10,
+                 max_redirects: int = 5, headers: Optional[Dict[str, str]] = None,
+                 max_body_bytes: Optional[int] = None,
+                 content_type_filter: Optional[Callable[[str], bool]] = None):
+        self.max_concurrency = max_concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.headers = dict(headers or {})
+        # Bodies are cut off after max_body_bytes (None = no limit), and 2xx
+        # responses whose Content-Type fails the filter are not downloaded at all
+        self.max_body_bytes = max_body_bytes
+        self.content_type_filter = content_type_filter
+        self.pool = ConnectionPool(max_idle_per_host=per_host)
+        # Semaphores are created lazily so they bind to the running loop.
+        # Always acquired global first, then per-host (see _request_in_slots)
+        self._global_slots: Optional[asyncio.Semaphore] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self.requests = 0
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host)
+        return self._host_slots[host]
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        """GET a URL, following redirects; errors are returned, not raised"""
+        try:
+            return await self._fetch_following_redirects(url, headers or {})
+        except asyncio.TimeoutError:
+            # Before OSError: TimeoutError is one. Not retryable, like SimpleCrawler's timeouts
+            return FetchResult(url, None, {}, b'', f"timed out after {self.timeout}s")
+        except ContentRejected as e:
+            return FetchResult(url, e.status, e.headers, b'', str(e))
+        except (OSError, asyncio.IncompleteReadError) as e:
+            return FetchResult(url, None, {}, b'', str(e) or type(e).__name__, True)
+        except (HTTPError, ValueError, zlib.error) as e:
+            return FetchResult(url, None, {}, b'', str(e) or type(e).__name__)
+
+    async def _fetch_following_redirects(self, url: str, extra_headers: Dict[str, str]) -> FetchResult:
+        current = url
+        for _ in range(self.max_redirects + 1):
+            parts = urlsplit(current)
+            if parts.scheme not in ('http', 'https') or not parts.hostname:
+                raise ValueError(f"unsupported URL: {current}")
+            status, headers, body = await self._request_in_slots(parts, extra_headers)
+            location = headers.get('location')
+            if status in REDIRECT_STATUSES and location:
+                current = urljoin(current, location)
+                continue
+            return FetchResult(current, status, headers, body, None)
+        raise HTTPError(f"too many redirects (>{self.max_redirects})")
+
+    async def _request_in_slots(self, parts, extra_headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """One request, sent once a global slot and a slot of its host are held"""
+        if self._global_slots is None:
+            self._global_slots = asyncio.Semaphore(self.max_concurrency)
+        async with self._global_slots:
+            async with self._host_semaphore(parts.hostname):
+                # Waiting for slots is not part of the timeout
+                return await asyncio.wait_for(self._request(parts, extra_headers), self.timeout)
+
+    async def _request(self, parts, extra_headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        request_headers = {
+            'Host': host,
+            'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.8',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        }
+        request_headers.update(self.headers)
+        request_headers.update(extra_headers)
+        request = f"GET {path} HTTP/1.1\r\n" + ''.join(f"{k}: {v}\r\n" for k, v in request_headers.items()) + "\r\n"
+
+        while True:
+            conn, reused = await self.pool.acquire(key)
+            try:
+                conn.writer.write(request.encode('latin-1'))
+                await conn.writer.drain()
+                status, headers, body, reusable = await self._read_response(conn.reader)
+            except (OSError, asyncio.IncompleteReadError, HTTPError):
+                conn.close()
+                if reused:
+                    # The server dropped an idle keep-alive connection; retry on a fresh one
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            self.requests += 1
+            self.pool.release(key, conn, reusable)
+            return status, headers, body
+
+    async def _read_response(self, reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes, bool]:
+        while True:
+            status_line = await reader.readline()
+            if not status_line:
+                raise HTTPError("connection closed before response")
+            try:
+                version, status_text = status_line.decode('latin-1').split(None, 2)[:2]
+                status = int(status_text)
+            except ValueError:
+                raise HTTPError(f"malformed status line: {status_line[:80]!r}")
+
+            headers: Dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                name = name.strip().lower()
+                value = value.strip()
+                headers[name] = f"{headers[name]}, {value}" if name in headers else value
+
+            # Skip interim responses (100 Continue, 103 Early Hints)
+            if 100 <= status < 200:
+                continue
+            break
+
+        connection = headers.get('connection', '').lower()
+        reusable = version == 'HTTP/1.1' and 'close' not in connection
+
+        if status in (204, 304):
+            return status, headers, b'', reusable
+
+        content_type = headers.get('content-type', '')
+        if 200 <= status < 300 and self.content_type_filter and not self.content_type_filter(content_type):
+            raise ContentRejected(f"unsupported content type: {content_type}", status, headers)
+
+        limit = self.max_body_bytes
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            body, complete = await self._read_chunked(reader, limit)
+        elif 'content-length' in headers:
+            length = int(headers['content-length'])
+            complete = limit is None or length <= limit
+            body = await reader.readexactly(length if complete else limit)
+        else:
+            # Body delimited by connection close
+            body, _ = await self._read_until_eof(reader, limit)
+            complete = False
+        # A partially read body leaves the connection unusable
+        reusable = reusable and complete
+
+        return status, headers, self._decode(body, headers.get('content-encoding', ''), limit), reusable
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader, limit: Optional[int]) -> Tuple[bytes, bool]:
+        """(body, complete); stops early once limit bytes were read"""
+        chunks = []
+        received = 0
+        while True:
+            size_line = await reader.readline()
+            if not size_line:
+                raise HTTPError("connection closed inside chunked body")
+            size = int(size_line.split(b';', 1)[0].strip() or b'0', 16)
+            if size == 0:
+                # Trailer headers, terminated by an empty line
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks), True
+            if limit is not None and received + size > limit:
+                chunks.append(await reader.readexactly(limit - received))
+                return b''.join(chunks), False
+            chunks.append(await reader.readexactly(size))
+            received += size
+            await reader.readexactly(2)
+
+    @staticmethod
+    async def _read_until_eof(reader: asyncio.StreamReader, limit: Optional[int]) -> Tuple[bytes, bool]:
+        if limit is None:
+            return await reader.read(), True
+        buffer = bytearray()
+        while len(buffer) < limit:
+            data = await reader.read(limit - len(buffer))
+            if not data:
+                return bytes(buffer), True
+            buffer += data
+        return bytes(buffer), False
+
+    @staticmethod
+    def _decode(body: bytes, encoding: str, limit: Optional[int] = None) -> bytes:
+        """Undo Content-Encoding; tolerates bodies truncated by the byte budget"""
+        encoding = encoding.lower().strip()
+        if not body or encoding in ('', 'identity'):
+            return body
+        if encoding in ('gzip', 'x-gzip'):
+            wbits_options = [16 + zlib.MAX_WBITS]
+        elif encoding == 'deflate':
+            # zlib-wrapped, or raw deflate stream without the zlib header
+            wbits_options = [zlib.MAX_WBITS, -zlib.MAX_WBITS]
+        else:
+            raise HTTPError(f"unsupported content encoding: {encoding}")
+
+        for wbits in wbits_options:
+            try:
+                return zlib.decompressobj(wbits).decompress(body, limit or 0)
+            except zlib.error:
+                if wbits == wbits_options[-1]:
+                    raise
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class CrawlRun:
+    """
+    A crawl running on its own event loop thread (see AsyncCrawler.start).
+    `results` receives (url, article or None) as each URL finishes, then None.
+    """
+
+    def __init__(self):
+        self.results: "queue.Queue[Optional[Tuple[str, Optional[Dict]]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopped = False
+
+    def _attach(self, loop: asyncio.AbstractEventLoop, task: asyncio.Task) -> bool:
+        with self._lock:
+            if self._stopped:
+                return False
+            self._loop, self._task = loop, task
+            return True
+
+    def stop(self) -> None:
+        """Cancel the fetches still outstanding"""
+        with self._lock:
+            self._stopped = True
+            loop, task = self._loop, self._task
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                # The loop is closed: the crawl already finished
+                pass
+
+
+class AsyncCrawler:
+    """Asyncio fetch engine for a SimpleCrawler's settings, cache and host health"""
+
+    def __init__(self, crawler: Optional[SimpleCrawler] = None, max_concurrency: Optional[int] = None,
+                 per_host: Optional[int] = None, timeout: Optional[float] = None):
+        self.crawler = crawler or SimpleCrawler()
+        # Limits default to the crawler's own
+        self.max_concurrency = max_concurrency or self.crawler.max_in_flight
+        self.per_host = per_host or self.crawler.per_host
+        self.timeout = timeout or self.crawler.timeout
+
+    @staticmethod
+    def _article(url: str, title: str, content: str) -> Dict:
+        return {
+            "url": url,
+            "title": title,
+            "content": content,
+            "timestamp": datetime.utcnow().isoformat() + 'Z'
+        }
+
+    def _fetcher(self) -> AsyncFetcher:
+        return AsyncFetcher(self.max_concurrency, self.per_host, self.timeout, headers=self.crawler.headers,
+                            max_body_bytes=self.crawler.max_page_bytes,
+                            content_type_filter=self.crawler.is_html_content_type)
+
+    async def _fetch_with_retries(self, fetcher: AsyncFetcher, url: str,
+                                  headers: Optional[Dict[str, str]]) -> FetchResult:
+        """
+        Async counterpart of SimpleCrawler._get_with_retries: connection errors
+        and 5xx/429 are retried with backoff, and the host's circuit breaker
+        is respected. Every attempt is recorded as a success or failure.
+        """
+        health = self.crawler.host_health
+        host = CrawlFrontier.host_of(url)
+        skipped = FetchResult(url, None, {}, b'', f"{host} is failing; skipped for a cool-down period")
+        if not health.allow(host):
+            return skipped
+
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            start = loop.time()
+            try:
+                result = await fetcher.fetch(url, headers)
+            except BaseException:
+                # Cancelled (deadline, superseded search): says nothing about the host
+                health.abandon(host)
+                raise
+            if result.status is not None and result.status not in RETRYABLE_STATUSES:
+                health.record_success(host, retried=attempt > 0)
+                return result
+            health.record_failure(host, loop.time() - start)
+            if not (result.retryable or result.status in RETRYABLE_STATUSES) or attempt >= health.max_retries:
+                return result
+
+            await asyncio.sleep(health.backoff(attempt, result.headers.get('retry-after')))
+            # Another fetch may have opened the circuit meanwhile
+            if not health.allow(host):
+                return skipped
+            health.record_retry()
+            attempt += 1
+
+    async def _crawl_one(self, fetcher: AsyncFetcher, url: str) -> Optional[Dict]:
+        crawler = self.crawler
+        cache = crawler.cache
+        extractor = crawler.extractor.name
+        entry = None
+        if cache is not None:
+            entry, fresh = cache.lookup(url, extractor)
+            if fresh:
+                return self._article(url, entry.title, entry.content)
+
+        result = await self._fetch_with_retries(fetcher, url,
+                                                cache.conditional_headers(entry) if entry is not None else None)
+        if result.error is not None:
+            print(f"Error fetching {url}: {result.error}")
+            return None
+        if entry is not None and result.status == 304:
+            cache.touch(url)
+            return self._article(url, entry.title, entry.content)
+        if result.status >= 400:
+            print(f"Error fetching {url}: HTTP {result.status}")
+            return None
+
+        loop = asyncio.get_running_loop()
+        try:
+            # Parsing is CPU-bound; keep it off the event loop (see _use_extraction_threads)
+            title, content = await loop.run_in_executor(None, crawler.extract_page_info, result.body)
+        except Exception as exc:
+            print(f'{url} generated an exception: {exc}')
+            return None
+
+        if not crawler.fetch_succeeded(title, content):
+            return None
+        if cache is not None:
+            cache.put(url, title, content, result.headers.get('etag'), result.headers.get('last-modified'),
+                      extractor)
+        return self._article(url, title, content)
+
+    def _use_extraction_threads(self) -> None:
+        """Parse pages on the crawler's fetch_workers threads (the running loop's default executor)"""
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.crawler.fetch_workers)
+        asyncio.get_running_loop().set_default_executor(executor)
+
+    async def crawl(self, urls: List[str]) -> List[Dict]:
+        """Fetch and extract all URLs concurrently; results keep the input order"""
+        self._use_extraction_threads()
+        fetcher = self._fetcher()
+        try:
+            urls = [url for url in urls if not self.crawler.is_seen(url)]
+            pages = await asyncio.gather(*(self._crawl_one(fetcher, url) for url in urls))
+        finally:
+            fetcher.close()
+        pages = [page for page in pages if page is not None]
+        self.crawler.mark_seen(page["url"] for page in pages)
+        return pages
+
+    def crawl_urls(self, urls: List[str]) -> List[Dict]:
+        """Blocking entry point with the same contract as SimpleCrawler.crawl_urls"""
+        return asyncio.run(self.crawl(urls))
+
+    def start(self, urls: List[str]) -> CrawlRun:
+        """
+        Crawl on a background event loop thread and return at once. Results
+        arrive on run.results in completion order; run.stop() cancels the rest.
+        """
+        run = CrawlRun()
+
+        async def crawl_one(fetcher: AsyncFetcher, url: str) -> Tuple[str, Optional[Dict]]:
+            try:
+                return url, await self._crawl_one(fetcher, url)
+            except Exception as exc:
+                print(f'{url} generated an exception: {exc}')
+                return url, None
+
+        async def main() -> None:
+            if not run._attach(asyncio.get_running_loop(), asyncio.current_task()):
+                return
+            self._use_extraction_threads()
+            fetcher = self._fetcher()
+            tasks = [asyncio.ensure_future(crawl_one(fetcher, url)) for url in urls]
+            try:
+                for finished in asyncio.as_completed(tasks):
+                    run.results.put(await finished)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                fetcher.close()
+
+        def run_loop() -> None:
+            try:
+                asyncio.run(main())
+            except asyncio.CancelledError:
+                pass
+            finally:
+                run.results.put(None)
+
+        threading.Thread(target=run_loop, name="async-crawl", daemon=True).start()
+        return run
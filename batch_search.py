@@ -0,0 +1,125 @@
+"""
+Batch search from the command line.
+
+Reads one query per line from a file (or stdin), ranks the queries in
+parallel across worker processes and streams one JSON record per query:
+
+    {"query": ..., "results": [{"id": ..., "score": ...}], "suggestion": ..., "latency_ms": ...}
+
+The index is loaded once in the parent. Where the platform can fork, workers
+share that loaded snapshot copy-on-write; otherwise each worker loads its own
+copy at startup.
+
+    python batch_search.py queries.txt -o results.jsonl --workers 4
+    cat queries.txt | python batch_search.py --top-k 5
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, Any, Iterator, Optional, TextIO
+
+from indexer import ArticleIndexer
+from tfidf import TFIDFRanker
+
+# Ranker used by the current (worker) process
+_RANKER: Optional[TFIDFRanker] = None
+_TOP_K = 15
+
+
+def load_ranker(json_file: str) -> TFIDFRanker:
+    indexer = ArticleIndexer(json_file)
+    indexer.index_all()
+    return TFIDFRanker(indexer)
+
+
+def _init_worker(json_file: Optional[str], top_k: int) -> None:
+    """Pool initializer; json_file is None when the ranker was inherited through fork"""
+    global _RANKER, _TOP_K
+    _TOP_K = top_k
+    if json_file is not None:
+        _RANKER = load_ranker(json_file)
+
+
+def rank_query(query: str) -> Dict[str, Any]:
+    """Rank one query with the process's ranker and build its output record"""
+    start = time.perf_counter()
+    ranked, suggestion = _RANKER.rank_articles(query, top_k=_TOP_K, min_score=0.001)
+    return {
+        "query": query,
+        "results": [{"id": article.unique_id, "score": score} for article, score in ranked],
+        "suggestion": suggestion,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def read_queries(stream: TextIO) -> Iterator[str]:
+    for line in stream:
+        query = line.strip()
+        if query:
+            yield query
+
+
+def run_batch(queries: Iterator[str], output: TextIO, json_file: str = "articles.json",
+              workers: int = 1, top_k: int = 15, chunksize: int = 4) -> int:
+    """Rank every query and write JSONL records in input order; returns the count"""
+    global _RANKER, _TOP_K
+    # Keep the indexer's progress prints out of the JSONL stream
+    with contextlib.redirect_stdout(sys.stderr):
+        ranker = load_ranker(json_file)
+    count = 0
+
+    if workers <= 1:
+        _RANKER, _TOP_K = ranker, top_k
+        for query in queries:
+            output.write(json.dumps(rank_query(query), ensure_ascii=False) + "\n")
+            output.flush()
+            count += 1
+        return count
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        # Children inherit the already-built index instead of rebuilding it
+        context = multiprocessing.get_context("fork")
+        _RANKER = ranker
+        initargs = (None, top_k)
+    else:
+        context = multiprocessing.get_context()
+        initargs = (json_file, top_k)
+
+    with context.Pool(processes=workers, initializer=_init_worker, initargs=initargs) as pool:
+        for record in pool.imap(rank_query, queries, chunksize=chunksize):
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank a batch of queries and emit JSONL")
+    parser.add_argument("queries", nargs="?", default="-", help="query file, one per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output JSONL file ('-' for stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--top-k", type=int, default=15)
+    parser.add_argument("--chunksize", type=int, default=4, help="queries sent to a worker at a time")
+    parser.add_argument("--articles", default="articles.json")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.queries == "-" else open(args.queries, "r", encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        count = run_batch(read_queries(source), output, args.articles, args.workers, args.top_k, args.chunksize)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - start
+    print(f"Ranked {count} queries in {elapsed:.2f}s with {args.workers} worker(s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark the HTML-to-text extractors in crawler3.
+
+Runs every available extractor over saved HTML pages and reports throughput
+plus whether its (title, content) output is identical to the BeautifulSoup
+reference extractor. The main_content extractor drops boilerplate on purpose,
+so --reduction reports how many indexable tokens that removes instead.
+
+    python benchmark_extractors.py                       # fixtures/html/*.html
+    python benchmark_extractors.py saved_pages/ --repeat 50
+    python benchmark_extractors.py --workers 0 1 2 4     # crawler extraction processes
+    python benchmark_extractors.py --reduction           # tokens removed by main_content
+"""
+import argparse
+import difflib
+import glob
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict, Any
+
+from crawler3 import available_extractors, get_extractor, SoupExtractor, SimpleCrawler
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "html")
+
+
+def load_pages(paths: List[str]) -> List[Tuple[str, bytes]]:
+    """(name, raw bytes) of every .html file among the paths (files or directories)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.htm*"))))
+        else:
+            files.append(path)
+    pages = []
+    for file_path in files:
+        with open(file_path, "rb") as f:
+            pages.append((os.path.basename(file_path), f.read()))
+    return pages
+
+
+def benchmark(pages: List[Tuple[str, bytes]], repeat: int = 20) -> List[Dict[str, Any]]:
+    reference = SoupExtractor()
+    expected = {name: reference.extract(html) for name, html in pages}
+    total_bytes = sum(len(html) for _, html in pages)
+
+    report = []
+    for name in available_extractors():
+        extractor = get_extractor(name)
+        outputs = {page_name: extractor.extract(html) for page_name, html in pages}
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for _, html in pages:
+                extractor.extract(html)
+        elapsed = time.perf_counter() - start
+
+        mismatches = []
+        for page_name, output in outputs.items():
+            if output != expected[page_name]:
+                ratio = difflib.SequenceMatcher(None, output[1], expected[page_name][1], autojunk=False).ratio()
+                mismatches.append((page_name, output[0] == expected[page_name][0], ratio))
+
+        report.append({
+            "extractor": name,
+            "pages_per_s": len(pages) * repeat / elapsed,
+            "mb_per_s": total_bytes * repeat / elapsed / 1e6,
+            "identical": len(pages) - len(mismatches),
+            "mismatches": mismatches,
+        })
+    return report
+
+
+def token_reduction(pages: List[Tuple[str, bytes]], baseline: str = "streaming",
+                    extractor: str = "main_content") -> Dict[str, Any]:
+    """Index tokens (the indexer's [a-z]+ words) per page under both extractors"""
+    tokenize = re.compile(r'\b[a-z]+\b').findall
+    full, reduced = get_extractor(baseline), get_extractor(extractor)
+    rows = []
+    for name, html in pages:
+        rows.append((name, len(tokenize(full.extract(html)[1].lower())),
+                     len(tokenize(reduced.extract(html)[1].lower()))))
+    total_full = sum(row[1] for row in rows)
+    total_reduced = sum(row[2] for row in rows)
+    return {
+        "pages": rows,
+        "baseline_tokens": total_full,
+        "tokens": total_reduced,
+        "reduction": 1 - total_reduced / total_full if total_full else 0.0,
+    }
+
+
+def benchmark_workers(pages: List[Tuple[str, bytes]], worker_counts: List[int], repeat: int = 20,
+                      extractor: str = "soup") -> List[Tuple[int, float]]:
+    """(extraction_workers, pages/s) for SimpleCrawler.extract_page_info called from fetch threads"""
+    report = []
+    for workers in worker_counts:
+        crawler = SimpleCrawler(extractor=extractor, extraction_workers=workers)
+        fetch_threads = max(crawler.fetch_workers, workers * 2)
+        batch = [html for _, html in pages] * repeat
+        try:
+            with ThreadPoolExecutor(max_workers=fetch_threads) as threads:
+                # Warm up every process so start-up is not measured
+                list(threads.map(crawler.extract_page_info, [pages[0][1]] * fetch_threads))
+                start = time.perf_counter()
+                list(threads.map(crawler.extract_page_info, batch))
+                elapsed = time.perf_counter() - start
+        finally:
+            crawler.close()
+        report.append((workers, len(batch) / elapsed))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HTML extractor speed and output")
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_FIXTURES], help="HTML files or directories")
+    parser.add_argument("--repeat", type=int, default=20, help="passes over the pages per extractor")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        help="instead, time crawler extraction with these process counts (0 = in-thread)")
+    parser.add_argument("--extractor", default="soup", help="extractor used with --workers")
+    parser.add_argument("--reduction", action="store_true",
+                        help="instead, count index tokens kept by main_content vs streaming")
+    args = parser.parse_args()
+
+    pages = load_pages(args.paths)
+    if not pages:
+        parser.error("no HTML files found")
+    print(f"{len(pages)} pages, {sum(len(h) for _, h in pages) / 1024:.1f} KiB, {args.repeat} passes\n")
+
+    if args.reduction:
+        report = token_reduction(pages)
+        print(f"{'page':<32}{'streaming':>10}{'main':>8}{'removed':>9}")
+        for page_name, full, kept in report["pages"]:
+            print(f"{page_name:<32}{full:>10}{kept:>8}{1 - kept / full if full else 0:>9.1%}")
+        print(f"{'total':<32}{report['baseline_tokens']:>10}{report['tokens']:>8}{report['reduction']:>9.1%}")
+        return
+
+    if args.workers:
+        print(f"{'processes':<12}{'pages/s':>10}   ({args.extractor}, {os.cpu_count()} CPUs)")
+        for workers, pages_per_s in benchmark_workers(pages, args.workers, args.repeat, args.extractor):
+            print(f"{workers:<12}{pages_per_s:>10.1f}")
+        return
+
+    report = benchmark(pages, args.repeat)
+    baseline = report[0]["pages_per_s"]
+    print(f"{'extractor':<12}{'pages/s':>10}{'MB/s':>8}{'speedup':>9}   identical to soup")
+    for row in report:
+        print(f"{row['extractor']:<12}{row['pages_per_s']:>10.1f}{row['mb_per_s']:>8.2f}"
+              f"{row['pages_per_s'] / baseline:>8.2f}x   {row['identical']}/{len(pages)}")
+        for page_name, same_title, ratio in row["mismatches"]:
+            print(f"{'':<12}  {page_name}: title {'same' if same_title else 'differs'}, content similarity {ratio:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Append-only crawl output with resume support.
+
+Every crawled article is written to a JSONL file the moment it is fetched,
+one line per article:
+
+    {"topic": "1. DDoS Attack", "queries": [...], "article": {"unique_id": ..., "url": ..., ...}}
+
+The file doubles as the checkpoint: on restart, the URLs it already holds
+are treated as completed and skipped. A line torn by a crash is discarded;
+a corrupt line elsewhere is skipped, so the records after it survive.
+compact() turns the JSONL into the topic-grouped JSON file ArticleIndexer
+reads.
+
+    python crawl_checkpoint.py articles_crawl.jsonl articles_with_content.json
+"""
+import json
+import os
+import sys
+import threading
+from typing import Dict, List, Set, Iterator, Optional
+
+from page_cache import normalize_url
+
+DEFAULT_CHECKPOINT_FILE = "articles_crawl.jsonl"
+
+
+def read_records(path: str) -> Iterator[Dict]:
+    """Complete records of a crawl JSONL file; a torn last line is skipped"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith('\n'):
+                break
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+class CrawlCheckpoint:
+    """Thread-safe JSONL article log that remembers which URLs are done"""
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_FILE, fsync: bool = False):
+        self.path = path
+        # fsync after every article: survives power loss, not just a crash
+        self.fsync = fsync
+        self.completed: Set[str] = set()
+        self._lock = threading.Lock()
+        self._repair_and_load()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _repair_and_load(self) -> None:
+        """Load completed URLs and cut off a partially written last line"""
+        if not os.path.exists(self.path):
+            return
+        valid_bytes = 0
+        corrupt = 0
+        with open(self.path, 'rb') as f:
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    # Only the last line can lack its newline
+                    break
+                valid_bytes += len(raw)
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    # Skipped, as read_records does; later records are kept
+                    corrupt += 1
+                    continue
+                self.completed.add(normalize_url(record['article']['url']))
+        if corrupt:
+            print(f"Skipped {corrupt} corrupt record(s) in {self.path}")
+        if valid_bytes != os.path.getsize(self.path):
+            print(f"Discarding torn record at the end of {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_bytes)
+
+    def is_completed(self, url: str) -> bool:
+        return normalize_url(url) in self.completed
+
+    def append(self, topic: str, queries: List[str], article: Dict) -> None:
+        line = json.dumps({"topic": topic, "queries": queries, "article": article}, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.completed.add(normalize_url(article['url']))
+
+    def __len__(self) -> int:
+        return len(self.completed)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> 'CrawlCheckpoint':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def compact(jsonl_path: str, json_path: str, indent: Optional[int] = None) -> int:
+    """
+    Convert a crawl JSONL file into ArticleIndexer's input format. Topics keep
+    their first-seen order and articles are sorted by id; if an article id
+    was written more than once, the latest record wins. Returns the article count.
+    """
+    topics: Dict[str, Dict] = {}
+    for record in read_records(jsonl_path):
+        topic = topics.setdefault(record['topic'], {
+            "topic": record['topic'],
+            "queries": record.get('queries', []),
+            "articles": {},
+        })
+        article = record['article']
+        topic["articles"][article['unique_id']] = article
+
+    count = 0
+    tmp_path = json_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        output = []
+        for topic in topics.values():
+            articles = [topic["articles"][key] for key in sorted(topic["articles"])]
+            count += len(articles)
+            output.append({"topic": topic["topic"], "queries": topic["queries"], "articles": articles})
+        json.dump(output, f, indent=indent, ensure_ascii=False)
+    # Readers never see a half-written file
+    os.replace(tmp_path, json_path)
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python crawl_checkpoint.py <crawl.jsonl> <articles.json>")
+        sys.exit(1)
+    print(f"Compacted {compact(sys.argv[1], sys.argv[2])} articles into {sys.argv[2]}")
@@ -0,0 +1,111 @@
+"""
+Crawl frontier with per-host politeness.
+
+URLs wait in one priority queue per host. A host is handed out to at most
+one fetcher at a time, and only once its next-allowed time has passed. The
+next-allowed time is set to politeness_delay after its previous fetch
+finished. Different hosts are therefore crawled in parallel while each
+host sees at most one request per delay.
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, List, Tuple, Optional
+from urllib.parse import urlsplit
+
+from data_structures import BloomFilter
+from page_cache import normalize_url
+
+
+class CrawlFrontier:
+    """Thread-safe priority frontier; lower priority values are fetched first"""
+
+    def __init__(self, politeness_delay: float = 1.0, seen: Optional[BloomFilter] = None):
+        self.politeness_delay = politeness_delay
+        # URLs ever accepted into the frontier (shareable across frontiers)
+        self.seen = seen if seen is not None else BloomFilter()
+        self._pending: Dict[str, List[Tuple[float, int, str]]] = {}
+        # (next allowed time, host) for hosts with pending URLs and no fetch in flight
+        self._ready: List[Tuple[float, str]] = []
+        self._next_allowed: Dict[str, float] = {}
+        self._in_flight: Dict[str, str] = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._closed = False
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return (urlsplit(url).hostname or '').lower()
+
+    def add(self, url: str, priority: float = 0) -> bool:
+        """Queue a URL unless it was seen before; returns whether it was queued"""
+        host = self.host_of(url)
+        with self._condition:
+            if not self.seen.add(normalize_url(url)):
+                return False
+            queue = self._pending.get(host)
+            if queue is None:
+                queue = self._pending[host] = []
+                if host not in self._in_flight:
+                    heapq.heappush(self._ready, (self._next_allowed.get(host, 0.0), host))
+            heapq.heappush(queue, (priority, next(self._sequence), url))
+            self._condition.notify()
+        return True
+
+    def next_url(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Block until some host may be fetched and return its best URL. Returns
+        None once the frontier is exhausted (nothing pending or in flight),
+        closed, or the timeout expired.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while not self._closed:
+                now = time.monotonic()
+                if self._ready and self._ready[0][0] <= now:
+                    _, host = heapq.heappop(self._ready)
+                    queue = self._pending[host]
+                    _, _, url = heapq.heappop(queue)
+                    if not queue:
+                        del self._pending[host]
+                    self._in_flight[host] = url
+                    return url
+                if not self._ready and not self._in_flight:
+                    return None
+
+                wait = self._ready[0][0] - now if self._ready else None
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return None
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._condition.wait(wait)
+            return None
+
+    def done(self, url: str) -> None:
+        """Report a fetch as finished; its host becomes eligible again after the delay"""
+        host = self.host_of(url)
+        with self._condition:
+            self._in_flight.pop(host, None)
+            allowed_at = time.monotonic() + self.politeness_delay
+            self._next_allowed[host] = allowed_at
+            if host in self._pending:
+                heapq.heappush(self._ready, (allowed_at, host))
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Wake every waiting fetcher and stop handing out URLs"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return sum(len(queue) for queue in self._pending.values())
+
+    @property
+    def hosts(self) -> int:
+        """Number of hosts with pending URLs"""
+        with self._condition:
+            return len(self._pending)
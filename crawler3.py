@@ -1,80 +1,660 @@
-import json
-import requests
+import re
 from datetime import datetime
-from bs4 import BeautifulSoup
-from bs4 import BeautifulSoup
-import time
+from html.parser import HTMLParser
 import concurrent.futures
-from typing import List, Dict
+import importlib.util
+import multiprocessing
+import queue
+import threading
+import time
+from typing import List, Dict, Optional, Tuple, Iterator
+from page_cache import PageCache, normalize_url
+from crawl_frontier import CrawlFrontier
+from crawl_checkpoint import CrawlCheckpoint, DEFAULT_CHECKPOINT_FILE, compact
+from data_structures import BloomFilter
+from host_health import HostHealth, CircuitOpenError, RETRYABLE_STATUSES
 
-class SimpleCrawler:
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+DEFAULT_MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+MAX_CONTENT_CHARS = 50000
+
+# requests, bs4 and lxml take ~120ms to import between them, so they are
+# imported on first use rather than when the GUI (or anything else) starts
+
+
+def decode_markup(html: bytes) -> str:
+    """Same encoding detection BeautifulSoup applies to bytes"""
+    from bs4.dammit import UnicodeDammit
+    return UnicodeDammit(html, is_html=True).unicode_markup or ''
+
+
+def clean_text(text: str) -> str:
+    """Collapse page text: strip every line, split on double spaces, join with single spaces"""
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return ' '.join(chunk for chunk in chunks if chunk)
+
+
+# ==================== HTML EXTRACTORS ====================
+class HTMLExtractor:
+    """Turns downloaded HTML (bytes or str) into a (title, content) pair"""
+    name = "base"
+    
+    def extract(self, html) -> Tuple[str, str]:
+        raise NotImplementedError
+
+
+class SoupExtractor(HTMLExtractor):
+    """Reference implementation: BeautifulSoup DOM, decompose scripts/styles, get_text()"""
+    name = "soup"
+    
+    def extract(self, html) -> Tuple[str, str]:
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Get title
+        title = "No title found"
+        if soup.title:
+            title = soup.title.string.strip()
+        
+        # Get content 
+        # Remove scripts and styles
+        for script in soup(["script", "style"]):
+            script.decompose()
+        
+        # Get text
+        content = clean_text(soup.get_text())
+        
+        return title, content[:MAX_CONTENT_CHARS]  # Limit content size
+
+
+class _TextCollector(HTMLParser):
+    """Single pass over the markup collecting text outside script/style"""
+    
+    SKIPPED_TAGS = {'script', 'style'}
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.title_parts: Optional[List[str]] = None
+        self.in_title = False
+        self.title_done = False
+        self.skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self.skip_depth += 1
+        elif tag == 'title' and not self.title_done:
+            self.in_title = True
+            self.title_parts = []
+    
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS:
+            if self.skip_depth:
+                self.skip_depth -= 1
+        elif tag == 'title' and self.in_title:
+            self.in_title = False
+            self.title_done = True
+    
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        self.parts.append(data)
+        if self.in_title:
+            self.title_parts.append(data)
+    
+    def unknown_decl(self, data):
+        # <![CDATA[...]]> sections count as text, like BeautifulSoup's CData
+        if data.startswith('CDATA['):
+            self.handle_data(data[6:])
+
+
+class StreamingExtractor(HTMLExtractor):
+    """html.parser event stream without building a DOM; matches SoupExtractor output"""
+    name = "streaming"
+    
+    def extract(self, html) -> Tuple[str, str]:
+        if isinstance(html, bytes):
+            html = decode_markup(html)
+        collector = _TextCollector()
+        collector.feed(html)
+        collector.close()
+        
+        title = "No title found"
+        if collector.title_parts:
+            title = ''.join(collector.title_parts).strip()
+        
+        content = clean_text(''.join(collector.parts))
+        return title, content[:MAX_CONTENT_CHARS]
+
+
+class LxmlExtractor(HTMLExtractor):
+    """libxml2 HTML parser (needs the optional lxml package)"""
+    name = "lxml"
+    
     def __init__(self):
+        if importlib.util.find_spec('lxml') is None:
+            raise ImportError("lxml is not installed")
+    
+    def extract(self, html) -> Tuple[str, str]:
+        from lxml import etree as lxml_etree, html as lxml_html
+        if isinstance(html, bytes):
+            html = decode_markup(html)
+        if not html.strip():
+            return "No title found", ""
+        document = lxml_html.document_fromstring(html)
+        
+        title = "No title found"
+        title_element = document.find('.//title')
+        if title_element is not None:
+            title = (title_element.text_content() or '').strip() or title
+        
+        lxml_etree.strip_elements(document, 'script', 'style', with_tail=False)
+        content = clean_text(document.text_content())
+        return title, content[:MAX_CONTENT_CHARS]
+
+
+class _BlockCollector(HTMLParser):
+    """
+    Splits the page into text blocks at block-level tags and records, per
+    block, its word count, link density and whether it sits inside a
+    navigation-like container (nav/footer/aside/form or a menu-ish class/id).
+    """
+    
+    SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'svg'}
+    BLOCK_TAGS = {
+        'address', 'article', 'aside', 'blockquote', 'body', 'caption', 'dd', 'div', 'dl', 'dt',
+        'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+        'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'td', 'th', 'tr', 'ul', 'br', 'hr',
+        'html', 'menu', 'button', 'select', 'textarea',
+    }
+    BOILERPLATE_TAGS = {'nav', 'footer', 'aside', 'form', 'menu', 'button', 'select', 'textarea'}
+    BOILERPLATE_ATTR = re.compile(
+        r'(^|[\s_-])(nav|navbar|navigation|menu|footer|breadcrumbs?|sidebar|cookies?|consent|banner|'
+        r'social|share|subscribe|newsletter|related|comments?|promo|advert|ads|skip)($|[\s_-])', re.I)
+    VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param',
+                 'source', 'track', 'wbr'}
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # (tag, is_boilerplate) for every open element
+        self.stack: List[Tuple[str, bool]] = []
+        self.boilerplate_depth = 0
+        self.content_depth = 0
+        self.link_depth = 0
+        self.skip_depth = 0
+        self.title_parts: Optional[List[str]] = None
+        self.in_title = False
+        self.title_done = False
+        # Finished blocks: (tag, text, words, link_words, boilerplate)
+        self.blocks: List[Tuple[str, str, int, int, bool]] = []
+        self._block_tag = 'body'
+        self._parts: List[str] = []
+        self._link_parts: List[str] = []
+    
+    def _flush(self, next_tag: str) -> None:
+        text = clean_text(''.join(self._parts))
+        if text:
+            words = len(text.split())
+            link_words = len(' '.join(self._link_parts).split())
+            self.blocks.append((self._block_tag, text, words, link_words, self.boilerplate_depth > 0))
+        self._parts = []
+        self._link_parts = []
+        self._block_tag = next_tag
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self.skip_depth += 1
+            return
+        if tag == 'title' and not self.title_done:
+            self.in_title = True
+            self.title_parts = []
+            return
+        if tag in self.BLOCK_TAGS:
+            self._flush(tag)
+        if tag == 'a':
+            self.link_depth += 1
+        if tag in self.VOID_TAGS:
+            return
+        
+        attributes = dict(attrs)
+        marker = f"{attributes.get('class') or ''} {attributes.get('id') or ''} {attributes.get('role') or ''}"
+        boilerplate = (
+            tag in self.BOILERPLATE_TAGS
+            # A page-level <header> is navigation; one inside <article>/<main> holds the headline
+            or (tag == 'header' and not self.content_depth)
+            or bool(self.BOILERPLATE_ATTR.search(marker))
+        )
+        if boilerplate:
+            self.boilerplate_depth += 1
+        if tag in ('article', 'main'):
+            self.content_depth += 1
+        self.stack.append((tag, boilerplate))
+    
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS:
+            if self.skip_depth:
+                self.skip_depth -= 1
+            return
+        if tag == 'title':
+            if self.in_title:
+                self.in_title = False
+                self.title_done = True
+            return
+        if tag in self.BLOCK_TAGS:
+            self._flush('body')
+        if tag == 'a' and self.link_depth:
+            self.link_depth -= 1
+        # Close the matching element and anything left unclosed inside it
+        if not any(open_tag == tag for open_tag, _ in self.stack):
+            return
+        while self.stack:
+            open_tag, boilerplate = self.stack.pop()
+            if boilerplate:
+                self.boilerplate_depth -= 1
+            if open_tag in ('article', 'main'):
+                self.content_depth -= 1
+            if open_tag == tag:
+                break
+    
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        if self.in_title:
+            self.title_parts.append(data)
+            return
+        self._parts.append(data)
+        if self.link_depth:
+            self._link_parts.append(data)
+    
+    def close(self):
+        super().close()
+        self._flush('body')
+
+
+class MainContentExtractor(HTMLExtractor):
+    """
+    Keeps the page's main text and drops navigation, menus and footers.
+    Blocks inside navigation-like containers, and blocks made mostly of link
+    text, are dropped. Long low-link-density blocks are content. Runs of short
+    blocks (list items, table cells) survive only when they touch content,
+    and headings only when content follows them.
+    """
+    name = "main_content"
+    
+    MAX_LINK_DENSITY = 0.33
+    MIN_CONTENT_WORDS = 12
+    MIN_SHORT_WORDS = 3
+    HEADINGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+    # Cells and list items may be a single word and still belong to the text
+    ITEM_TAGS = {'li', 'dt', 'dd', 'td', 'th'}
+    
+    def extract(self, html) -> Tuple[str, str]:
+        if isinstance(html, bytes):
+            html = decode_markup(html)
+        collector = _BlockCollector()
+        collector.feed(html)
+        collector.close()
+        
+        title = "No title found"
+        if collector.title_parts:
+            title = ''.join(collector.title_parts).strip()
+        
+        kept = self.select_blocks(collector.blocks)
+        if not kept:
+            # Nothing looks like an article; fall back to the full page text
+            return StreamingExtractor().extract(html)
+        
+        # The title is indexed on its own; repeating it here would count its terms twice
+        return title, ' '.join(kept)[:MAX_CONTENT_CHARS]
+    
+    def select_blocks(self, blocks: List[Tuple[str, str, int, int, bool]]) -> List[str]:
+        labels = []
+        for tag, _, words, link_words, boilerplate in blocks:
+            link_density = link_words / words
+            if boilerplate or link_density > self.MAX_LINK_DENSITY:
+                labels.append('boilerplate')
+            elif words >= self.MIN_CONTENT_WORDS:
+                labels.append('content')
+            elif tag in self.HEADINGS:
+                labels.append('heading')
+            else:
+                labels.append('short')
+        
+        # Short blocks next to content become content themselves, so a whole
+        # list or table attached to a paragraph is kept
+        keep = [label == 'content' for label in labels]
+        for order in (range(len(blocks)), range(len(blocks) - 1, -1, -1)):
+            for i in order:
+                tag, _, words = blocks[i][:3]
+                if labels[i] == 'short' and not keep[i] and (words >= self.MIN_SHORT_WORDS or tag in self.ITEM_TAGS):
+                    keep[i] = (i > 0 and keep[i - 1]) or (i + 1 < len(blocks) and keep[i + 1])
+        
+        kept = []
+        for i, (_, text, _, _, _) in enumerate(blocks):
+            if labels[i] == 'heading':
+                # Keep headings that introduce kept text
+                if any(keep[j] for j in range(i + 1, min(len(blocks), i + 4)) if labels[j] != 'heading'):
+                    kept.append(text)
+            elif keep[i]:
+                kept.append(text)
+        return kept
+
+
+EXTRACTORS = {
+    SoupExtractor.name: SoupExtractor,
+    StreamingExtractor.name: StreamingExtractor,
+    LxmlExtractor.name: LxmlExtractor,
+    MainContentExtractor.name: MainContentExtractor,
+}
+
+
+DEFAULT_EXTRACTOR = MainContentExtractor.name
+
+
+def extract_in_worker(extractor: HTMLExtractor, html) -> Tuple[str, str]:
+    """Extraction entry point for the process pool (module level so it pickles)"""
+    return extractor.extract(html)
+
+
+def available_extractors() -> List[str]:
+    """Names of the extractors usable in this environment"""
+    return [name for name in EXTRACTORS if name != LxmlExtractor.name
+            or importlib.util.find_spec('lxml') is not None]
+
+
+def get_extractor(extractor=None) -> HTMLExtractor:
+    """Extractor instance from a name, an instance, or None for the default"""
+    if isinstance(extractor, HTMLExtractor):
+        return extractor
+    return EXTRACTORS[extractor or DEFAULT_EXTRACTOR]()
+
+
+class SimpleCrawler:
+    # Seconds between cancellation checks while iter_crawl waits for pages
+    CANCEL_POLL_INTERVAL = 0.1
+    
+    def __init__(self, cache: Optional[PageCache] = None, max_page_bytes: int = DEFAULT_MAX_PAGE_BYTES,
+                 extractor=None, fetch_workers: int = 5, extraction_workers: int = 0,
+                 max_in_flight: int = 200, per_host: int = 8):
+        # Optional persistent page cache (see page_cache.py)
+        self.cache = cache
+        # Download budget per page; the rest of larger pages is never read
+        self.max_page_bytes = max_page_bytes
+        # HTML-to-text extractor: name from EXTRACTORS or an HTMLExtractor instance
+        self.extractor = get_extractor(extractor)
+        # Threads that parse the pages iter_crawl downloads; with
+        # extraction_workers > 0 they hand the raw bytes to that many
+        # processes, so parsing runs outside the GIL
+        self.fetch_workers = fetch_workers
+        self.extraction_workers = extraction_workers
+        # iter_crawl/crawl_urls: fetches in flight at once, overall and per host
+        self.max_in_flight = max_in_flight
+        self.per_host = per_host
+        self._extraction_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # One requests.Session for every fetch, so connections to a host are
+        # kept alive and reused instead of reopened (TCP + TLS) per page
+        self._session = None
+        # Minimum gap between two requests to the same host in crawl_topic
+        self.politeness_delay = 1.0
+        self.max_parallel_hosts = 16
+        # Normalized URLs already crawled or indexed; these are never fetched again
+        self.seen_urls = BloomFilter()
+        # Per-host retries with backoff and circuit breaking (see host_health.py)
+        self.host_health = HostHealth()
+        self.timeout = 10
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        self.results = []
         
     def get_page_info(self, url):
         """Extract title and content from a webpage"""
+        entry = None
+        if self.cache is not None:
+            entry, fresh = self.cache.lookup(url, self.extractor.name)
+            if fresh:
+                return entry.title, entry.content
+        
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Get title
-            title = "No title found"
-            if soup.title:
-                title = soup.title.string.strip()
-            
-            # Get content 
-            # Remove scripts and styles
-            for script in soup(["script", "style"]):
-                script.decompose()
+            headers = self.headers
+            if entry is not None:
+                headers = dict(self.headers, **self.cache.conditional_headers(entry))
+            with self._get_with_retries(url, headers) as response:
+                if entry is not None and response.status_code == 304:
+                    # Unchanged since the cached copy; nothing to download or parse
+                    self.cache.touch(url)
+                    return entry.title, entry.content
+                
+                content_type = response.headers.get('Content-Type', '')
+                if not self.is_html_content_type(content_type):
+                    print(f"Skipping {url}: not HTML ({content_type})")
+                    return "Error fetching page", f"Unsupported content type: {content_type}"
+                
+                html = self.read_capped(response, self.max_page_bytes)
             
-            # Get text
-            content = soup.get_text()
-            
-            # Clean up whitespace
-            lines = (line.strip() for line in content.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            content = ' '.join(chunk for chunk in chunks if chunk)
-            
-            return title, content[:50000]  # Limit content size
+            title, content = self.extract_page_info(html)
+            if self.cache is not None and response.ok:
+                self.cache.put(url, title, content, response.headers.get('ETag'),
+                               response.headers.get('Last-Modified'), self.extractor.name)
+            return title, content
             
         except Exception as e:
             print(f"Error fetching {url}: {e}")
             return "Error fetching page", f"Error details: {str(e)}"
     
+    def _get_with_retries(self, url, headers):
+        """
+        Streamed GET that retries 5xx/429 responses and connection errors with
+        backoff and respects the host's circuit breaker. Returns the response
+        or raises once the host is out of retries or skipped.
+        """
+        health = self.host_health
+        host = CrawlFrontier.host_of(url)
+        if not health.allow(host):
+            raise CircuitOpenError(f"{host} is failing; skipped for a cool-down period")
+        
+        import requests
+        session = self._http_session()
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            retry_after = None
+            try:
+                response = session.get(url, headers=headers, timeout=self.timeout, stream=True)
+            except requests.Timeout:
+                # Not retried: another attempt would tie up the worker just as long
+                health.record_failure(host, time.monotonic() - start)
+                raise
+            except requests.ConnectionError:
+                health.record_failure(host, time.monotonic() - start)
+                if attempt >= health.max_retries:
+                    raise
+            except Exception:
+                # TooManyRedirects, InvalidSchema, ...: not retried, but still
+                # recorded so a half-open probe never stays outstanding
+                health.record_failure(host, time.monotonic() - start)
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUSES:
+                    health.record_success(host, retried=attempt > 0)
+                    return response
+                health.record_failure(host, time.monotonic() - start)
+                retry_after = response.headers.get('Retry-After')
+                response.close()
+                if attempt >= health.max_retries:
+                    raise requests.HTTPError(f"HTTP {response.status_code} after {attempt + 1} attempts")
+            
+            time.sleep(health.backoff(attempt, retry_after))
+            # Another worker may have opened the circuit meanwhile
+            if not health.allow(host):
+                raise CircuitOpenError(f"{host} is failing; skipped for a cool-down period")
+            health.record_retry()
+            attempt += 1
+    
+    def _http_session(self):
+        """Shared keep-alive session, created on first use"""
+        with self._pool_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                # One pooled connection per fetch thread and host; retries are
+                # handled by _get_with_retries, not by urllib3
+                adapter = HTTPAdapter(pool_connections=self.max_parallel_hosts,
+                                      pool_maxsize=max(self.fetch_workers, self.max_parallel_hosts), max_retries=0)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
+    
+    @staticmethod
+    def is_html_content_type(content_type: str) -> bool:
+        """True for HTML types, and for a missing header (let the parser decide)"""
+        media_type = content_type.split(';', 1)[0].strip().lower()
+        return not media_type or media_type in HTML_CONTENT_TYPES
+    
+    @staticmethod
+    def read_capped(response, max_bytes: int) -> bytes:
+        """Read a streamed response body, stopping after max_bytes"""
+        buffer = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            buffer += chunk
+            if len(buffer) >= max_bytes:
+                break
+        return bytes(buffer[:max_bytes])
+    
+    def extract_page_info(self, html):
+        """Extract title and content from downloaded HTML (bytes or str)"""
+        pool = self._extraction_executor()
+        if pool is None:
+            return self.extractor.extract(html)
+        # The calling fetch thread waits without holding the GIL
+        return pool.submit(extract_in_worker, self.extractor, html).result()
+    
+    def _extraction_executor(self) -> Optional[concurrent.futures.ProcessPoolExecutor]:
+        """Process pool for extraction, started on first use (None when disabled)"""
+        if self.extraction_workers <= 0:
+            return None
+        with self._pool_lock:
+            if self._extraction_pool is None:
+                # forkserver/spawn children do not inherit the crawler's threads and locks
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._extraction_pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.extraction_workers, mp_context=context)
+            return self._extraction_pool
+    
+    def close(self) -> None:
+        """Stop the extraction processes and close pooled connections"""
+        with self._pool_lock:
+            if self._extraction_pool is not None:
+                self._extraction_pool.shutdown(wait=True, cancel_futures=True)
+                self._extraction_pool = None
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+    
+    def mark_seen(self, urls) -> None:
+        """Record URLs (e.g. already indexed ones) that should not be crawled again"""
+        for url in urls:
+            if url:
+                self.seen_urls.add(normalize_url(url))
+    
+    def is_seen(self, url: str) -> bool:
+        return normalize_url(url) in self.seen_urls
+    
+    @staticmethod
+    def fetch_succeeded(title: str, content: str) -> bool:
+        """False for the error pages get_page_info returns instead of raising"""
+        return bool(title and content) and not title.startswith("Error fetching")
+    
     def crawl_urls(self, urls: List[str]) -> List[Dict]:
         """Crawl a list of URLs concurrently"""
-        results = []
+        return list(self.iter_crawl(urls))
+    
+    def iter_crawl(self, urls: List[str], deadline: Optional[float] = None,
+                   cancel: Optional[threading.Event] = None) -> Iterator[Dict]:
+        """
+        Crawl URLs concurrently on the asyncio engine (async_crawler.py),
+        yielding each article as soon as its page is ready. Pages still
+        outstanding `deadline` seconds after the start are dropped and their
+        fetches cancelled. Setting `cancel` stops the crawl the same way:
+        queued fetches never start and nothing more is yielded.
+        """
+        for batch in self.iter_crawl_batches(urls, deadline=deadline, cancel=cancel):
+            yield from batch
+    
+    def iter_crawl_batches(self, urls: List[str], deadline: Optional[float] = None,
+                           cancel: Optional[threading.Event] = None, window: float = 0.0) -> Iterator[List[Dict]]:
+        """
+        iter_crawl, but yields lists: the articles that arrived within
+        `window` seconds of the first one in the list. A batch is never held
+        past the deadline; with window=0 every article comes on its own.
+        """
+        urls = [url for url in urls if not self.is_seen(url)]
+        if not urls:
+            return
         
-        # Use ThreadPoolExecutor for concurrent fetching
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            # Create a dictionary to map futures to URLs
-            future_to_url = {executor.submit(self.get_page_info, url): url for url in urls}
-            
-            for future in concurrent.futures.as_completed(future_to_url):
-                url = future_to_url[future]
+        # Imported here: async_crawler imports this module
+        from async_crawler import AsyncCrawler
+        start = time.monotonic()
+        run = AsyncCrawler(self).start(urls)
+        outstanding = set(urls)
+        batch: List[Dict] = []
+        batch_due = 0.0
+        try:
+            while outstanding:
+                if cancel is not None and cancel.is_set():
+                    print(f"Crawl cancelled; dropped {len(outstanding)} page(s)")
+                    return
+                now = time.monotonic()
+                timeout = None
+                if deadline is not None:
+                    timeout = deadline - (now - start)
+                    if timeout <= 0:
+                        if batch:
+                            yield batch
+                        late = [url for url in urls if url in outstanding]
+                        print(f"Crawl deadline of {deadline}s reached; dropped {len(late)} slow page(s): {late}")
+                        return
+                if batch:
+                    if now >= batch_due:
+                        yield batch
+                        batch = []
+                        continue
+                    timeout = batch_due - now if timeout is None else min(timeout, batch_due - now)
+                if cancel is not None:
+                    # Wake up regularly to notice cancellation
+                    timeout = self.CANCEL_POLL_INTERVAL if timeout is None else min(timeout, self.CANCEL_POLL_INTERVAL)
                 try:
-                    title, content = future.result()
-                    
-                    # Filter out failed fetches
-                    if title and content and not title.startswith("Error fetching"):
-                        # Generate a temporary ID (will be handled by indexer properly later)
-                        # We use timestamp for uniqueness in this batch
-                        results.append({
-                            "url": url,
-                            "title": title,
-                            "content": content,
-                            "timestamp": datetime.utcnow().isoformat() + 'Z'
-                        })
-                except Exception as exc:
-                    print(f'{url} generated an exception: {exc}')
-                    
-        return results
-
-    def crawl_topic(self, topic_name, queries, urls):
-        """Process URLs for a specific topic"""
+                    item = run.results.get(timeout=timeout)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    # The event loop thread ended
+                    break
+                url, article = item
+                outstanding.discard(url)
+                # Failed fetches come back as None
+                if article is not None:
+                    self.mark_seen([url])
+                    if not batch:
+                        batch_due = time.monotonic() + window
+                    batch.append(article)
+            if batch and not (cancel is not None and cancel.is_set()):
+                yield batch
+        finally:
+            # Do not wait for dropped fetches
+            run.stop()
+
+    def crawl_topic(self, topic_name, queries, urls, checkpoint: Optional[CrawlCheckpoint] = None):
+        """
+        Process URLs for a specific topic. With a checkpoint, every article is
+        appended to it as soon as it is fetched and URLs it already holds are
+        skipped, so an interrupted crawl resumes where it stopped.
+        """
         print(f"\nProcessing: {topic_name}")
         
         topic_data = {
@@ -82,34 +662,57 @@ class SimpleCrawler:
             "queries": queries,
             "articles": []
         }
+        prefix = topic_name.split('.')[0].strip()
         
+        # Hosts are fetched in parallel; each host waits politeness_delay between requests.
+        # The frontier only dedups this topic's list: a URL joins seen_urls (and
+        # the checkpoint) once it was fetched, so failed fetches can be retried
+        frontier = CrawlFrontier(self.politeness_delay)
+        positions = {}
         for idx, url in enumerate(urls):
-            print(f"  [{idx+1}/{len(urls)}] Fetching: {url}")
-            
-            title, content = self.get_page_info(url)
-            
-            prefix = topic_name.split('.')[0].strip()
-            unique_id = f"article_{prefix}_{idx+1:03d}"
-            
-            article = {
-                "unique_id": unique_id,
-                "timestamp": datetime.utcnow().isoformat() + 'Z',
-                "url": url,
-                "title": title,
-                "content": content  
-            }
-            
-            topic_data["articles"].append(article)
-            time.sleep(1) 
+            if checkpoint is not None and checkpoint.is_completed(url):
+                print(f"  Skipping (checkpointed): {url}")
+                continue
+            if not self.is_seen(url) and frontier.add(url, priority=idx):
+                positions[url] = idx
+            else:
+                print(f"  Skipping already crawled: {url}")
         
+        articles = {}
+        
+        def fetch_next():
+            while True:
+                url = frontier.next_url()
+                if url is None:
+                    return
+                idx = positions[url]
+                print(f"  [{idx+1}/{len(urls)}] Fetching: {url}")
+                try:
+                    title, content = self.get_page_info(url)
+                finally:
+                    frontier.done(url)
+                
+                article = {
+                    "unique_id": f"article_{prefix}_{idx+1:03d}",
+                    "timestamp": datetime.utcnow().isoformat() + 'Z',
+                    "url": url,
+                    "title": title,
+                    "content": content  
+                }
+                articles[idx] = article
+                if self.fetch_succeeded(title, content):
+                    self.mark_seen([url])
+                    if checkpoint is not None:
+                        checkpoint.append(topic_name, queries, article)
+        
+        workers = max(1, min(self.max_parallel_hosts, frontier.hosts))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(fetch_next) for _ in range(workers)]:
+                future.result()
+        
+        topic_data["articles"] = [articles[idx] for idx in sorted(articles)]
         return topic_data
     
-    def save_results(self, filename="articles_full.json"):
-        """Save to JSON file"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False)
-        print(f"\nSaved to {filename}")
-
 
 
 def main():
@@ -228,16 +831,26 @@ def main():
         }
     ]
     
-    for topic in topics:
-        topic_data = crawler.crawl_topic(
-            topic['name'],
-            topic['queries'],
-            topic['urls']
-        )
-        crawler.results.append(topic_data)
+    # Articles are appended to the checkpoint as they arrive; rerunning after
+    # a crash skips everything already in it
+    try:
+        with CrawlCheckpoint(DEFAULT_CHECKPOINT_FILE) as checkpoint:
+            if len(checkpoint):
+                print(f"Resuming: {len(checkpoint)} URLs already crawled")
+            for topic in topics:
+                crawler.crawl_topic(
+                    topic['name'],
+                    topic['queries'],
+                    topic['urls'],
+                    checkpoint=checkpoint
+                )
+    finally:
+        # Stops the extraction processes and closes pooled connections
+        crawler.close()
     
-    crawler.save_results("articles_with_content.json")
-    print("\nDone! All article content has been saved.")
+    print(f"\nHost health: {crawler.host_health.metrics()}")
+    count = compact(DEFAULT_CHECKPOINT_FILE, "articles_with_content.json")
+    print(f"\nDone! {count} articles have been saved to articles_with_content.json")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,12 @@
 """
 Advanced Data Structures Implementation
-Implements: Stack, Queue, Tree, Graph
+Implements: Stack, Queue, Tree, Graph, Trie, MinHash LSH, SimHash, Bloom filter
 """
-from collections import deque
-from typing import List, Dict, Set, Optional, Any, TYPE_CHECKING, Tuple
+import hashlib
+import math
+from collections import deque, defaultdict, Counter
+from functools import lru_cache
+from typing import List, Dict, Set, Optional, Any, TYPE_CHECKING, Tuple, Iterable, Mapping
 
 if TYPE_CHECKING:
     from indexer import Article
@@ -108,89 +111,173 @@ class Queue:
 class TreeNode:
     """Node for binary tree"""
     
-    def __init__(self, data: Any):
+    def __init__(self, data: Any, key: Any = None):
         self.data = data
+        self.key = key
+        self.height: int = 1
         self.left: Optional['TreeNode'] = None
         self.right: Optional['TreeNode'] = None
 
 
 class BinarySearchTree:
-    """Binary Search Tree implementation"""
+    """
+    Self-balancing (AVL) Binary Search Tree with iterative operations.
+    Articles are keyed by unique_id, anything else by its string form.
+    Sequential inserts (article_1_001, article_1_002, ...) stay O(log n)
+    deep instead of degenerating into a linked list.
+    """
     
     def __init__(self):
         self.root: Optional[TreeNode] = None
+        self._size: int = 0
+    
+    @staticmethod
+    def _key(data: Any) -> str:
+        """Ordering key (unique_id for articles, string representation otherwise)"""
+        if hasattr(data, 'unique_id'):
+            return data.unique_id
+        return str(data)
+    
+    @staticmethod
+    def _height(node: Optional[TreeNode]) -> int:
+        return node.height if node else 0
+    
+    def _update_height(self, node: TreeNode) -> None:
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+    
+    def _rotate_right(self, node: TreeNode) -> TreeNode:
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update_height(node)
+        self._update_height(pivot)
+        return pivot
+    
+    def _rotate_left(self, node: TreeNode) -> TreeNode:
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update_height(node)
+        self._update_height(pivot)
+        return pivot
+    
+    def _rebalance(self, node: TreeNode) -> TreeNode:
+        """Restore the AVL property at node, returning the subtree's new root"""
+        self._update_height(node)
+        balance = self._height(node.left) - self._height(node.right)
+        if balance > 1:
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
     
     def insert(self, data: Any) -> None:
         """Insert data into BST"""
-        self.root = self._insert_recursive(self.root, data)
-    
-    def _insert_recursive(self, node: Optional[TreeNode], data: Any) -> TreeNode:
-        """Recursive insert helper"""
-        if node is None:
-            return TreeNode(data)
+        key = self._key(data)
+        new_node = TreeNode(data, key)
+        self._size += 1
+        if self.root is None:
+            self.root = new_node
+            return
         
-        # Compare based on string representation for articles (check for unique_id attribute)
-        if hasattr(data, 'unique_id') and hasattr(node.data, 'unique_id'):
-            if data.unique_id < node.data.unique_id:
-                node.left = self._insert_recursive(node.left, data)
-            else:
-                node.right = self._insert_recursive(node.right, data)
-        elif str(data) < str(node.data):
-            node.left = self._insert_recursive(node.left, data)
+        # Walk down remembering the path, then rebalance bottom-up
+        path: List[TreeNode] = []
+        node = self.root
+        while node:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = new_node
         else:
-            node.right = self._insert_recursive(node.right, data)
+            parent.right = new_node
         
-        return node
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            subtree_root = self._rebalance(node)
+            if subtree_root is node:
+                continue
+            if i == 0:
+                self.root = subtree_root
+            elif path[i - 1].left is node:
+                path[i - 1].left = subtree_root
+            else:
+                path[i - 1].right = subtree_root
     
     def search(self, data: Any) -> Optional[TreeNode]:
         """Search for data in BST"""
-        return self._search_recursive(self.root, data)
-    
-    def _search_recursive(self, node: Optional[TreeNode], data: Any) -> Optional[TreeNode]:
-        """Recursive search helper"""
-        if node is None:
-            return None
-        
-        # Check if data matches
-        if hasattr(data, 'unique_id') and hasattr(node.data, 'unique_id'):
-            if data.unique_id == node.data.unique_id:
+        key = self._key(data)
+        node = self.root
+        while node:
+            if key == node.key:
                 return node
-            if data.unique_id < node.data.unique_id:
-                return self._search_recursive(node.left, data)
-            return self._search_recursive(node.right, data)
-        
-        if node.data == data:
-            return node
-        
-        if str(data) < str(node.data):
-            return self._search_recursive(node.left, data)
-        return self._search_recursive(node.right, data)
+            node = node.left if key < node.key else node.right
+        return None
     
-    def inorder_traversal(self) -> List[Any]:
-        """In-order traversal (left, root, right)"""
+    def _iter_from(self, low: Optional[str] = None):
+        """Iterative in-order walk over nodes with key >= low"""
+        stack: List[TreeNode] = []
+        node = self.root
+        while stack or node:
+            while node:
+                if low is not None and node.key < low:
+                    node = node.right  # Node and its left subtree are below the range
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            yield node
+            node = node.right
+    
+    def range_scan(self, low: str, high: Optional[str] = None) -> List[Any]:
+        """All data with low <= key < high, in key order"""
         result = []
-        self._inorder_recursive(self.root, result)
+        for node in self._iter_from(low):
+            if high is not None and node.key >= high:
+                break
+            result.append(node.data)
         return result
     
-    def _inorder_recursive(self, node: Optional[TreeNode], result: List[Any]) -> None:
-        """Recursive in-order traversal"""
-        if node:
-            self._inorder_recursive(node.left, result)
+    def prefix_scan(self, prefix: str) -> List[Any]:
+        """All data whose key starts with prefix, in key order"""
+        result = []
+        for node in self._iter_from(prefix):
+            if not node.key.startswith(prefix):
+                break
             result.append(node.data)
-            self._inorder_recursive(node.right, result)
+        return result
+    
+    def inorder_traversal(self) -> List[Any]:
+        """In-order traversal (left, root, right)"""
+        return [node.data for node in self._iter_from()]
     
     def preorder_traversal(self) -> List[Any]:
         """Pre-order traversal (root, left, right)"""
         result = []
-        self._preorder_recursive(self.root, result)
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            result.append(node.data)
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
         return result
     
-    def _preorder_recursive(self, node: Optional[TreeNode], result: List[Any]) -> None:
-        """Recursive pre-order traversal"""
-        if node:
-            result.append(node.data)
-            self._preorder_recursive(node.left, result)
-            self._preorder_recursive(node.right, result)
+    def height(self) -> int:
+        """Height of the tree (0 when empty)"""
+        return self._height(self.root)
+    
+    def size(self) -> int:
+        """Number of stored items"""
+        return self._size
 
 
 # ==================== GRAPH ====================
@@ -390,6 +477,26 @@ class Trie:
             node = node.children[char]
         return True
 
+    def words_with_prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Words starting with prefix, shortest first, at most `limit` of them"""
+        node = self.root
+        for char in prefix.lower():
+            node = node.children.get(char)
+            if node is None:
+                return []
+        
+        words = []
+        # Breadth-first, so the closest completions are found before long ones
+        queue = deque([(node, prefix.lower())])
+        while queue and (limit is None or len(words) < limit):
+            node, word = queue.popleft()
+            if node.is_end_of_word:
+                words.append(word)
+            # sorted() copies the children, so a concurrent insert cannot break the iteration
+            for char, child in sorted(node.children.items()):
+                queue.append((child, word + char))
+        return words
+
     def collect_all_words(self) -> List[str]:
         """Collect all words in the trie"""
         words = []
@@ -400,5 +507,214 @@ class Trie:
         if node.is_end_of_word:
             words.append(current_prefix)
         
-        for char, child_node in node.children.items():
+        # Copy the children so a concurrent insert cannot break the iteration
+        for char, child_node in list(node.children.items()):
             self._collect_words_recursive(child_node, current_prefix + char, words)
+
+
+# ==================== MINHASH / LSH ====================
+@lru_cache(maxsize=1 << 18)
+def hash64(token: str) -> int:
+    """Stable 64-bit token hash (the builtin hash() is salted per process)"""
+    digest = hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+class MinHashLSH:
+    """
+    MinHash signatures with LSH banding for near-neighbour lookup.
+    Signatures use one-permutation hashing (one 64-bit hash per token, split
+    into num_perm bins) so building a signature is O(tokens) instead of
+    O(tokens * num_perm). Each signature is cut into bands; documents sharing
+    any band bucket are candidate neighbours.
+    """
+
+    _EMPTY_BIN = (1 << 64) - 1
+
+    def __init__(self, num_perm: int = 128, bands: int = 32):
+        if num_perm <= 0 or bands <= 0 or num_perm % bands != 0:
+            raise ValueError("num_perm must be a positive multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.signatures: Dict[Any, Tuple[int, ...]] = {}
+        self.buckets: List[Dict[Tuple[int, ...], Set[Any]]] = [defaultdict(set) for _ in range(bands)]
+
+    def signature(self, tokens: Iterable[str]) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a token collection"""
+        bins = [self._EMPTY_BIN] * self.num_perm
+        for token in set(tokens):
+            value = hash64(token)
+            index = value % self.num_perm
+            value //= self.num_perm
+            if value < bins[index]:
+                bins[index] = value
+
+        # Densify: empty bins borrow the value of the next non-empty bin
+        if self._EMPTY_BIN in bins and any(v != self._EMPTY_BIN for v in bins):
+            for i in range(self.num_perm):
+                if bins[i] != self._EMPTY_BIN:
+                    continue
+                offset = 1
+                while bins[(i + offset) % self.num_perm] == self._EMPTY_BIN:
+                    offset += 1
+                bins[i] = bins[(i + offset) % self.num_perm] + offset
+        return tuple(bins)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        return [signature[b * self.rows:(b + 1) * self.rows] for b in range(self.bands)]
+
+    def insert(self, key: Any, tokens: Iterable[str]) -> None:
+        """Compute and index the signature for key"""
+        signature = self.signature(tokens)
+        self.signatures[key] = signature
+        if signature[0] == self._EMPTY_BIN:
+            return  # Empty documents have no meaningful neighbours
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self.buckets[band][band_key].add(key)
+
+    def candidates(self, key: Any) -> Set[Any]:
+        """Keys sharing at least one band bucket with key"""
+        signature = self.signatures.get(key)
+        if signature is None or signature[0] == self._EMPTY_BIN:
+            return set()
+        result: Set[Any] = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            result.update(self.buckets[band].get(band_key, ()))
+        result.discard(key)
+        return result
+
+    def similarity(self, key1: Any, key2: Any) -> float:
+        """Estimated Jaccard similarity of two indexed keys"""
+        sig1 = self.signatures.get(key1)
+        sig2 = self.signatures.get(key2)
+        if sig1 is None or sig2 is None:
+            return 0.0
+        return sum(1 for a, b in zip(sig1, sig2) if a == b) / self.num_perm
+
+    def query(self, key: Any, limit: int = 5) -> List[Tuple[Any, float]]:
+        """Most similar candidates for key, best first"""
+        scored = [(other, self.similarity(key, other)) for other in self.candidates(key)]
+        scored.sort(key=lambda x: x[1], reverse=True)
+        return scored[:limit]
+
+
+# ==================== SIMHASH ====================
+class SimHashIndex:
+    """
+    64-bit SimHash fingerprints with near-duplicate lookup.
+    Fingerprints are split into max_distance + 1 blocks: by the pigeonhole
+    principle two fingerprints within max_distance bits agree exactly on at
+    least one block, so only fingerprints sharing a block are compared.
+    """
+
+    BITS = 64
+
+    def __init__(self, max_distance: int = 3):
+        if not 0 <= max_distance < self.BITS:
+            raise ValueError("max_distance must be between 0 and 63")
+        self.max_distance = max_distance
+        blocks = max_distance + 1
+        bounds = [round(i * self.BITS / blocks) for i in range(blocks + 1)]
+        self._blocks: List[Tuple[int, int]] = [
+            (bounds[i], (1 << (bounds[i + 1] - bounds[i])) - 1) for i in range(blocks)
+        ]
+        self.tables: List[Dict[int, List[Any]]] = [defaultdict(list) for _ in range(blocks)]
+        self.fingerprints: Dict[Any, int] = {}
+
+    @classmethod
+    def fingerprint(cls, features: Mapping[str, int]) -> int:
+        """SimHash of weighted features (e.g. a shingle Counter)"""
+        if not features:
+            return 0
+        # Group hashes by weight and count set bits column-wise on the
+        # joined bit strings, which keeps the per-feature work in C.
+        # Features are mostly unique shingles, so skip hash64's cache.
+        groups: Dict[int, List[str]] = defaultdict(list)
+        blake2b = hashlib.blake2b
+        for feature, weight in features.items():
+            digest = blake2b(feature.encode('utf-8'), digest_size=8).digest()
+            groups[weight].append(format(int.from_bytes(digest, 'big'), '064b'))
+        total = sum(weight * len(bits) for weight, bits in groups.items())
+        column_weights = [0] * cls.BITS
+        for weight, bits in groups.items():
+            joined = ''.join(bits)
+            for i in range(cls.BITS):
+                column_weights[i] += weight * joined[i::cls.BITS].count('1')
+        value = 0
+        for i in range(cls.BITS):
+            if 2 * column_weights[i] > total:
+                value |= 1 << (cls.BITS - 1 - i)
+        return value
+
+    @staticmethod
+    def shingles(tokens: List[str], size: int = 3) -> Counter:
+        """Overlapping word n-grams; more robust to shared boilerplate than single words"""
+        if len(tokens) <= size:
+            return Counter([' '.join(tokens)]) if tokens else Counter()
+        return Counter(' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+
+    @staticmethod
+    def hamming_distance(a: int, b: int) -> int:
+        return bin(a ^ b).count('1')
+
+    def _block_values(self, fingerprint: int) -> List[int]:
+        return [(fingerprint >> shift) & mask for shift, mask in self._blocks]
+
+    def find_near_duplicate(self, fingerprint: int) -> Optional[Any]:
+        """Key of an indexed fingerprint within max_distance, if any"""
+        for table, value in zip(self.tables, self._block_values(fingerprint)):
+            for key in table.get(value, ()):
+                if self.hamming_distance(fingerprint, self.fingerprints[key]) <= self.max_distance:
+                    return key
+        return None
+
+    def add(self, key: Any, fingerprint: int) -> None:
+        """Index a fingerprint under key"""
+        self.fingerprints[key] = fingerprint
+        for table, value in zip(self.tables, self._block_values(fingerprint)):
+            table[value].append(key)
+
+
+# ==================== BLOOM FILTER ====================
+class BloomFilter:
+    """
+    Compact probabilistic set: no false negatives, false positives at about
+    error_rate once `capacity` items were added. Bit positions come from
+    double hashing one 128-bit blake2b digest per item.
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> bool:
+        """Add an item; returns False if it was (probably) already present"""
+        added = False
+        for position in self._positions(item):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def __len__(self) -> int:
+        """Number of distinct items added (approximate: collisions are not counted)"""
+        return self.count
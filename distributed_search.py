@@ -0,0 +1,256 @@
+"""
+Scatter-gather search over a sharded corpus.
+
+The coordinator splits the articles into N shards, each served by a worker
+process running its own ArticleIndexer and TFIDFRanker. Queries are fanned
+out over local pipes in rounds:
+
+  1. term statistics - every shard reports document frequencies for the
+     query terms and its closest vocabulary word for terms it does not know
+  2. (only when a term was corrected) document frequencies of the corrections
+  3. scoring - shards score their articles with the global IDF table and
+     send back their local top-k
+
+IDF comes from global document frequencies and spelling correction picks the
+globally closest word, so the merged ranking matches a single ArticleIndexer
+over the same articles.
+"""
+import multiprocessing
+import sys
+import threading
+import zlib
+from collections import Counter
+from typing import List, Dict, Tuple, Optional, Any
+
+from data_structures import SimHashIndex
+from indexer import ArticleIndexer, Article
+from query_processor import QueryProcessor
+from tfidf import TFIDFRanker
+
+
+def _shard_worker(conn, articles: List[Dict]) -> None:
+    """Worker process: index one shard and answer coordinator requests"""
+    # Near-duplicates were already filtered globally by the coordinator
+    indexer = ArticleIndexer(None, near_duplicate_distance=None)
+    indexer.add_articles(articles)
+    ranker = TFIDFRanker(indexer)
+
+    def term_stats(terms: List[str]) -> Dict[str, Any]:
+        snapshot = indexer.snapshot()
+        return {
+            "total": snapshot.total_articles,
+            "df": {term: len(snapshot.get_articles_by_word(term)) for term in terms},
+            "matches": {term: ranker.closest_word(term, snapshot.all_words_set)
+                        for term in terms if term not in snapshot.all_words_set},
+        }
+
+    def document_frequencies(terms: List[str]) -> Dict[str, int]:
+        snapshot = indexer.snapshot()
+        return {term: len(snapshot.get_articles_by_word(term)) for term in terms}
+
+    def score(payload: Tuple[List[str], Dict[str, float], int]) -> List[Tuple[Article, float]]:
+        search_terms, idf, top_k = payload
+        snapshot = indexer.snapshot()
+        scores = ranker.score_articles(snapshot, idf, search_terms)
+        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
+        return [(snapshot.get_article(article_id), value) for article_id, value in ranked]
+
+    def stats(_: Any) -> Dict[str, int]:
+        snapshot = indexer.snapshot()
+        return {
+            "articles": snapshot.total_articles,
+            "words": len(snapshot.all_words_set),
+            "generation": snapshot.generation,
+        }
+
+    handlers = {
+        "term_stats": term_stats,
+        "df": document_frequencies,
+        "score": score,
+        "add": indexer.add_articles,
+        "stats": stats,
+    }
+
+    while True:
+        try:
+            command, payload = conn.recv()
+        except (EOFError, OSError):
+            break
+        if command == "close":
+            break
+        try:
+            conn.send(("ok", handlers[command](payload)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+    conn.close()
+
+
+class ShardedSearchCoordinator:
+    """Splits the corpus across worker processes and merges their rankings"""
+
+    def __init__(self, num_shards: int = 4, near_duplicate_distance: Optional[int] = 3):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self.num_shards = num_shards
+        self.query_processor = QueryProcessor()
+        self.near_duplicates: Optional[SimHashIndex] = (
+            SimHashIndex(near_duplicate_distance) if near_duplicate_distance is not None else None
+        )
+        self.duplicate_of: Dict[str, str] = {}
+        # Global insertion order, used to break score ties exactly like a single index
+        self._order: Dict[str, int] = {}
+        self._connections = []
+        self._processes = []
+        # One query or update at a time on the pipes
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_json(cls, json_file: str, num_shards: int = 4, **kwargs) -> 'ShardedSearchCoordinator':
+        """Start a coordinator serving the articles of a crawled-articles JSON file"""
+        coordinator = cls(num_shards, **kwargs)
+        coordinator.start([article._asdict() for article in ArticleIndexer.read_articles(json_file)])
+        return coordinator
+
+    # ==================== SHARD MANAGEMENT ====================
+    def _shard_for(self, unique_id: str) -> int:
+        return zlib.crc32(unique_id.encode('utf-8')) % self.num_shards
+
+    def _accept(self, articles: List[Dict]) -> List[Dict]:
+        """Assign ids and drop exact or near duplicates, like ArticleIndexer.add_articles"""
+        accepted = []
+        for data in articles:
+            unique_id = ArticleIndexer.make_unique_id(data)
+            if unique_id in self._order or unique_id in self.duplicate_of:
+                continue
+            if self.near_duplicates is not None:
+                words = self.query_processor.tokenize(f"{data['title']} {data['content']}")
+                fingerprint = self.near_duplicates.fingerprint(self.near_duplicates.shingles(words))
+                original_id = self.near_duplicates.find_near_duplicate(fingerprint)
+                if original_id is not None:
+                    self.duplicate_of[unique_id] = original_id
+                    continue
+                self.near_duplicates.add(unique_id, fingerprint)
+            self._order[unique_id] = len(self._order)
+            accepted.append(dict(data, unique_id=unique_id))
+        return accepted
+
+    def _partition(self, articles: List[Dict]) -> List[List[Dict]]:
+        shards: List[List[Dict]] = [[] for _ in range(self.num_shards)]
+        for data in articles:
+            shards[self._shard_for(data['unique_id'])].append(data)
+        return shards
+
+    def start(self, articles: List[Dict]) -> None:
+        """Partition the articles and start one worker process per shard"""
+        if self._processes:
+            raise RuntimeError("Coordinator already started")
+        context = multiprocessing.get_context()
+        for shard_articles in self._partition(self._accept(articles)):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=_shard_worker, args=(child_conn, shard_articles), daemon=True)
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+
+    def close(self) -> None:
+        """Stop all worker processes"""
+        for conn in self._connections:
+            try:
+                conn.send(("close", None))
+                conn.close()
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self) -> 'ShardedSearchCoordinator':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _scatter(self, command: str, payloads: List[Any]) -> List[Any]:
+        """Send one payload to every shard, then gather all replies"""
+        if not self._connections:
+            raise RuntimeError("Coordinator is not running")
+        for conn, payload in zip(self._connections, payloads):
+            conn.send((command, payload))
+        replies = []
+        for conn in self._connections:
+            status, value = conn.recv()
+            if status != "ok":
+                raise RuntimeError(f"Shard failed on '{command}': {value}")
+            replies.append(value)
+        return replies
+
+    def _broadcast(self, command: str, payload: Any) -> List[Any]:
+        return self._scatter(command, [payload] * len(self._connections))
+
+    # ==================== PUBLIC API ====================
+    def add_articles(self, articles_data: List[Dict]) -> int:
+        """Route new articles to their shards; returns the number added"""
+        with self._lock:
+            accepted = self._accept(articles_data)
+            if not accepted:
+                return 0
+            return sum(self._scatter("add", self._partition(accepted)))
+
+    def rank_articles(self, query: str, top_k: int = 10, min_score: float = 0.001) -> Tuple[List[Tuple[Article, float]], Optional[str]]:
+        """Same contract as TFIDFRanker.rank_articles, answered by all shards"""
+        filtered_query = TFIDFRanker.filter_query(query)
+        if not filtered_query:
+            return [], None
+
+        with self._lock:
+            # Round 1: global document frequencies and closest words
+            term_stats = self._broadcast("term_stats", filtered_query)
+            total_docs = sum(stats["total"] for stats in term_stats)
+            doc_freq: Counter = Counter()
+            matches: Dict[str, Tuple[int, str]] = {}
+            for stats in term_stats:
+                doc_freq.update(stats["df"])
+                for term, match in stats["matches"].items():
+                    if match is not None and (term not in matches or match < matches[term]):
+                        matches[term] = match
+
+            search_terms, suggestion = TFIDFRanker.correct_terms(
+                filtered_query,
+                lambda word: doc_freq[word] > 0,
+                lambda word: matches[word][1] if word in matches else None,
+            )
+
+            # Round 2: frequencies of corrected words
+            missing = [term for term in search_terms if term not in doc_freq]
+            if missing:
+                for shard_df in self._broadcast("df", missing):
+                    doc_freq.update(shard_df)
+
+            idf = {term: TFIDFRanker.compute_idf(total_docs, doc_freq[term]) for term in search_terms}
+
+            # Round 3: per-shard top-k with the global IDF
+            partials = self._broadcast("score", (search_terms, idf, top_k))
+
+        candidates = [pair for partial in partials for pair in partial]
+        candidates.sort(key=lambda pair: (-pair[1], self._order[pair[0].unique_id]))
+        return TFIDFRanker.select_results(candidates, top_k, min_score), suggestion
+
+    def stats(self) -> List[Dict[str, int]]:
+        """Per-shard article/word counts"""
+        with self._lock:
+            return self._broadcast("stats", None)
+
+
+if __name__ == "__main__":
+    queries = sys.argv[1:] or ["What is a DDoS attack?", "sql injecton"]
+    with ShardedSearchCoordinator.from_json("articles.json", num_shards=4) as coordinator:
+        print("Shards:", coordinator.stats())
+        for query in queries:
+            results, suggestion = coordinator.rank_articles(query, top_k=5)
+            print(f"\n{query}" + (f" (did you mean: {suggestion})" if suggestion else ""))
+            for article, score in results:
+                print(f"  {score:.4f}  {article.title[:70]}")
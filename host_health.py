@@ -0,0 +1,136 @@
+"""
+Per-host health tracking for crawler fetches.
+
+Transient failures (5xx, 429, connection errors) are retried with
+exponential backoff. After `failure_threshold` consecutive failures a host's
+circuit opens and requests to it are skipped for `cooldown` seconds. After
+that, a single probe request is let through: success closes the circuit,
+failure re-opens it.
+
+Each skipped request is credited with the host's average failed-attempt time.
+The sum is reported as the time the breaker saved.
+"""
+import random
+import threading
+import time
+from typing import Dict, Any, Optional
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+
+class _HostState:
+    __slots__ = ('consecutive_failures', 'open_until', 'probing', 'failures', 'failure_seconds')
+
+    def __init__(self):
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probing = False
+        self.failures = 0
+        self.failure_seconds = 0.0
+
+
+class HostHealth:
+    """Thread-safe retry policy and circuit breaker keyed by host name"""
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 60.0, max_retries: int = 2,
+                 backoff_base: float = 0.5, backoff_max: float = 8.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.recovered = 0
+        self.skipped = 0
+        self.circuits_opened = 0
+        self.time_saved = 0.0
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState()
+        return state
+
+    def allow(self, host: str) -> bool:
+        """Whether a request to the host may be sent now"""
+        with self._lock:
+            state = self._state(host)
+            if state.consecutive_failures < self.failure_threshold:
+                return True
+            if time.monotonic() >= state.open_until and not state.probing:
+                # Half-open: let one probe through
+                state.probing = True
+                return True
+            self.skipped += 1
+            if state.failures:
+                self.time_saved += state.failure_seconds / state.failures
+            return False
+
+    def record_success(self, host: str, retried: bool = False) -> None:
+        with self._lock:
+            state = self._state(host)
+            state.consecutive_failures = 0
+            state.probing = False
+            self.requests += 1
+            if retried:
+                self.recovered += 1
+
+    def record_failure(self, host: str, elapsed: float) -> None:
+        with self._lock:
+            state = self._state(host)
+            state.consecutive_failures += 1
+            state.failures += 1
+            state.failure_seconds += elapsed
+            self.requests += 1
+            self.failures += 1
+            if state.probing or state.consecutive_failures == self.failure_threshold:
+                state.open_until = time.monotonic() + self.cooldown
+                self.circuits_opened += 1
+            state.probing = False
+
+    def abandon(self, host: str) -> None:
+        """A request was cancelled before it finished: frees the probe slot without judging the host"""
+        with self._lock:
+            self._state(host).probing = False
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            state = self._hosts.get(host)
+            return state is not None and state.consecutive_failures >= self.failure_threshold
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before retry number `attempt` (0-based)"""
+        if retry_after is not None:
+            try:
+                return min(self.backoff_max, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        # Jitter so workers retrying the same host do not move in lockstep
+        return delay * random.uniform(0.5, 1.0)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "failures": self.failures,
+                "retries": self.retries,
+                "recovered_by_retry": self.recovered,
+                "skipped_open_circuit": self.skipped,
+                "circuits_opened": self.circuits_opened,
+                "open_hosts": sorted(h for h, s in self._hosts.items()
+                                     if s.consecutive_failures >= self.failure_threshold),
+                "time_saved_s": round(self.time_saved, 2),
+            }
@@ -2,168 +2,357 @@
 import json
 import re
 import hashlib
+import threading
+import time
 from collections import deque, OrderedDict, defaultdict, Counter, namedtuple
-from typing import List, Dict, Set, Tuple, Optional
-from data_structures import Stack, Queue, BinarySearchTree, Graph, TopicTree, Trie
+from typing import List, Dict, Set, Tuple, Optional, Iterable
+from data_structures import Stack, Queue, BinarySearchTree, Graph, TopicTree, Trie, MinHashLSH, SimHashIndex
 from query_processor import QueryProcessor
 
  
 Article = namedtuple('Article', ['unique_id', 'title', 'content', 'url', 'timestamp', 'topic'])
 
+
+class IndexSnapshot:
+    """
+    One generation of the core search index. A published snapshot is never
+    mutated: readers take the current snapshot once per query and see a
+    consistent version without locking, while writers build the next
+    generation copy-on-write and publish it with a single assignment.
+    """
+    
+    def __init__(self, generation: int = 0,
+                 articles_list: Optional[List[Article]] = None,
+                 articles_dict: Optional[Dict[str, Article]] = None,
+                 word_to_articles: Optional[Dict[str, Set[str]]] = None,
+                 article_word_counts: Optional[Dict[str, Counter]] = None,
+                 all_words_set: Optional[Set[str]] = None):
+        self.generation = generation
+        self.articles_list: List[Article] = articles_list if articles_list is not None else []
+        self.articles_dict: Dict[str, Article] = articles_dict if articles_dict is not None else {}
+        self.word_to_articles: Dict[str, Set[str]] = word_to_articles if word_to_articles is not None else {}
+        self.article_word_counts: Dict[str, Counter] = article_word_counts if article_word_counts is not None else {}
+        self.all_words_set: Set[str] = all_words_set if all_words_set is not None else set()
+    
+    @property
+    def total_articles(self) -> int:
+        return len(self.articles_list)
+    
+    def next_generation(self) -> 'IndexSnapshot':
+        """
+        Shallow copy for the next writer. Posting sets are still shared with
+        this snapshot and must be copied before they are modified.
+        """
+        return IndexSnapshot(
+            self.generation + 1,
+            list(self.articles_list),
+            dict(self.articles_dict),
+            dict(self.word_to_articles),
+            dict(self.article_word_counts),
+            set(self.all_words_set),
+        )
+    
+    def get_article(self, article_id: str) -> Optional[Article]:
+        return self.articles_dict.get(article_id)
+    
+    def get_articles_by_word(self, word: str) -> Set[str]:
+        return self.word_to_articles.get(word.lower(), set())
+    
+    def get_all_articles(self) -> List[Article]:
+        return self.articles_list
+    
+    def get_article_word_freq(self, article_id: str) -> Counter:
+        return self.article_word_counts.get(article_id, Counter())
+
+
 class ArticleIndexer:
     """Indexer that pre-processes and indexes all articles"""
     
-    def __init__(self, json_file: str):
+    def __init__(self, json_file: Optional[str], near_duplicate_distance: Optional[int] = 3):
+        """
+        json_file: crawled articles to load in index_all (None for an index
+        that is only filled through add_articles).
+        near_duplicate_distance: maximum SimHash Hamming distance at which an
+        incoming article is treated as a copy of an indexed one and skipped.
+        None disables near-duplicate filtering.
+        """
         self.json_file = json_file
       
-        self.articles_list: List[Article] = []  
-        self.articles_dict: Dict[str, Article] = {}  
-        self.word_to_articles: Dict[str, Set[str]] = defaultdict(set)  
-        self.article_word_counts: Dict[str, Counter] = {}  
-        self.all_words_set: Set[str] = set()  
+        # Core index (articles_list, articles_dict, word_to_articles,
+        # article_word_counts, all_words_set) lives in the published snapshot
+        self._snapshot: IndexSnapshot = IndexSnapshot()
         self.topic_to_articles: Dict[str, List[str]] = defaultdict(list)  
         self.query_queue: deque = deque() 
         self.article_order: OrderedDict = OrderedDict() 
-        self.total_articles: int = 0
         
        
         self.search_history_stack: Stack = Stack()  
         self.query_processing_queue: Queue = Queue()  
-        self.article_bst: BinarySearchTree = BinarySearchTree()  
-        self.article_graph: Graph = Graph(directed=False)  
-        self.article_graph: Graph = Graph(directed=False)  
-        self.topic_tree: TopicTree = TopicTree()  
-        self.vocabulary_trie: Trie = Trie()
+        
+        # Auxiliary structures (article_bst, article_graph, topic_tree,
+        # vocabulary_trie, related_lsh) are not needed to answer a search,
+        # so they are built on first access instead of in index_all.
+        self._auxiliary_structures: Dict[str, object] = {}
+        # Serializes writers and lazy builds; readers never take it
+        self._write_lock = threading.RLock()
+        self.near_duplicates: Optional[SimHashIndex] = (
+            SimHashIndex(near_duplicate_distance) if near_duplicate_distance is not None else None
+        )
+        self.duplicate_of: Dict[str, str] = {}  # rejected article id -> kept article id
         self.query_processor: QueryProcessor = QueryProcessor()
         
     def _tokenize(self, text: str) -> List[str]:
        
         return self.query_processor.tokenize(text)
     
-    def _load_articles(self) -> None:
-       
-        with open(self.json_file, 'r', encoding='utf-8') as f:
+    # ==================== SNAPSHOT ACCESS ====================
+    def snapshot(self) -> IndexSnapshot:
+        """Current index generation; use one snapshot for a whole query"""
+        return self._snapshot
+    
+    @property
+    def generation(self) -> int:
+        return self._snapshot.generation
+    
+    @property
+    def articles_list(self) -> List[Article]:
+        return self._snapshot.articles_list
+    
+    @property
+    def articles_dict(self) -> Dict[str, Article]:
+        return self._snapshot.articles_dict
+    
+    @property
+    def word_to_articles(self) -> Dict[str, Set[str]]:
+        return self._snapshot.word_to_articles
+    
+    @property
+    def article_word_counts(self) -> Dict[str, Counter]:
+        return self._snapshot.article_word_counts
+    
+    @property
+    def all_words_set(self) -> Set[str]:
+        return self._snapshot.all_words_set
+    
+    @property
+    def total_articles(self) -> int:
+        return self._snapshot.total_articles
+    
+    def _index_similarity(self, lsh: MinHashLSH, article_id: str, words: Iterable[str]) -> None:
+        """Add the article's MinHash signature to the related-article LSH"""
+        terms = self.query_processor.remove_stop_words(list(set(words)))
+        lsh.insert(article_id, terms)
+    
+    # ==================== LAZY AUXILIARY STRUCTURES ====================
+    AUXILIARY_STRUCTURES = ('article_bst', 'article_graph', 'topic_tree', 'vocabulary_trie', 'related_lsh')
+    
+    def _get_auxiliary(self, name: str):
+        """Return an auxiliary structure, building it on first access"""
+        structure = self._auxiliary_structures.get(name)
+        if structure is None:
+            with self._write_lock:
+                structure = self._auxiliary_structures.get(name)
+                if structure is None:
+                    structure = getattr(self, f"_build_{name}")()
+                    self._auxiliary_structures[name] = structure
+        return structure
+    
+    def _built_auxiliary(self, name: str):
+        """Return an auxiliary structure only if it has already been built"""
+        return self._auxiliary_structures.get(name)
+    
+    @property
+    def article_bst(self) -> BinarySearchTree:
+        return self._get_auxiliary('article_bst')
+    
+    @property
+    def article_graph(self) -> Graph:
+        return self._get_auxiliary('article_graph')
+    
+    @property
+    def topic_tree(self) -> TopicTree:
+        return self._get_auxiliary('topic_tree')
+    
+    @property
+    def vocabulary_trie(self) -> Trie:
+        return self._get_auxiliary('vocabulary_trie')
+    
+    @property
+    def related_lsh(self) -> MinHashLSH:
+        return self._get_auxiliary('related_lsh')
+    
+    def warm_auxiliary_structures(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        Build every auxiliary structure ahead of first use. With background=True
+        this runs in a daemon thread that yields between structures, so it can be
+        started right after search is enabled without holding it up.
+        """
+        def warm():
+            for name in self.AUXILIARY_STRUCTURES:
+                self._get_auxiliary(name)
+                time.sleep(0)  # Give the GIL back to search/UI threads
+        
+        if not background:
+            warm()
+            return None
+        thread = threading.Thread(target=warm, daemon=True)
+        thread.start()
+        return thread
+    
+    def _build_article_bst(self) -> BinarySearchTree:
+        """Build BST of articles keyed by unique_id"""
+        bst = BinarySearchTree()
+        for article in self._snapshot.articles_list:
+            bst.insert(article)
+        return bst
+    
+    def _build_topic_tree(self) -> TopicTree:
+        """Build topic hierarchy tree"""
+        tree = TopicTree()
+        for article in self._snapshot.articles_list:
+            tree.add_topic(article.topic, articles=[article])
+        return tree
+    
+    def _build_related_lsh(self) -> MinHashLSH:
+        """Build MinHash LSH over every article's words"""
+        lsh = MinHashLSH()
+        snapshot = self._snapshot
+        for article in snapshot.articles_list:
+            self._index_similarity(lsh, article.unique_id, snapshot.get_article_word_freq(article.unique_id))
+        return lsh
+    
+    def _is_near_duplicate(self, article_id: str, words: List[str]) -> bool:
+        """
+        Check the article against the SimHash index. Near-duplicates are
+        merged into the already indexed article via duplicate_of; anything
+        else is registered so later copies of it are caught.
+        """
+        if self.near_duplicates is None:
+            return False
+        fingerprint = self.near_duplicates.fingerprint(self.near_duplicates.shingles(words))
+        original_id = self.near_duplicates.find_near_duplicate(fingerprint)
+        if original_id is not None:
+            self.duplicate_of[article_id] = original_id
+            return True
+        self.near_duplicates.add(article_id, fingerprint)
+        return False
+    
+    @staticmethod
+    def read_articles(json_file: str) -> List[Article]:
+        """Read every article from a crawled-articles JSON file"""
+        with open(json_file, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
-        article_id = 0
+        articles = []
         for topic_data in data:
             topic = topic_data['topic']
             for article_data in topic_data['articles']:
               
                 content = article_data.get('content', f"{article_data['title']} {topic}")
                 
-                article = Article(
+                articles.append(Article(
                     unique_id=article_data['unique_id'],
                     title=article_data['title'],
                     content=content,
                     url=article_data['url'],
                     timestamp=article_data['timestamp'],
                     topic=topic
-                )
-                
-               
-                self.articles_list.append(article)
-                
-             
-                self.articles_dict[article.unique_id] = article
-                
-              
-                self.article_order[article.unique_id] = article
-                
-          
-                self.topic_to_articles[topic].append(article.unique_id)
-             
-                self.article_bst.insert(article)
+                ))
+        return articles
+    
+    def _load_articles(self, snapshot: IndexSnapshot) -> None:
+       
+        for article in self.read_articles(self.json_file):
                 
+            words = self._tokenize(f"{article.title} {article.content}")
+            if self._is_near_duplicate(article.unique_id, words):
+                continue
+            snapshot.article_word_counts[article.unique_id] = Counter(words)
+           
+            snapshot.articles_list.append(article)
+            
          
-                self.topic_tree.add_topic(topic, articles=[article])
-                
+            snapshot.articles_dict[article.unique_id] = article
+            
+          
+            self.article_order[article.unique_id] = article
             
-                self.article_graph.add_vertex(article.unique_id)
-                
-                article_id += 1
-        
-        self.total_articles = len(self.articles_list)
-        
       
-        self._build_article_graph()
+            self.topic_to_articles[article.topic].append(article.unique_id)
     
-    def _build_inverted_index(self) -> None:
+    def _build_inverted_index(self, snapshot: IndexSnapshot) -> None:
   
-        for article in self.articles_list:
+        for article in snapshot.articles_list:
           
-            text = f"{article.title} {article.content}"
-            words = self._tokenize(text)
-            
-        
-            word_counter = Counter(words)
-            self.article_word_counts[article.unique_id] = word_counter
+            # Word counts are normally computed during loading (for SimHash)
+            word_counter = snapshot.article_word_counts.get(article.unique_id)
+            if word_counter is None:
+                word_counter = Counter(self._tokenize(f"{article.title} {article.content}"))
+                snapshot.article_word_counts[article.unique_id] = word_counter
             
             # Add to inverted index
-            for word in words:
-                self.word_to_articles[word].add(article.unique_id)
-                self.all_words_set.add(word)
+            for word in word_counter:
+                snapshot.word_to_articles.setdefault(word, set()).add(article.unique_id)
+                snapshot.all_words_set.add(word)
     
-    def _build_article_graph(self) -> None:
-        """Build graph of article relationships based on shared topics and words"""
+    def _build_article_graph(self) -> Graph:
+        """Build graph of article relationships based on shared topics.
+        Word-level similarity is handled by the MinHash LSH (see related_lsh)."""
+        graph = Graph(directed=False)
+        for article in self._snapshot.articles_list:
+            graph.add_vertex(article.unique_id)
      
         for topic, article_ids in self.topic_to_articles.items():
             for i, article_id1 in enumerate(article_ids):
                 for article_id2 in article_ids[i+1:]:
                 
-                    self.article_graph.add_edge(article_id1, article_id2, weight=1.0)
-        
-     
-        important_words = {word for word, articles in self.word_to_articles.items() 
-                          if len(articles) <= 5}  # Words that appear in few articles
-        
-        for word in important_words:
-            article_ids = list(self.word_to_articles[word])
-            for i, article_id1 in enumerate(article_ids):
-                for article_id2 in article_ids[i+1:]:
-                 
-                    current_weight = self.article_graph.get_edge_weight(article_id1, article_id2)
-                    if current_weight is None:
-                        self.article_graph.add_edge(article_id1, article_id2, weight=0.5)
-                    else:
-                      
-                        self.article_graph.add_edge(article_id1, article_id2, weight=current_weight + 0.3)
+                    graph.add_edge(article_id1, article_id2, weight=1.0)
+        return graph
     
     def index_all(self) -> None:
-        """Main indexing function - pre-indexes all articles"""
-        print("Loading articles...")
-        self._load_articles()
-        print(f"Loaded {self.total_articles} articles")
-        
-        print("Building inverted index...")
-        self._build_inverted_index()
-        print(f"Indexed {len(self.all_words_set)} unique words")
-        
-        print("Building vocabulary trie...")
-        self._build_vocabulary_trie()
+        """
+        Main indexing function - loads articles and builds the core search index
+        (inverted index and word counts). Auxiliary structures are built lazily.
+        """
+        with self._write_lock:
+            snapshot = self._snapshot.next_generation()
+            
+            print("Loading articles...")
+            self._load_articles(snapshot)
+            print(f"Loaded {snapshot.total_articles} articles")
+            if self.duplicate_of:
+                print(f"Skipped {len(self.duplicate_of)} near-duplicate articles")
+            
+            print("Building inverted index...")
+            self._build_inverted_index(snapshot)
+            print(f"Indexed {len(snapshot.all_words_set)} unique words")
+            
+            self._snapshot = snapshot
         
         print("Indexing complete!")
 
-    def _build_vocabulary_trie(self) -> None:
+    def _build_vocabulary_trie(self) -> Trie:
         """Build Trie for all words in vocabulary"""
-        for word in self.all_words_set:
-            self.vocabulary_trie.insert(word)
+        trie = Trie()
+        for word in self._snapshot.all_words_set:
+            trie.insert(word)
+        return trie
     
     def get_article(self, article_id: str) -> Article:
-       
-        return self.articles_dict.get(article_id)
+        """Get an article by id (ids of merged near-duplicates resolve to the kept copy)"""
+        return self._snapshot.get_article(self.duplicate_of.get(article_id, article_id))
     
     def get_articles_by_word(self, word: str) -> Set[str]:
        
-        return self.word_to_articles.get(word.lower(), set())
+        return self._snapshot.get_articles_by_word(word)
     
     def get_all_articles(self) -> List[Article]:
         """Get all articles as list"""
-        return self.articles_list
+        return self._snapshot.get_all_articles()
     
     def get_article_word_freq(self, article_id: str) -> Counter:
        
-        return self.article_word_counts.get(article_id, Counter())
+        return self._snapshot.get_article_word_freq(article_id)
     
     def get_all_queries(self) -> List[str]:
        
@@ -197,17 +386,22 @@ class ArticleIndexer:
         return self.query_processing_queue.dequeue()
     
     def get_related_articles(self, article_id: str, limit: int = 5) -> List[str]:
+        """Most similar articles by MinHash LSH, topped up with same-topic graph neighbours"""
+        related = [other for other, _ in self.related_lsh.query(article_id, limit)]
+        if len(related) >= limit:
+            return related
         
-        neighbors = self.article_graph.get_neighbors(article_id)
-    
-        related = []
-        for neighbor in neighbors:
+        neighbors = []
+        for neighbor in self.article_graph.get_neighbors(article_id):
+            if neighbor in related:
+                continue
             weight = self.article_graph.get_edge_weight(article_id, neighbor)
-            related.append((neighbor, weight or 0.0))
+            neighbors.append((neighbor, weight or 0.0))
         
        
-        related.sort(key=lambda x: x[1], reverse=True)
-        return [article_id for article_id, _ in related[:limit]]
+        neighbors.sort(key=lambda x: x[1], reverse=True)
+        related.extend(neighbor for neighbor, _ in neighbors[:limit - len(related)])
+        return related
     
     def get_articles_by_topic_tree(self, topic: str) -> List[Article]:
        
@@ -220,64 +414,104 @@ class ArticleIndexer:
         if result:
             return result.data
         return None
+    
+    def get_articles_by_id_prefix(self, prefix: str) -> List[Article]:
+        """Range scan of the article BST, e.g. 'article_3_' for every article crawled for topic 3"""
+        return self.article_bst.prefix_scan(prefix)
+
+    @staticmethod
+    def make_unique_id(data: Dict) -> str:
+        """Article id from the data, or a stable one derived from the URL if missing"""
+        unique_id = data.get('unique_id')
+        if not unique_id:
+             id_hash = hashlib.md5(data['url'].encode()).hexdigest()[:10]
+             unique_id = f"web_{id_hash}"
+        return unique_id
 
     def add_articles(self, articles_data: List[Dict]) -> int:
         """
         Dynamically add new articles to the index.
+        The batch is applied to a copy of the current snapshot, which is then
+        published in one step, so concurrent searches see all of it or none.
         Returns the number of new articles added.
         """
         new_count = 0
         
-        for data in articles_data:
-            # Generate ID if missing
-            unique_id = data.get('unique_id')
-            if not unique_id:
-                 id_hash = hashlib.md5(data['url'].encode()).hexdigest()[:10]
-                 unique_id = f"web_{id_hash}"
-                 
-            if unique_id in self.articles_dict:
-                continue # Skip duplicates
-            
-            topic = data.get('topic', 'Web Search')
-            
-            article = Article(
-                unique_id=unique_id,
-                title=data['title'],
-                content=data['content'],
-                url=data['url'],
-                timestamp=data.get('timestamp', ''),
-                topic=topic
-            )
-            
-            # --- Update Data Structures ---
-            self.articles_list.append(article)
-            self.articles_dict[unique_id] = article
-            self.article_order[unique_id] = article
-            self.total_articles += 1
+        # Held so a lazy build cannot miss articles appended while it runs
+        with self._write_lock:
+            snapshot = self._snapshot.next_generation()
+            copied_postings: Set[str] = set()
+            for data in articles_data:
+                if self._add_article(snapshot, copied_postings, data):
+                    new_count += 1
             
-            # BST
-            self.article_bst.insert(article)
-            
-            # Topic Tree
-            self.topic_tree.add_topic(topic, articles=[article])
-            
-            # Graph Node
-            self.article_graph.add_vertex(unique_id)
-            
-            # Inverted Index & Trie
-            text = f"{article.title} {article.content}"
-            words = self._tokenize(text)
-            
-            word_counter = Counter(words)
-            self.article_word_counts[unique_id] = word_counter
-            
-            for word in words:
-                self.word_to_articles[word].add(unique_id)
-                if word not in self.all_words_set:
-                    self.all_words_set.add(word)
-                    self.vocabulary_trie.insert(word) 
-            
-            new_count += 1
+            if new_count:
+                self._snapshot = snapshot
             
         return new_count
-
+    
+    def _add_article(self, snapshot: IndexSnapshot, copied_postings: Set[str], data: Dict) -> bool:
+        """Add one article dict to the index; False if it was a duplicate"""
+        unique_id = self.make_unique_id(data)
+             
+        if unique_id in snapshot.articles_dict or unique_id in self.duplicate_of:
+            return False # Skip duplicates
+        
+        topic = data.get('topic', 'Web Search')
+        
+        article = Article(
+            unique_id=unique_id,
+            title=data['title'],
+            content=data['content'],
+            url=data['url'],
+            timestamp=data.get('timestamp', ''),
+            topic=topic
+        )
+        
+        words = self._tokenize(f"{article.title} {article.content}")
+        if self._is_near_duplicate(unique_id, words):
+            return False # Skip near-duplicates (mirrors, interstitial pages)
+        word_counter = Counter(words)
+        
+        # --- Update Data Structures ---
+        snapshot.articles_list.append(article)
+        snapshot.articles_dict[unique_id] = article
+        self.article_order[unique_id] = article
+        
+        # Inverted Index (posting sets are copied before their first change,
+        # the published snapshot still shares the originals)
+        snapshot.article_word_counts[unique_id] = word_counter
+        
+        new_words = []
+        for word in word_counter:
+            if word not in copied_postings:
+                snapshot.word_to_articles[word] = set(snapshot.word_to_articles.get(word, ()))
+                copied_postings.add(word)
+            snapshot.word_to_articles[word].add(unique_id)
+            if word not in snapshot.all_words_set:
+                snapshot.all_words_set.add(word)
+                new_words.append(word)
+        
+        # Auxiliary structures are only kept up to date once built
+        bst = self._built_auxiliary('article_bst')
+        if bst is not None:
+            bst.insert(article)
+        
+        topic_tree = self._built_auxiliary('topic_tree')
+        if topic_tree is not None:
+            topic_tree.add_topic(topic, articles=[article])
+        
+        graph = self._built_auxiliary('article_graph')
+        if graph is not None:
+            graph.add_vertex(unique_id)
+        
+        trie = self._built_auxiliary('vocabulary_trie')
+        if trie is not None:
+            for word in new_words:
+                trie.insert(word)
+        
+        lsh = self._built_auxiliary('related_lsh')
+        if lsh is not None:
+            self._index_similarity(lsh, unique_id, word_counter)
+        
+        return True
@@ -0,0 +1,88 @@
+"""
+Search-as-you-type over the local index.
+
+Keystrokes are debounced: a preview is computed only once the text has
+been stable for `debounce_ms`, so typing "ransomware" costs one ranking, not
+ten. The preview runs TFIDFRanker.rank_prefix on a single worker under a
+latency budget. It never calls the spell checker or the web. A newer
+keystroke cancels a pending one, and a preview finished after a newer one
+was started is dropped. Crawling still happens only on an explicit submit.
+
+Scheduling is injected, so the same logic runs on Tk's event loop
+(root.after / root.after_cancel) and in tests.
+"""
+import time
+from collections import namedtuple
+from typing import Callable, Any
+
+from search_executor import SearchExecutor
+
+DEFAULT_DEBOUNCE_MS = 150
+DEFAULT_BUDGET = 0.05  # seconds of ranking per preview
+
+# results: (article, score) pairs; completions: query with its last word completed
+InstantPreview = namedtuple('InstantPreview', ['query', 'results', 'completions', 'elapsed'])
+
+
+class InstantSearch:
+    """Debounced, cancellable preview searches for the text in a search box"""
+
+    def __init__(self, ranker: Any, deliver: Callable[[Any, InstantPreview], None],
+                 schedule: Callable[[int, Callable[[], None]], Any], unschedule: Callable[[Any], None],
+                 debounce_ms: int = DEFAULT_DEBOUNCE_MS, budget: float = DEFAULT_BUDGET, top_k: int = 5):
+        self.ranker = ranker
+        # Called on the worker thread with (token, preview); the token tells
+        # whether the preview is still wanted, see is_current()
+        self.deliver = deliver
+        self.schedule = schedule
+        self.unschedule = unschedule
+        self.debounce_ms = debounce_ms
+        self.budget = budget
+        self.top_k = top_k
+        self._executor = SearchExecutor(max_workers=1)
+        self._pending = None
+        self.keystrokes = 0
+        self.dropped = 0
+        self.previews = 0
+
+    def on_text(self, text: str) -> None:
+        """Report the current search box text after an edit"""
+        self.keystrokes += 1
+        self._cancel_pending()
+        if not text.strip():
+            self._executor.cancel()
+            return
+        self._pending = self.schedule(self.debounce_ms, lambda: self._start(text))
+
+    def _cancel_pending(self) -> None:
+        if self._pending is not None:
+            self.unschedule(self._pending)
+            self._pending = None
+            self.dropped += 1
+
+    def _start(self, text: str) -> None:
+        self._pending = None
+        self._executor.submit(self._run, text)
+
+    def _run(self, token, text: str) -> None:
+        start = time.perf_counter()
+        results, completions = self.ranker.rank_prefix(text, top_k=self.top_k, budget=self.budget)
+        if token.is_set():
+            # Superseded while ranking
+            self.dropped += 1
+            return
+        self.previews += 1
+        self.deliver(token, InstantPreview(text, results, completions, time.perf_counter() - start))
+
+    def is_current(self, token) -> bool:
+        """Whether a delivered preview still matches the latest text"""
+        return self._executor.is_current(token)
+
+    def cancel(self) -> None:
+        """Drop pending and running previews (e.g. the query was submitted)"""
+        self._cancel_pending()
+        self._executor.cancel()
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._executor.shutdown()
@@ -1,10 +1,21 @@
+from startup_profile import StartupProfile
+
+# Created before the GUI imports so --startup-report can time them
+profile = StartupProfile.from_environment()
+
 import customtkinter as ctk
 from search_gui import SearchEngineGUI
 
+profile.mark("imports")
+
 def main():
     """Main function to start the application"""
     root = ctk.CTk()
-    app = SearchEngineGUI(root)
+    profile.mark("window created")
+    app = SearchEngineGUI(root, profile=profile)
+    profile.mark("widgets built")
+    # Runs once the event loop has drawn the window and is waiting for input
+    root.after_idle(profile.finish)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+"""
+Persistent cache of crawled pages.
+
+Stores the extracted title/content of every successfully fetched URL together
+with its ETag / Last-Modified validators in a SQLite file. Entries younger
+than the TTL are served without touching the network. Older entries are
+revalidated with a conditional GET, and a 304 reuses the stored text
+without downloading or parsing the page again.
+
+Each entry also records the extractor that produced its text. A lookup by
+a crawler using a different extractor is a miss, so changing the
+extractor (or the default) never serves text in the old format.
+"""
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+CACHE_FILE = "page_cache.sqlite3"
+DEFAULT_TTL = 24 * 60 * 60  # seconds
+
+CachedPage = namedtuple('CachedPage', ['url', 'title', 'content', 'etag', 'last_modified', 'fetched_at',
+                                       'extractor'])
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical cache key: lowercase scheme/host, no default port, no fragment, sorted query"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+
+class PageCache:
+    """SQLite-backed page cache, safe to share between crawler threads"""
+
+    def __init__(self, path: str = CACHE_FILE, ttl: float = DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY, title TEXT, content TEXT,"
+            " etag TEXT, last_modified TEXT, fetched_at REAL, extractor TEXT)"
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(pages)")]
+        if 'extractor' not in columns:
+            # Cache files from before the column: their entries match no extractor
+            self._conn.execute("ALTER TABLE pages ADD COLUMN extractor TEXT")
+        self._conn.commit()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, title, content, etag, last_modified, fetched_at, extractor FROM pages WHERE url = ?",
+                (normalize_url(url),)
+            ).fetchone()
+        return CachedPage(*row) if row else None
+
+    def is_fresh(self, entry: CachedPage) -> bool:
+        return time.time() - entry.fetched_at < self.ttl
+
+    def lookup(self, url: str, extractor: Optional[str] = None) -> Tuple[Optional[CachedPage], bool]:
+        """
+        (entry, fresh) for a URL about to be crawled, counting hits and misses.
+        With `extractor`, an entry extracted by another one counts as missing.
+        """
+        entry = self.get(url)
+        if entry is not None and extractor is not None and entry.extractor != extractor:
+            entry = None
+        fresh = entry is not None and self.is_fresh(entry)
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            elif entry is None:
+                self.misses += 1
+        return entry, fresh
+
+    @staticmethod
+    def conditional_headers(entry: CachedPage) -> Dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified"""
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def put(self, url: str, title: str, content: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, extractor: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, title, content, etag, last_modified, fetched_at, extractor)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), title, content, etag, last_modified, time.time(), extractor)
+            )
+            self._conn.commit()
+
+    def touch(self, url: str) -> None:
+        """Restart the TTL of an entry the server confirmed is unchanged"""
+        with self._lock:
+            self._conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), normalize_url(url)))
+            self._conn.commit()
+            self.revalidated += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -38,10 +38,11 @@ class QueryProcessor:
             return []
             
        
-        raw_tokens = self.tokenize(query)
+        return self.remove_stop_words(self.tokenize(query))
+    
+    def remove_stop_words(self, tokens: List[str]) -> List[str]:
         
-      
-        token_queue = deque(raw_tokens)
+        token_queue = deque(tokens)
         processed_tokens: List[str] = []
         
         while token_queue:
@@ -0,0 +1,89 @@
+"""
+Cursor-based paging over a cached ranked result list.
+
+The GUI ranks a query once for RESULT_CACHE_SIZE results and keeps them
+here. It then renders one page at a time into a fixed pool of result cards.
+Paging and re-sorting only move the cursor or reorder the cached list.
+Nothing is re-ranked and no widgets are created.
+"""
+from typing import List, Tuple, Any
+
+PAGE_SIZE = 15
+RESULT_CACHE_SIZE = 4 * PAGE_SIZE
+
+SORT_OPTIONS = ["Relevance", "Newest", "Oldest", "A-z"]
+
+
+class ResultPager:
+    """Ranked (article, score) pairs plus the current sort order and page"""
+
+    def __init__(self, page_size: int = PAGE_SIZE):
+        self.page_size = page_size
+        self.sort_option = "Relevance"
+        self.cursor = 0
+        self._ranked: List[Tuple[Any, float]] = []
+        self.results: List[Tuple[Any, float]] = []
+
+    def set_results(self, ranked_results: List[Tuple[Any, float]], keep_page: bool = False) -> None:
+        """
+        Replace the cached list (best first) and go back to the first page.
+        With keep_page (a streamed refresh of the same query) the current
+        page stays, or the last one if the list got shorter.
+        """
+        cursor = self.cursor
+        self._ranked = list(ranked_results)
+        self.sort(self.sort_option)
+        if keep_page:
+            self.cursor = min(cursor, (self.page_count - 1) * self.page_size)
+
+    def clear(self) -> None:
+        self.set_results([])
+
+    def sort(self, option: str) -> None:
+        """Reorder the cached results and go back to the first page"""
+        self.sort_option = option
+        results = list(self._ranked)
+        if option == "Newest":
+            # Handle missing timestamps by treating them as old
+            results.sort(key=lambda result: result[0].timestamp or "", reverse=True)
+        elif option == "Oldest":
+            results.sort(key=lambda result: result[0].timestamp or "9999")
+        elif option == "A-z":
+            results.sort(key=lambda result: result[0].title.lower())
+        # Relevance keeps the ranker's order
+        self.results = results
+        self.cursor = 0
+
+    def page(self) -> List[Tuple[Any, float]]:
+        return self.results[self.cursor:self.cursor + self.page_size]
+
+    @property
+    def has_next(self) -> bool:
+        return self.cursor + self.page_size < len(self.results)
+
+    @property
+    def has_prev(self) -> bool:
+        return self.cursor > 0
+
+    def next_page(self) -> bool:
+        if not self.has_next:
+            return False
+        self.cursor += self.page_size
+        return True
+
+    def prev_page(self) -> bool:
+        if not self.has_prev:
+            return False
+        self.cursor = max(0, self.cursor - self.page_size)
+        return True
+
+    @property
+    def page_number(self) -> int:
+        return self.cursor // self.page_size + 1
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self.results) // self.page_size))
+
+    def __len__(self) -> int:
+        return len(self.results)
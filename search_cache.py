@@ -0,0 +1,92 @@
+"""
+Persistent cache of web search results.
+
+Maps a normalized search query (including WebSearcher's " cybersecurity"
+suffix) to the URLs the providers returned, in a SQLite file that survives
+restarts. Repeating a query within the TTL skips the provider round-trip,
+and with it the request volume that gets the app's IP blocked. Searches that
+found nothing are cached as negative entries for a much shorter time. When
+the cache grows past max_entries, the oldest entries are evicted.
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+CACHE_FILE = "search_cache.sqlite3"
+DEFAULT_TTL = 6 * 60 * 60  # seconds
+DEFAULT_NEGATIVE_TTL = 10 * 60  # seconds
+DEFAULT_MAX_ENTRIES = 1000
+
+
+def normalize_query(query: str) -> str:
+    """Cache key: lowercase with whitespace collapsed"""
+    return re.sub(r'\s+', ' ', query).strip().lower()
+
+
+class SearchCache:
+    """SQLite-backed query -> URLs cache, safe to share between threads"""
+
+    def __init__(self, path: str = CACHE_FILE, ttl: float = DEFAULT_TTL,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS searches ("
+            " query TEXT PRIMARY KEY, urls TEXT, requested INTEGER, stored_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS searches_age ON searches (stored_at)")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, query: str, limit: int = 1) -> Optional[List[str]]:
+        """
+        Cached URLs for a query asked for at least `limit` results, or None on
+        a miss. An empty list is a cached "no results".
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT urls, requested, stored_at FROM searches WHERE query = ?", (normalize_query(query),)
+            ).fetchone()
+            if row is not None:
+                urls = json.loads(row[0])
+                ttl = self.ttl if urls else self.negative_ttl
+                # An answer to a smaller request cannot serve a bigger one
+                if time.time() - row[2] < ttl and (row[1] >= limit or not urls):
+                    self.hits += 1
+                    return urls
+            self.misses += 1
+            return None
+
+    def put(self, query: str, urls: List[str], limit: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (query, urls, requested, stored_at) VALUES (?, ?, ?, ?)",
+                (normalize_query(query), json.dumps(urls), limit, time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM searches WHERE query NOT IN"
+                " (SELECT query FROM searches ORDER BY stored_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM searches")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,65 @@
+"""
+Runs GUI searches on one bounded worker pool.
+
+Every search gets a cancel token (a threading.Event) as its first argument.
+Submitting a new search supersedes the previous one: its token is set, and
+if it had not started yet it never will. The search pipeline, web searcher
+and crawler all check the token, so a superseded search stops fetching,
+indexing and ranking within a fraction of a second. is_current() lets the
+UI ignore updates a stale search had already queued.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Optional, Tuple, Any
+
+
+class SearchExecutor:
+    """Thread pool that keeps only the latest search alive"""
+
+    def __init__(self, max_workers: int = 2):
+        # One worker for the current search, one for a superseded search winding down
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search")
+        self._lock = threading.Lock()
+        self._token: Optional[threading.Event] = None
+        self._future: Optional[Future] = None
+        self.submitted = 0
+        self.superseded = 0
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Tuple[threading.Event, Future]:
+        """Run fn(token, *args, **kwargs) as the current search, cancelling the previous one"""
+        token = threading.Event()
+        with self._lock:
+            self._cancel_current()
+            future = self._executor.submit(fn, token, *args, **kwargs)
+            future.add_done_callback(self._report_error)
+            self._token, self._future = token, future
+            self.submitted += 1
+        return token, future
+
+    def _cancel_current(self) -> None:
+        if self._token is None or self._token.is_set():
+            return
+        self._token.set()
+        if not self._future.done():
+            self.superseded += 1
+            # Never starts if it is still queued behind other searches
+            self._future.cancel()
+
+    @staticmethod
+    def _report_error(future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Search failed: {future.exception()!r}")
+
+    def is_current(self, token: threading.Event) -> bool:
+        """Whether the search owning `token` is the latest one and not cancelled"""
+        with self._lock:
+            return token is self._token and not token.is_set()
+
+    def cancel(self) -> None:
+        """Cancel the current search without starting another"""
+        with self._lock:
+            self._cancel_current()
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
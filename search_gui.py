@@ -6,23 +6,30 @@ import tkinter as tk
 from collections import deque
 from indexer import ArticleIndexer
 from tfidf import TFIDFRanker
-from article_viewers import ArticleViewer1, ArticleViewer2, ArticleViewer3
 from data_structures import Stack, Queue, BinarySearchTree, Graph
 from navigation import NavigationHistory
-from web_searcher import WebSearcher
-from crawler3 import SimpleCrawler
 from history_manager import HistoryManager
+from search_executor import SearchExecutor
+from instant_search import InstantSearch
+from result_pager import ResultPager, PAGE_SIZE, RESULT_CACHE_SIZE, SORT_OPTIONS
+# The article viewers and the networking stack (web_searcher, crawler3,
+# search_pipeline and through them requests/bs4) are imported on first use so
+# they do not delay the first window; see startup_profile.py
 
  
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
 
 class ResultCard(ctk.CTkFrame):
-    """Modern result card widget matching Google/Bing aesthetic"""
-    def __init__(self, parent, article, score, index, click_callback):
+    """
+    Modern result card widget matching Google/Bing aesthetic. Cards are
+    pooled: update_content() refills an existing card instead of building a
+    new one.
+    """
+    def __init__(self, parent, article=None, score=0.0, index=0, click_callback=None):
         super().__init__(parent, fg_color="transparent", corner_radius=0)
-        self.article = article
-        self.click_callback = click_callback
+        self.article = None
+        self.click_callback = None
         
         self.grid_columnconfigure(0, weight=1)
         self.configure(width=600)  
@@ -43,59 +50,76 @@ class ResultCard(ctk.CTkFrame):
         favicon.pack(side="left", padx=(0, 10))
         
         # Site Name / URL
-        site_name = ctk.CTkLabel(
+        self.site_name = ctk.CTkLabel(
             url_frame,
-            text=article.url.split('/')[2] if '//' in article.url else "Website",
+            text="",
             font=ctk.CTkFont(size=14, weight="normal"),
             text_color="#202124"
         )
-        site_name.pack(side="left", padx=(0, 5))
+        self.site_name.pack(side="left", padx=(0, 5))
         
-        url_text = ctk.CTkLabel(
+        self.url_text = ctk.CTkLabel(
             url_frame,
-            text=article.url,
+            text="",
             font=ctk.CTkFont(size=12),
             text_color="#5f6368"
         )
-        url_text.pack(side="left")
+        self.url_text.pack(side="left")
 
         # Title (Blue link style)
-        title_label = ctk.CTkLabel(
+        self.title_font = ctk.CTkFont(family="Arial", size=20, weight="normal")
+        self.title_label = ctk.CTkLabel(
             self,
-            text=article.title,
-            font=ctk.CTkFont(family="Arial", size=20, weight="normal"),
+            text="",
+            font=self.title_font,
             text_color="#1a0dab",
             anchor="w",
             cursor="hand2",
             wraplength=600
         )
-        title_label.grid(row=1, column=0, sticky="ew", pady=(0, 2))
-        title_label.bind("<Button-1>", lambda e: self._on_click())
-        title_label.bind("<Enter>", lambda e: title_label.configure(font=ctk.CTkFont(family="Arial", size=20, underline=True)))
-        title_label.bind("<Leave>", lambda e: title_label.configure(font=ctk.CTkFont(family="Arial", size=20, underline=False)))
+        self.title_label.grid(row=1, column=0, sticky="ew", pady=(0, 2))
+        self.title_label.bind("<Button-1>", lambda e: self._on_click())
+        self.title_label.bind("<Enter>", lambda e: self.title_font.configure(underline=True))
+        self.title_label.bind("<Leave>", lambda e: self.title_font.configure(underline=False))
         
         # Snippet
-        snippet_text = article.content[:200] + "..." if len(article.content) > 200 else article.content
-        snippet_label = ctk.CTkLabel(
+        self.snippet_label = ctk.CTkLabel(
             self,
-            text=snippet_text,
+            text="",
             font=ctk.CTkFont(family="Arial", size=14),
             text_color="#4d5156",
             anchor="w",
             justify="left",
             wraplength=600
         )
-        snippet_label.grid(row=2, column=0, sticky="ew", pady=(0, 15))
+        self.snippet_label.grid(row=2, column=0, sticky="ew", pady=(0, 15))
+        
+        if article is not None:
+            self.update_content(article, score, index, click_callback)
+
+    def update_content(self, article, score, index, click_callback):
+        """Show another result in this card"""
+        self.article = article
+        self.click_callback = click_callback
+        self.site_name.configure(text=article.url.split('/')[2] if '//' in article.url else "Website")
+        self.url_text.configure(text=article.url)
+        self.title_label.configure(text=article.title)
+        snippet_text = article.content[:200] + "..." if len(article.content) > 200 else article.content
+        self.snippet_label.configure(text=snippet_text)
 
     def _on_click(self):
         if self.click_callback:
             self.click_callback(self.article)
 
 class SearchEngineGUI:
+    # Rows in the search-as-you-type dropdown
+    INSTANT_COMPLETIONS = 4
+    INSTANT_RESULTS = 5
     
-    
-    def __init__(self, root):
+    def __init__(self, root, profile=None):
         self.root = root
+        # StartupProfile from main.py; records when the index is ready
+        self.profile = profile
         self.root.title("DSA Search Engine")
         self.root.geometry("1400x900")
         
@@ -111,13 +135,21 @@ class SearchEngineGUI:
         self.indexer = None
         self.ranker = None
         self.is_indexing = True
-        self.web_searcher = WebSearcher()
-        self.crawler = SimpleCrawler()
+        # Web searcher and crawler are created by the first search that
+        # needs them (see the properties below), not at startup
+        self._web_searcher = None
+        self._crawler = None
+        self._networking_lock = threading.Lock()
+        # Set by _on_close; worker threads stop scheduling Tk callbacks
+        self._closed = False
+        # Searches share a small pool; starting one cancels the one before
+        self.search_executor = SearchExecutor(max_workers=2)
         
         # Query history from persistent storage
         self.query_history = deque(HistoryManager.load_history(), maxlen=20)
         
-        # Current search results
+        # Current search results: the cached ranked list and the page shown
+        self.result_pager = ResultPager(PAGE_SIZE)
         self.current_results = []
         self.current_query = ""
         self.current_sort_option = "Relevance"
@@ -125,14 +157,71 @@ class SearchEngineGUI:
         # Search suggestions
         self.suggestions = []
         self.suggestion_window = None
+        # Search-as-you-type previews; needs the ranker, so created after indexing
+        self.instant_search = None
         
         # Navigation system using Queue and Stack
         self.navigation_history = NavigationHistory()
         
         self._create_widgets()
         self._setup_keyboard_shortcuts()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         self._load_indexer_async()
     
+    @property
+    def web_searcher(self):
+        with self._networking_lock:
+            if self._web_searcher is None:
+                from search_cache import SearchCache
+                from web_searcher import WebSearcher
+                # Repeated queries are answered from disk instead of re-asking the providers
+                self._web_searcher = WebSearcher(cache=SearchCache())
+            return self._web_searcher
+    
+    @property
+    def crawler(self):
+        with self._networking_lock:
+            if self._crawler is None:
+                from crawler3 import SimpleCrawler
+                from page_cache import PageCache
+                # Page parsing runs in worker processes so it cannot stall the Tk event loop
+                crawler = SimpleCrawler(cache=PageCache(), extraction_workers=2)
+                # Never re-crawl pages that are already in the index
+                if self.indexer is not None and not self.is_indexing:
+                    crawler.mark_seen(article.url for article in self.indexer.articles_list)
+                self._crawler = crawler
+            return self._crawler
+    
+    def _on_close(self):
+        """Stop background work and release pools, processes and cache files, then close the window"""
+        self._closed = True
+        if self.instant_search is not None:
+            self.instant_search.shutdown()
+        self.search_executor.shutdown()
+        with self._networking_lock:
+            web_searcher, crawler = self._web_searcher, self._crawler
+        if web_searcher is not None:
+            web_searcher.close()
+            web_searcher.cache.close()
+        if crawler is not None:
+            # Shuts down the extraction processes and pooled connections
+            crawler.close()
+            crawler.cache.close()
+        # Debounce timers, queued redraws and customtkinter's own callbacks
+        for job in self.root.tk.splitlist(self.root.tk.call('after', 'info')):
+            self.root.after_cancel(job)
+        self.root.destroy()
+    
+    def _call_on_tk_thread(self, callback):
+        """root.after(0, callback) for worker threads; dropped once the window is closing"""
+        if self._closed:
+            return
+        try:
+            self.root.after(0, callback)
+        except (RuntimeError, tk.TclError):
+            # Destroyed between the check and the call
+            pass
+    
     def _load_indexer_async(self):
         """Load indexer in background thread"""
         def load():
@@ -140,7 +229,7 @@ class SearchEngineGUI:
             self.indexer.index_all()
             self.ranker = TFIDFRanker(self.indexer)
             self.is_indexing = False
-            self.root.after(0, self._on_indexing_complete)
+            self._call_on_tk_thread(self._on_indexing_complete)
         
         thread = threading.Thread(target=load, daemon=True)
         thread.start()
@@ -168,6 +257,12 @@ class SearchEngineGUI:
         self.header_entry.configure(state="normal")
         # Load suggestions
         self._load_suggestions()
+        # Search is usable now; build BST/graph/trie/LSH in the background
+        self.indexer.warm_auxiliary_structures(background=True)
+        self.instant_search = InstantSearch(self.ranker, self._deliver_instant_preview,
+                                            self.root.after, self.root.after_cancel, top_k=self.INSTANT_RESULTS)
+        if self.profile is not None:
+            self.profile.mark("index loaded")
     
     def _load_suggestions(self):
         """Load search suggestions from predefined queries"""
@@ -339,6 +434,7 @@ class SearchEngineGUI:
         self.search_entry.place(x=60, y=5)
         self.search_entry.bind("<Return>", lambda e: self._perform_search())
         self.search_var.trace("w", lambda *args: self._on_home_text_change())
+        self.search_var.trace("w", lambda *args: self._on_search_text_change())
 
         # Right Icons (Image, Mic)
         right_icons = ctk.CTkFrame(self.home_search_bar, fg_color="transparent")
@@ -521,7 +617,7 @@ class SearchEngineGUI:
         self.sort_var = ctk.StringVar(value="Relevance")
         self.sort_combo = ctk.CTkComboBox(
             self.options_frame, 
-            values=["Relevance", "Newest", "Oldest", "A-z"],
+            values=SORT_OPTIONS,
             command=self._on_sort_change,
             width=120,
             state="readonly",
@@ -544,6 +640,7 @@ class SearchEngineGUI:
         )
         self.results_scrollable_frame.grid(row=2, column=0, sticky="nsew", padx=150) # Left margin like Google
         self.results_scrollable_frame.grid_columnconfigure(0, weight=1)
+        self._create_results_view()
 
         # Initialize in Home Mode
         self._switch_to_home_mode()
@@ -551,9 +648,71 @@ class SearchEngineGUI:
     def _hide_suggestions(self):
         """Hide suggestions"""
         if self.suggestion_window:
-            self.suggestion_window.destroy()
+            self.suggestion_window.place_forget()
             self.suggestion_window = None
     
+    def _on_search_text_change(self):
+        """Preview local results while typing; the web is only searched on Enter"""
+        if self.instant_search is not None:
+            self.instant_search.on_text(self.search_var.get())
+        if not self.search_var.get().strip():
+            self._hide_suggestions()
+    
+    def _deliver_instant_preview(self, token, preview):
+        """Called on the instant-search worker; shows the preview unless the text moved on"""
+        def show():
+            if self.instant_search.is_current(token) and self.search_var.get() == preview.query:
+                self._show_instant_preview(preview)
+        self._call_on_tk_thread(show)
+    
+    def _create_instant_dropdown(self):
+        """Dropdown under the search box, built once and refilled for every preview"""
+        self.instant_dropdown = ctk.CTkFrame(self.root, fg_color="white", corner_radius=8,
+                                             border_width=1, border_color="#dadce0")
+        # Completions first, then the top results
+        self.instant_rows = []
+        for _ in range(self.INSTANT_COMPLETIONS + self.INSTANT_RESULTS):
+            row = ctk.CTkLabel(self.instant_dropdown, text="", anchor="w", cursor="hand2",
+                               font=ctk.CTkFont(family="Arial", size=14), width=560)
+            row.bind("<Button-1>", lambda e, slot=len(self.instant_rows): self._on_instant_row_click(slot))
+            self.instant_rows.append(row)
+        self.instant_row_actions = [None] * len(self.instant_rows)
+        self.instant_footer = ctk.CTkLabel(self.instant_dropdown, text="", anchor="w",
+                                           font=ctk.CTkFont(size=11), text_color="#9aa0a6")
+    
+    def _show_instant_preview(self, preview):
+        if not hasattr(self, 'instant_dropdown'):
+            self._create_instant_dropdown()
+        entries = [("🔍  " + completion, "#202124", lambda c=completion: self._select_suggestion(c))
+                   for completion in preview.completions[:self.INSTANT_COMPLETIONS]]
+        entries += [("📄  " + article.title, "#1a0dab", lambda a=article, pos=i: self._on_article_click(a, pos))
+                    for i, (article, _) in enumerate(preview.results[:self.INSTANT_RESULTS])]
+        if not entries:
+            self._hide_suggestions()
+            return
+        self.suggestions = list(preview.completions)
+        
+        for row in self.instant_rows + [self.instant_footer]:
+            row.pack_forget()
+        for slot, (text, color, action) in enumerate(entries):
+            self.instant_rows[slot].configure(text=text, text_color=color)
+            self.instant_row_actions[slot] = action
+            self.instant_rows[slot].pack(fill="x", padx=12, pady=1)
+        self.instant_footer.configure(
+            text=f"Local preview in {preview.elapsed * 1000:.1f} ms · press Enter to search the web")
+        self.instant_footer.pack(fill="x", padx=12, pady=(2, 6))
+        
+        entry = self.header_entry if self.results_frame.winfo_ismapped() else self.search_entry
+        self.instant_dropdown.place(in_=entry, relx=0, rely=1.0, y=8, anchor="nw")
+        self.instant_dropdown.lift()
+        self.suggestion_window = self.instant_dropdown
+    
+    def _on_instant_row_click(self, slot):
+        action = self.instant_row_actions[slot]
+        self._hide_suggestions()
+        if action:
+            action()
+    
     def _select_suggestion(self, suggestion):
         """Select a suggestion"""
         self.search_var.set(suggestion)
@@ -602,6 +761,9 @@ class SearchEngineGUI:
         if not query or self.is_indexing:
             return
         
+        # Submitting replaces any preview still being computed
+        if self.instant_search is not None:
+            self.instant_search.cancel()
         self._hide_suggestions()
         self.current_query = query
         
@@ -623,173 +785,39 @@ class SearchEngineGUI:
         # Show loading
         self._show_search_loading()
         
-        # Perform search in background
-        def search():
-            start_time = time.time()
-            
-            # --- Real-Time Web Search ---
-            # Update UI from thread (careful with Tkinter)
-            self.root.after(0, lambda: self.results_label.configure(text="Searching the web..."))
-            
-            try:
-                # Fetch URLs from Google/Web
-                urls = self.web_searcher.get_search_results(query, limit=3)
-                
-                if urls:
-                    self.root.after(0, lambda: self.results_label.configure(text=f"Found {len(urls)} results. Crawling content..."))
-                    
-                    # Crawl content
-                    new_articles = self.crawler.crawl_urls(urls)
-                    
-                    if new_articles:
-                        self.root.after(0, lambda: self.results_label.configure(text=f"Indexing {len(new_articles)} new articles..."))
-                        
-                        # Add to Indexer
-                        if self.indexer:
-                            self.indexer.add_articles(new_articles)
-                            
-                            # Update Ranker IDF
-                            if self.ranker:
-                                self.ranker.update_idf()
-            except Exception as e:
-                print(f"Web search failed: {e}")
-            
-            # --- Final Ranking ---
-            self.root.after(0, lambda: self.results_label.configure(text="Ranking results..."))
-            
-            if self.ranker:
-                ranked_results, suggestion = self.ranker.rank_articles(query, top_k=15, min_score=0.001)
-                elapsed = time.time() - start_time
-                self.root.after(0, lambda: self._display_results(query, ranked_results, elapsed, suggestion))
-        
-        thread = threading.Thread(target=search, daemon=True)
-        thread.start()
-    
-    def _show_search_loading(self):
-        """Show loading state during search"""
-        if hasattr(self, 'results_label'):
-             self.results_label.configure(text="Searching...")
+        # Perform search in background; a newer search cancels this one
+        def search(token):
+            if not self.ranker:
+                return
+            from search_pipeline import local_first_search, result_ids, DEFAULT_CRAWL_DEADLINE
+            # Phase 1 ranks the local index at once; the web phase (search,
+            # crawl, index) only redraws when new articles change the top results
+            shown_ids = None
+            # The networking objects are built (on first use) only after the local results are shown
+            for update in local_first_search(query, lambda: self.web_searcher, lambda: self.crawler,
+                                             self.indexer, self.ranker, url_limit=3, deadline=DEFAULT_CRAWL_DEADLINE,
+                                             top_k=RESULT_CACHE_SIZE, cancel=token):
+                ids = result_ids(update.results)
+                if ids != shown_ids:
+                    # Later updates refresh the same query: stay on the page being read
+                    refresh = shown_ids is not None
+                    shown_ids = ids
+                    self._post_search_update(token, lambda u=update, r=refresh: self._display_results(
+                        query, u.results, u.elapsed, u.suggestion, keep_page=r))
+                if update.done:
+                    self._post_search_update(token, lambda: self.results_label.configure(text=""))
+                elif update.indexed == 0:
+                    self._post_search_update(token, lambda: self.results_label.configure(
+                        text="Checking the web for more results..."))
         
-        for widget in self.results_scrollable_frame.winfo_children():
-            widget.destroy()
+        self.search_executor.submit(search)
     
-    def _clear_results(self):
-        """Clear search results"""
-        self.current_query = ""
-        self.current_results = []
-        self.results_label.configure(text="")
-        for widget in self.results_scrollable_frame.winfo_children():
-            widget.destroy()
-        self._switch_to_home_mode()
-        self._hide_suggestions()
-        # Update clear button visibility
-        text = self.search_var.get()
-        if text:
-            self.clear_btn.grid()
-            self.compact_clear_btn.grid()
-        else:
-            self.clear_btn.grid_remove()
-            self.compact_clear_btn.grid_remove()
-    
-    def _display_results(self, query: str, ranked_results, elapsed_time, suggestion=None):
-        """Display search results in modern format"""
-        # Switch to results mode
-        self._switch_to_results_mode()
-        
-        # Clear previous results
-        for widget in self.results_scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        # Did you mean suggestion
-        if suggestion:
-            suggestion_frame = ctk.CTkFrame(self.results_scrollable_frame, fg_color="transparent")
-            suggestion_frame.pack(fill="x", pady=(0, 20))
-            
-            did_mean_label = ctk.CTkLabel(
-                suggestion_frame,
-                text="Did you mean: ",
-                font=ctk.CTkFont(size=14, weight="normal"),
-                text_color="#ea4335"
-            )
-            did_mean_label.pack(side="left")
-            
-            suggestion_link = ctk.CTkLabel(
-                suggestion_frame,
-                text=suggestion,
-                font=ctk.CTkFont(size=14, weight="bold", underline=True),
-                text_color="#1a0dab",
-                cursor="hand2"
-            )
-            suggestion_link.pack(side="left")
-            
-            # Click handler for suggestion
-            def on_suggestion_click(e):
-                self.search_var.set(suggestion)
-                self._perform_search()
-                
-            suggestion_link.bind("<Button-1>", on_suggestion_click)
-        
-        if not ranked_results:
-            no_results = ctk.CTkFrame(self.results_scrollable_frame, fg_color="transparent")
-            no_results.grid(row=0, column=0, pady=50)
-            no_results.grid_columnconfigure(0, weight=1)
-            
-            icon = ctk.CTkLabel(
-                no_results,
-                text="😕",
-                font=ctk.CTkFont(size=48),
-                text_color="#dadce0"
-            )
-            icon.grid(row=0, column=0, pady=(0, 20))
-            
-            text = ctk.CTkLabel(
-                no_results,
-                text=f"No results found for '{query}'",
-                font=ctk.CTkFont(size=18),
-                text_color="#70757a"
-            )
-            text.grid(row=1, column=0, pady=(0, 10))
-            
-            hint = ctk.CTkLabel(
-                no_results,
-                text="Try different keywords or check spelling",
-                font=ctk.CTkFont(size=14),
-                text_color="#bdc1c6"
-            )
-            hint.grid(row=2, column=0)
-            
-            self.results_label.configure(text="")
-            return
-        
-        # Results count with timing
-        self.results_label.configure(
-            text=f"About {len(ranked_results)} results ({elapsed_time:.3f} seconds)"
-        )
-        
-        # Create result cards with animation
-        def make_click_handler(pos):
-            """Factory function to create click handler with proper closure"""
-            return lambda art: self._on_article_click(art, pos)
-        
-        # Ensure scrollable frame is properly configured
-        self.results_scrollable_frame.grid_columnconfigure(0, weight=1)
-        
-        # Create result cards - use pack for CTkScrollableFrame
-        for idx, (article, score) in enumerate(ranked_results, 1):
-            position = idx - 1
-            
-            card = ResultCard(
-                self.results_scrollable_frame,
-                article,
-                score,
-                idx,
-                make_click_handler(position)
-            )
-            # Pack cards vertically in scrollable frame
-            card.pack(fill="x", pady=(0, 15), padx=0)
-        
-        # Force update to ensure all cards are visible
-        self.results_scrollable_frame.update_idletasks()
+    def _post_search_update(self, token, callback):
+        """Run callback on the Tk thread unless its search was superseded by then"""
+        def run():
+            if self.search_executor.is_current(token):
+                callback()
+        self._call_on_tk_thread(run)
     
     def _navigate_back(self):
         """Navigate backward using Stack"""
@@ -836,18 +864,19 @@ class SearchEngineGUI:
         
         self.current_query = query
         self.search_var.set(query)
+        if self.instant_search is not None:
+            self.instant_search.cancel()
         self._hide_suggestions()
         self._show_search_loading()
         
         # Perform search in background
-        def search():
+        def search(token):
             start_time = time.time()
-            ranked_results, suggestion = self.ranker.rank_articles(query, top_k=15, min_score=0.001)
+            ranked_results, suggestion = self.ranker.rank_articles(query, top_k=RESULT_CACHE_SIZE, min_score=0.001)
             elapsed = time.time() - start_time
-            self.root.after(0, lambda: self._display_results(query, ranked_results, elapsed, suggestion))
+            self._post_search_update(token, lambda: self._display_results(query, ranked_results, elapsed, suggestion))
         
-        thread = threading.Thread(target=search, daemon=True)
-        thread.start()
+        self.search_executor.submit(search)
 
     def _show_search_loading(self):
         """Show loading state during search"""
@@ -858,17 +887,19 @@ class SearchEngineGUI:
         # Switch to results view but show nothing yet?
         # Or just show "Searching..." in title
         self._switch_to_results_mode()
-        for widget in self.results_scrollable_frame.winfo_children():
-            widget.destroy()
+        self._hide_results_view()
 
     def _clear_results(self):
         """Clear search results"""
+        # Results of a search still running would bring the results page back
+        self.search_executor.cancel()
         self.current_query = ""
-        self.current_results = []
+        self.result_pager.clear()
+        self.current_results = self.result_pager.results
         self.search_var.set("")
+        self.results_label.configure(text="")
         
-        for widget in self.results_scrollable_frame.winfo_children():
-            widget.destroy()
+        self._hide_results_view()
             
         self._switch_to_home_mode()
         self._hide_suggestions()
@@ -877,94 +908,164 @@ class SearchEngineGUI:
             self.progress_bar.stop()
             self.progress_bar.place_forget()
 
-    def _display_results(self, query: str, ranked_results, elapsed_time, suggestion=None):
-        """Display search results in modern Google format"""
-        self._switch_to_results_mode()
+    def _create_results_view(self):
+        """
+        Widgets of the results page, created once. Searches, sorting and
+        paging only reconfigure them; result cards come from a pool that
+        grows to one page and is reused from then on.
+        """
+        frame = self.results_scrollable_frame
         
-        # Store for sorting
-        self.current_results = ranked_results
+        # "Did you mean" suggestion
+        self.suggestion_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        did_mean_label = ctk.CTkLabel(
+            self.suggestion_frame,
+            text="Did you mean: ",
+            font=ctk.CTkFont(family="Arial", size=16, weight="normal"),
+            text_color="#d93025" # Google red for caution/correction
+        )
+        did_mean_label.pack(side="left")
+        self.suggestion_link = ctk.CTkLabel(
+            self.suggestion_frame,
+            text="",
+            font=ctk.CTkFont(family="Arial", size=16, weight="bold", italic=True),
+            text_color="#1a0dab", # Google blue link
+            cursor="hand2"
+        )
+        self.suggestion_link.pack(side="left")
+        self.suggestion_link.bind("<Button-1>", lambda e: self._select_suggestion(self.suggestion_link.cget("text")))
+        self.suggestion_frame.grid(row=0, column=0, sticky="w", pady=(0, 20))
+        
+        # Stats bar (About X results)
+        self.stats_label = ctk.CTkLabel(
+            frame,
+            text="",
+            font=ctk.CTkFont(family="Arial", size=14),
+            text_color="#70757a"
+        )
+        self.stats_label.grid(row=1, column=0, sticky="w", pady=(0, 20))
         
-        # Sort if needed (default is Relevance which is already sorted by score)
-        if self.current_sort_option != "Relevance":
-             self._sort_results()
-             ranked_results = self.current_results
+        self.no_results_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        self.no_results_label = ctk.CTkLabel(
+            self.no_results_frame,
+            text="",
+            font=ctk.CTkFont(family="Arial", size=16),
+            text_color="#202124"
+        )
+        self.no_results_label.pack(anchor="w", pady=(0, 10))
+        hint = ctk.CTkLabel(
+            self.no_results_frame,
+            text="Suggestions:\n\n• Make sure that all words are spelled correctly.\n• Try different keywords.\n• Try more general keywords.",
+            font=ctk.CTkFont(family="Arial", size=14),
+            text_color="#202124",
+            justify="left"
+        )
+        hint.pack(anchor="w")
+        self.no_results_frame.grid(row=2, column=0, sticky="w", pady=40)
+        
+        # Card rows 3 .. 3 + page_size - 1, then the pager
+        self.result_cards = []
+        self.pager_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        self.prev_page_button = ctk.CTkButton(
+            self.pager_frame, text="‹ Previous", width=90, fg_color="transparent",
+            text_color="#1a0dab", hover_color="#f1f3f4", command=self._show_previous_page
+        )
+        self.prev_page_button.pack(side="left")
+        self.page_label = ctk.CTkLabel(self.pager_frame, text="", font=ctk.CTkFont(size=14), text_color="#70757a")
+        self.page_label.pack(side="left", padx=20)
+        self.next_page_button = ctk.CTkButton(
+            self.pager_frame, text="Next ›", width=90, fg_color="transparent",
+            text_color="#1a0dab", hover_color="#f1f3f4", command=self._show_next_page
+        )
+        self.next_page_button.pack(side="left")
+        self.pager_frame.grid(row=3 + self.result_pager.page_size, column=0, pady=(0, 30))
+        
+        self._hide_results_view()
+
+    def _hide_results_view(self):
+        """Hide every results-page widget (they stay alive for reuse)"""
+        for widget in (self.suggestion_frame, self.stats_label, self.no_results_frame, self.pager_frame):
+            widget.grid_remove()
+        for card in self.result_cards:
+            card.grid_remove()
+
+    def _result_card(self, slot: int) -> ResultCard:
+        """Card for a position on the page, created the first time the slot is needed"""
+        while len(self.result_cards) <= slot:
+            card = ResultCard(self.results_scrollable_frame)
+            card.grid(row=3 + len(self.result_cards), column=0, sticky="ew", pady=(0, 25))
+            self.result_cards.append(card)
+        return self.result_cards[slot]
+
+    def _display_results(self, query: str, ranked_results, elapsed_time, suggestion=None, keep_page=False):
+        """Display search results in modern Google format; keep_page for refreshes of the shown query"""
+        self._switch_to_results_mode()
         
         # Stop loading
         if hasattr(self, 'progress_bar'):
             self.progress_bar.stop()
             self.progress_bar.place_forget()
         
-        # Clear previous results
-        for widget in self.results_scrollable_frame.winfo_children():
-            widget.destroy()
+        # Cache the whole ranked list; only the current page is rendered
+        self.result_pager.set_results(ranked_results, keep_page=keep_page)
+        self.current_results = self.result_pager.results
         
-        # "Did you mean" suggestion
         if suggestion:
-            suggestion_frame = ctk.CTkFrame(self.results_scrollable_frame, fg_color="transparent")
-            suggestion_frame.pack(fill="x", pady=(0, 20), anchor="w")
-            
-            did_mean_label = ctk.CTkLabel(
-                suggestion_frame,
-                text="Did you mean: ",
-                font=ctk.CTkFont(family="Arial", size=16, weight="normal"),
-                text_color="#d93025" # Google red for caution/correction
-            )
-            did_mean_label.pack(side="left")
-            
-            suggestion_link = ctk.CTkLabel(
-                suggestion_frame,
-                text=suggestion,
-                font=ctk.CTkFont(family="Arial", size=16, weight="bold", italic=True),
-                text_color="#1a0dab", # Google blue link
-                cursor="hand2"
-            )
-            suggestion_link.pack(side="left")
-            suggestion_link.bind("<Button-1>", lambda e: self._select_suggestion(suggestion))
+            self.suggestion_link.configure(text=suggestion)
+            self.suggestion_frame.grid()
+        else:
+            self.suggestion_frame.grid_remove()
         
-        # Stats bar (About X results)
-        stats_label = ctk.CTkLabel(
-            self.results_scrollable_frame,
-            text=f"About {len(ranked_results)} results ({elapsed_time:.2f} seconds)",
-            font=ctk.CTkFont(family="Arial", size=14),
-            text_color="#70757a"
-        )
-        stats_label.pack(anchor="w", pady=(0, 20))
+        self.stats_label.configure(text=f"About {len(ranked_results)} results ({elapsed_time:.2f} seconds)")
+        self.stats_label.grid()
 
         if not ranked_results:
-            no_results = ctk.CTkFrame(self.results_scrollable_frame, fg_color="transparent")
-            no_results.pack(pady=40, anchor="w")
-            
-            text = ctk.CTkLabel(
-                no_results,
-                text=f"Your search - {query} - did not match any documents.",
-                font=ctk.CTkFont(family="Arial", size=16),
-                text_color="#202124"
-            )
-            text.pack(anchor="w", pady=(0, 10))
-            
-            hint = ctk.CTkLabel(
-                no_results,
-                text="Suggestions:\n\n• Make sure that all words are spelled correctly.\n• Try different keywords.\n• Try more general keywords.",
-                font=ctk.CTkFont(family="Arial", size=14),
-                text_color="#202124",
-                justify="left"
-            )
-            hint.pack(anchor="w")
-            return
+            self.no_results_label.configure(text=f"Your search - {query} - did not match any documents.")
+            self.no_results_frame.grid()
+        else:
+            self.no_results_frame.grid_remove()
+        # A refresh of the same query leaves the reader where they were
+        self._render_results_page(scroll_to_top=not keep_page)
+
+    def _render_results_page(self, scroll_to_top=True):
+        """Fill the card pool with the pager's current page; new pages, sorts and queries start at the top"""
+        page = self.result_pager.page()
+        for slot, (article, score) in enumerate(page):
+            position = self.result_pager.cursor + slot
+            card = self._result_card(slot)
+            card.update_content(article, score, position + 1,
+                                lambda a, pos=position: self._on_article_click(a, pos))
+            card.grid()
+        for card in self.result_cards[len(page):]:
+            card.grid_remove()
         
-        # Results
-        for idx, (article, score) in enumerate(ranked_results, 1):
-             card = ResultCard(
-                self.results_scrollable_frame,
-                article,
-                score,
-                idx,
-                lambda a, pos=idx-1: self._on_article_click(a, pos) # correct closure
-            )
-             card.pack(fill="x", pady=(0, 25))
+        if self.result_pager.page_count > 1:
+            self.page_label.configure(text=f"Page {self.result_pager.page_number} of {self.result_pager.page_count}")
+            self.prev_page_button.configure(state="normal" if self.result_pager.has_prev else "disabled")
+            self.next_page_button.configure(state="normal" if self.result_pager.has_next else "disabled")
+            self.pager_frame.grid()
+        else:
+            self.pager_frame.grid_remove()
+        if scroll_to_top:
+            self._scroll_results_to_top()
+
+    def _scroll_results_to_top(self):
+        # CTkScrollableFrame has no public scrolling method; skip quietly if its canvas is renamed
+        canvas = getattr(self.results_scrollable_frame, '_parent_canvas', None)
+        if canvas is not None:
+            canvas.yview_moveto(0)
+
+    def _show_next_page(self):
+        if self.result_pager.next_page():
+            self._render_results_page()
+
+    def _show_previous_page(self):
+        if self.result_pager.prev_page():
+            self._render_results_page()
 
     def _on_article_click(self, article, position):
         """Handle article click"""
+        from article_viewers import ArticleViewer1, ArticleViewer2, ArticleViewer3
         # Open different viewer based on position
         if position == 0:
             ArticleViewer1(self.root, article)
@@ -977,22 +1078,8 @@ class SearchEngineGUI:
     def _on_sort_change(self, choice):
         """Handle sort option change"""
         self.current_sort_option = choice
+        # Re-order the cached results; nothing is re-ranked or rebuilt
+        self.result_pager.sort(choice)
+        self.current_results = self.result_pager.results
         if self.current_results:
-             # Redisplay (will trigger sorting)
-             # We pass 0 as time since we are just re-ordering
-             self._display_results(self.current_query, self.current_results, 0.0)
-
-    def _sort_results(self):
-        """Sort current results in place based on option"""
-        if not self.current_results:
-            return
-
-        if self.current_sort_option == "Newest":
-             # Sort by timestamp (descending)
-             # Handle missing timestamps by treating them as old
-             self.current_results.sort(key=lambda x: x.article.timestamp if x.article.timestamp else "", reverse=True)
-        elif self.current_sort_option == "Oldest":
-             self.current_results.sort(key=lambda x: x.article.timestamp if x.article.timestamp else "9999")
-        elif self.current_sort_option == "A-z":
-             self.current_results.sort(key=lambda x: x.article.title)
-        # Relevance is default (no sort needed as ranker returns sorted)
+            self._render_results_page()
@@ -0,0 +1,108 @@
+"""
+Streaming crawl -> index -> rank pipeline.
+
+Crawled pages are added to the index as they arrive and the query is
+re-ranked, so callers (the GUI) can show improving results while slower
+sites are still loading. Pages arriving within BATCH_WINDOW of each other
+are indexed together: every add_articles() call copies the index snapshot
+and the ranker recomputes IDF for it, which per page adds up to quadratic
+work over a large crawl. Pages that miss the crawl deadline are dropped.
+
+local_first_search() puts a ranking of the existing index in front of all
+that. Queries the local corpus answers well show results in milliseconds,
+and the web phase only produces an update if it changes the top-k.
+"""
+import threading
+import time
+from collections import namedtuple
+from typing import Callable, Iterator, List, Optional, Any, TYPE_CHECKING
+
+from indexer import ArticleIndexer
+from tfidf import TFIDFRanker
+
+if TYPE_CHECKING:
+    from crawler3 import SimpleCrawler
+
+DEFAULT_CRAWL_DEADLINE = 8.0  # seconds
+BATCH_WINDOW = 0.1  # seconds a page may wait for others to be indexed with it
+
+# results: ranked (article, score) pairs; indexed: pages added so far;
+# done: True on the final update; elapsed: seconds since the search started
+SearchUpdate = namedtuple('SearchUpdate', ['results', 'suggestion', 'indexed', 'done', 'elapsed'])
+
+
+def result_ids(results) -> List[str]:
+    return [article.unique_id for article, _ in results]
+
+
+def stream_search(query: str, urls: List[str], crawler: 'SimpleCrawler', indexer: ArticleIndexer,
+                  ranker: TFIDFRanker, deadline: Optional[float] = DEFAULT_CRAWL_DEADLINE,
+                  top_k: int = 15, min_score: float = 0.001,
+                  shown_ids: Optional[List[str]] = None,
+                  cancel: Optional[threading.Event] = None,
+                  batch_window: float = BATCH_WINDOW) -> Iterator[SearchUpdate]:
+    """
+    Crawl the URLs and yield a SearchUpdate every time a newly indexed batch
+    of pages (see BATCH_WINDOW) changes the ranking (compared with `shown_ids`, the ranking already on
+    screen, if given), then one final update (done=True) once the crawl
+    finished or hit its deadline. After `cancel` is set nothing more is
+    yielded, not even the final update.
+    """
+    start = time.time()
+    indexed = 0
+    last_ids = shown_ids
+
+    for batch in crawler.iter_crawl_batches(urls, deadline=deadline, cancel=cancel, window=batch_window):
+        # Exact and near-duplicates are rejected by the indexer
+        added = indexer.add_articles(batch)
+        if added == 0:
+            continue
+        indexed += added
+        if cancel is not None and cancel.is_set():
+            return
+        ranker.update_idf()
+        results, suggestion = ranker.rank_articles(query, top_k=top_k, min_score=min_score)
+        ids = result_ids(results)
+        if ids != last_ids:
+            last_ids = ids
+            yield SearchUpdate(results, suggestion, indexed, False, time.time() - start)
+
+    if cancel is not None and cancel.is_set():
+        return
+    results, suggestion = ranker.rank_articles(query, top_k=top_k, min_score=min_score)
+    yield SearchUpdate(results, suggestion, indexed, True, time.time() - start)
+
+
+def local_first_search(query: str, get_web_searcher: Callable[[], Any], get_crawler: Callable[[], 'SimpleCrawler'],
+                       indexer: ArticleIndexer, ranker: TFIDFRanker, url_limit: int = 3, deadline: Optional[float] = DEFAULT_CRAWL_DEADLINE,
+                       top_k: int = 15, min_score: float = 0.001,
+                       cancel: Optional[threading.Event] = None) -> Iterator[SearchUpdate]:
+    """
+    Two-phase search. First yields the ranking of the existing index
+    (indexed=0), then looks the query up on the web and streams the crawl
+    like stream_search, yielding only rankings that differ from the last one
+    yielded. The web searcher (anything with get_search_results(query,
+    limit, cancel)) and the crawler come from zero-argument factories that
+    are only called after the local update, so building them never delays
+    it. Ends with a done=True update; its results may equal
+    the previous update's. Setting `cancel` abandons the web phase
+    silently.
+    """
+    start = time.time()
+    results, suggestion = ranker.rank_articles(query, top_k=top_k, min_score=min_score)
+    yield SearchUpdate(results, suggestion, 0, False, time.time() - start)
+
+    try:
+        urls = get_web_searcher().get_search_results(query, limit=url_limit, cancel=cancel)
+    except Exception as e:
+        print(f"Web search failed: {e}")
+        urls = []
+    if cancel is not None and cancel.is_set():
+        return
+    if not urls:
+        yield SearchUpdate(results, suggestion, 0, True, time.time() - start)
+        return
+
+    for update in stream_search(query, urls, get_crawler(), indexer, ranker, deadline=deadline,
+                                top_k=top_k, min_score=min_score, shown_ids=result_ids(results), cancel=cancel):
+        yield update._replace(elapsed=time.time() - start)
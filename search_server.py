@@ -0,0 +1,222 @@
+"""
+Headless HTTP search service.
+
+Loads the ArticleIndexer and TFIDFRanker once and serves them over plain
+HTTP, without Tk:
+
+    GET /search?q=<query>&k=<top_k>   ranked results as JSON
+    GET /health                        readiness and index size
+    GET /stats                         request counts and latency percentiles
+
+Requests are handled by a bounded worker pool; connections beyond the
+workers plus the wait queue get an immediate 503 instead of piling up.
+
+    python search_server.py --port 8080 --workers 16
+"""
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse, parse_qs
+
+from indexer import ArticleIndexer
+from tfidf import TFIDFRanker
+
+MAX_TOP_K = 100
+DEFAULT_TOP_K = 15
+
+
+class SearchService:
+    """Index, ranker and request statistics shared by all handler threads"""
+
+    def __init__(self, json_file: str = "articles.json"):
+        self.started_at = time.time()
+        self.indexer = ArticleIndexer(json_file)
+        self.indexer.index_all()
+        self.ranker = TFIDFRanker(self.indexer)
+
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self._latencies_ms: deque = deque(maxlen=1000)
+
+    def search(self, query: str, top_k: int = DEFAULT_TOP_K) -> Dict[str, Any]:
+        start = time.perf_counter()
+        ranked, suggestion = self.ranker.rank_articles(query, top_k=top_k, min_score=0.001)
+        return {
+            "query": query,
+            "suggestion": suggestion,
+            "took_ms": round((time.perf_counter() - start) * 1000, 3),
+            "results": [
+                {
+                    "id": article.unique_id,
+                    "title": article.title,
+                    "url": article.url,
+                    "topic": article.topic,
+                    "score": score,
+                    "snippet": article.content[:200],
+                }
+                for article, score in ranked
+            ],
+        }
+
+    def health(self) -> Dict[str, Any]:
+        snapshot = self.indexer.snapshot()
+        return {
+            "status": "ok",
+            "articles": snapshot.total_articles,
+            "generation": snapshot.generation,
+        }
+
+    def record(self, latency_ms: float, error: bool) -> None:
+        with self._stats_lock:
+            self.requests += 1
+            if error:
+                self.errors += 1
+            self._latencies_ms.append(latency_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            latencies = sorted(self._latencies_ms)
+            requests, errors, rejected, in_flight = self.requests, self.errors, self.rejected, self.in_flight
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "requests": requests,
+            "errors": errors,
+            "rejected": rejected,
+            "in_flight": in_flight,
+            "latency_ms": {"p50": percentile(0.50), "p95": percentile(0.95), "p99": percentile(0.99)},
+            "articles": self.indexer.total_articles,
+            "words": len(self.indexer.all_words_set),
+        }
+
+
+class SearchRequestHandler(BaseHTTPRequestHandler):
+    server_version = "DSASearch/1.0"
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        service: SearchService = self.server.service
+        start = time.perf_counter()
+        error = False
+        try:
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            if url.path == "/search":
+                query = params.get("q", [""])[0].strip()
+                if not query:
+                    error = True
+                    self._send_json(400, {"error": "missing query parameter 'q'"})
+                    return
+                try:
+                    top_k = max(1, min(MAX_TOP_K, int(params.get("k", [DEFAULT_TOP_K])[0])))
+                except ValueError:
+                    error = True
+                    self._send_json(400, {"error": "'k' must be an integer"})
+                    return
+                self._send_json(200, service.search(query, top_k))
+            elif url.path == "/health":
+                self._send_json(200, service.health())
+            elif url.path == "/stats":
+                self._send_json(200, service.stats())
+            else:
+                error = True
+                self._send_json(404, {"error": f"unknown path '{url.path}'"})
+        except Exception as e:
+            error = True
+            self._send_json(500, {"error": str(e)})
+        finally:
+            service.record((time.perf_counter() - start) * 1000, error)
+
+
+class SearchHTTPServer(HTTPServer):
+    """HTTPServer that hands connections to a bounded thread pool"""
+
+    BUSY_RESPONSE = (b"HTTP/1.0 503 Service Unavailable\r\n"
+                     b"Content-Type: application/json\r\nContent-Length: 21\r\n\r\n"
+                     b'{"error": "overload"}')
+
+    def __init__(self, address, service: SearchService, workers: int = 16, max_queue: int = 64, verbose: bool = False):
+        super().__init__(address, SearchRequestHandler)
+        self.service = service
+        self.verbose = verbose
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search-worker")
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+
+    def process_request(self, request, client_address) -> None:
+        if not self._slots.acquire(blocking=False):
+            with self.service._stats_lock:
+                self.service.rejected += 1
+            try:
+                request.sendall(self.BUSY_RESPONSE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        self._executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address) -> None:
+        with self.service._stats_lock:
+            self.service.in_flight += 1
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self.service._stats_lock:
+                self.service.in_flight -= 1
+            self._slots.release()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless DSA search service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=16, help="request worker threads")
+    parser.add_argument("--queue", type=int, default=64, help="connections allowed to wait for a worker")
+    parser.add_argument("--articles", default="articles.json")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    service = SearchService(args.articles)
+    server = SearchHTTPServer((args.host, args.port), service, args.workers, args.queue, args.verbose)
+    print(f"Serving on http://{args.host}:{server.server_address[1]} ({args.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Startup timing for the GUI.
+
+    python main.py --startup-report
+    DSA_STARTUP_REPORT=1 python main.py
+
+StartupProfile records when each startup phase finished (imports, window
+created, widgets built, interactive = first idle turn of the Tk event loop,
+index loaded). With the report enabled it also times every import the
+application makes and prints them the way `python -X importtime` does: self
+and cumulative microseconds per module, nested imports indented. Only the
+modules above a threshold are shown, followed by the slowest top-level
+imports.
+
+Without the report, marking phases costs a perf_counter() call and nothing
+is printed.
+"""
+import importlib.abc
+import os
+import sys
+import threading
+import time
+from typing import List, Tuple, Optional
+
+REPORT_FLAG = "--startup-report"
+REPORT_ENV_VAR = "DSA_STARTUP_REPORT"
+MIN_REPORTED_US = 2000  # modules faster than this are left out of the report
+
+# (depth, module name, self seconds, cumulative seconds), in completion order
+ImportRecord = Tuple[int, str, float, float]
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a module's real loader and times exec_module()"""
+
+    def __init__(self, loader, timer: "ImportTimer"):
+        self._loader = loader
+        self._timer = timer
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        name = module.__name__
+        # Code that inspects __loader__ after import sees the real loader
+        module.__loader__ = self._loader
+        if getattr(module, '__spec__', None) is not None:
+            module.__spec__.loader = self._loader
+        self._timer._enter()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer._exit(name, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        # get_resource_reader, get_source, is_package, ...
+        return getattr(self._loader, name)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path hook that times module execution like `python -X importtime`"""
+
+    def __init__(self):
+        self.records: List[ImportRecord] = []
+        self._local = threading.local()
+
+    def install(self) -> None:
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, 'finding', False):
+            return None
+        # Ask the remaining finders, then wrap whatever loader they picked
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                find = getattr(finder, 'find_spec', None)
+                if finder is self or find is None:
+                    continue
+                spec = find(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+        if spec.loader is None or not hasattr(spec.loader, 'exec_module'):
+            # Namespace packages have nothing to time
+            return spec
+        spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def _stack(self) -> List[float]:
+        # Per thread: the index loader imports concurrently with the Tk thread
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self) -> None:
+        # Time spent in nested imports, subtracted to get self time
+        self._stack().append(0.0)
+
+    def _exit(self, name: str, elapsed: float) -> None:
+        stack = self._stack()
+        nested = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        self.records.append((len(stack), name, elapsed - nested, elapsed))
+
+
+def format_import_report(records: List[ImportRecord], min_us: int = MIN_REPORTED_US, top: int = 10) -> str:
+    """`python -X importtime` style table of the slow imports, then the slowest top-level ones"""
+    lines = ["import time: self [us] | cumulative | imported package"]
+    for depth, name, self_time, cumulative in records:
+        if cumulative * 1e6 >= min_us:
+            lines.append(f"import time: {self_time * 1e6:9.0f} | {cumulative * 1e6:10.0f} | {'  ' * depth}{name}")
+    top_level = sorted((r for r in records if r[0] == 0), key=lambda r: r[3], reverse=True)
+    total = sum(r[3] for r in top_level)
+    lines.append(f"Imports: {total * 1000:.1f} ms in {len(records)} modules; slowest top-level:")
+    for _, name, _, cumulative in top_level[:top]:
+        lines.append(f"  {cumulative * 1000:8.1f} ms  {name}")
+    return "\n".join(lines)
+
+
+class StartupProfile:
+    """Phase timestamps from process start (main.py) to an interactive window"""
+
+    def __init__(self, report: bool = False):
+        self.start = time.perf_counter()
+        self.report = report
+        self.phases: List[Tuple[str, float]] = []
+        self.finished = False
+        self.import_timer: Optional[ImportTimer] = None
+        if report:
+            self.import_timer = ImportTimer()
+            self.import_timer.install()
+
+    @classmethod
+    def from_environment(cls, argv: Optional[List[str]] = None) -> "StartupProfile":
+        """Report enabled by --startup-report or DSA_STARTUP_REPORT=1"""
+        argv = sys.argv if argv is None else argv
+        enabled = REPORT_FLAG in argv or os.environ.get(REPORT_ENV_VAR, "") not in ("", "0")
+        return cls(report=enabled)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def mark(self, phase: str) -> float:
+        """Record that `phase` just finished; returns seconds since start"""
+        at = self.elapsed()
+        self.phases.append((phase, at))
+        if self.report and self.finished:
+            # Phases after the report (e.g. the index loading) get a line of their own
+            print(f"Startup: {phase} at {at * 1000:.1f} ms")
+        return at
+
+    def format_phases(self) -> str:
+        lines = ["Startup phases:       at [ms] |  took [ms]"]
+        previous = 0.0
+        for phase, at in self.phases:
+            lines.append(f"  {phase:<18} {at * 1000:9.1f} | {(at - previous) * 1000:9.1f}")
+            previous = at
+        return "\n".join(lines)
+
+    def finish(self, phase: str = "interactive") -> None:
+        """Mark the last startup phase, stop timing imports and print the report"""
+        if self.finished:
+            return
+        self.mark(phase)
+        self.finished = True
+        if self.import_timer is not None:
+            self.import_timer.uninstall()
+        if self.report:
+            if self.import_timer is not None:
+                print(format_import_report(self.import_timer.records))
+            print(self.format_phases())
@@ -0,0 +1,165 @@
+import asyncio
+import gzip
+import threading
+import time
+import unittest
+from async_crawler import AsyncCrawler, AsyncFetcher
+from crawler3 import SimpleCrawler
+from host_health import HostHealth
+from test_support import FixtureHandler, serve
+
+PAGE = b"<html><head><title>Fixture %d</title><style>p{}</style></head><body><p>firewall  packet filtering</p></body></html>"
+
+
+class KeepAliveHandler(FixtureHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        number = int(query or 0)
+        if path == "/page":
+            self.send_page(PAGE % number)
+        elif path == "/slow":
+            with self.server.lock:
+                self.server.active += 1
+                self.server.peak = max(self.server.peak, self.server.active)
+            time.sleep(self.server.delay)
+            with self.server.lock:
+                self.server.active -= 1
+            self.send_page(PAGE % number)
+        elif path == "/chunked":
+            body = PAGE % number
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(body), 16):
+                chunk = body[start:start + 16]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        elif path == "/gzip":
+            self.send_page(gzip.compress(PAGE % number), Content_Encoding="gzip")
+        elif path == "/pdf":
+            self.send_page(b"%PDF-1.4" + b"\0" * 100000, content_type="application/pdf")
+        elif path == "/huge":
+            self.send_page(b"<html><title>Huge</title><body>" + b"overflow " * 50000 + b"</body></html>")
+        elif path == "/redirect":
+            self.send_page(status=302, Location=f"/page?{number}")
+        elif path == "/flaky":
+            with self.server.lock:
+                self.server.hits += 1
+            self.send_page(b"busy", status=503)
+        else:
+            self.send_page(b"missing", status=404)
+
+
+class TestAsyncCrawler(unittest.TestCase):
+    def setUp(self):
+        self.server, self.base_url = serve(self, KeepAliveHandler, lock=threading.Lock(), connections=0,
+                                           active=0, peak=0, delay=0.05, hits=0)
+
+    def test_matches_simple_crawler_extraction(self):
+        urls = [f"{self.base_url}/{kind}?{i}" for i, kind in enumerate(["page", "chunked", "gzip", "redirect"])]
+        articles = AsyncCrawler(per_host=2).crawl_urls(urls)
+        self.assertEqual([a["url"] for a in articles], urls)
+        for i, article in enumerate(articles):
+            self.assertEqual((article["title"], article["content"]),
+                             SimpleCrawler().extract_page_info(PAGE % i))
+
+    def test_http_errors_are_skipped(self):
+        articles = AsyncCrawler().crawl_urls([f"{self.base_url}/missing", "http://127.0.0.1:9/refused"])
+        self.assertEqual(articles, [])
+
+    def test_connections_are_pooled_and_per_host_limit_holds(self):
+        crawler = AsyncCrawler(max_concurrency=100, per_host=3)
+        urls = [f"{self.base_url}/slow?{i}" for i in range(30)]
+        articles = crawler.crawl_urls(urls)
+        self.assertEqual(len(articles), 30)
+        self.assertLessEqual(self.server.peak, 3)
+        self.assertGreater(self.server.peak, 1)
+        # Keep-alive: 30 requests over at most one connection per host slot
+        self.assertLessEqual(self.server.connections, 3)
+
+    def test_queued_requests_wait_for_the_host_without_timing_out(self):
+        # 20 pages of 0.5s at 2 per host take 5s: far beyond the 2s timeout,
+        # which must only count once a request holds its slots
+        self.server.delay = 0.5
+        crawler = SimpleCrawler(max_in_flight=200, per_host=2)
+        crawler.timeout = 2
+        urls = [f"{self.base_url}/slow?{i}" for i in range(20)]
+        articles = crawler.crawl_urls(urls)
+        self.assertEqual(sorted(a["url"] for a in articles), sorted(urls))
+        self.assertEqual(self.server.peak, 2)
+
+    def test_high_global_limit_runs_hosts_in_parallel(self):
+        self.server.delay = 0.2
+        # A second name for the same server counts as another host
+        other_host = self.base_url.replace("127.0.0.1", "localhost")
+        urls = [f"{base}/slow?{i}" for base in (self.base_url, other_host) for i in range(40)]
+        crawler = SimpleCrawler(max_in_flight=200, per_host=40)
+        start = time.monotonic()
+        articles = list(crawler.iter_crawl(urls))
+        elapsed = time.monotonic() - start
+        self.assertEqual(len(articles), 80)
+        self.assertGreater(self.server.peak, 40)
+        # 80 pages of 0.2s; the old 5 fetch threads needed 3.2s
+        self.assertLess(elapsed, 1.5)
+
+    def test_host_health_applies_to_async_fetches(self):
+        crawler = SimpleCrawler()
+        crawler.host_health = HostHealth(failure_threshold=2, cooldown=60, max_retries=1, backoff_base=0.01)
+        self.assertEqual(crawler.crawl_urls([f"{self.base_url}/flaky?{i}" for i in range(2)]), [])
+        hits = self.server.hits
+        # Two attempts for the first URL open the circuit; later URLs are skipped
+        self.assertLessEqual(hits, 3)
+        self.assertEqual(crawler.crawl_urls([f"{self.base_url}/page?{i}" for i in range(3)]), [])
+        self.assertEqual(self.server.hits, hits)
+        self.assertGreater(crawler.host_health.metrics()["skipped_open_circuit"], 0)
+
+    def test_deadline_drops_slow_pages(self):
+        self.server.delay = 1.0
+        crawler = SimpleCrawler()
+        urls = [f"{self.base_url}/page?1", f"{self.base_url}/slow?2"]
+        start = time.monotonic()
+        articles = list(crawler.iter_crawl(urls, deadline=0.5))
+        self.assertLess(time.monotonic() - start, 0.9)
+        self.assertEqual([a["url"] for a in articles], urls[:1])
+
+    def test_body_budget_and_content_type_filter(self):
+        async def fetch_all():
+            fetcher = AsyncFetcher(max_body_bytes=4096, content_type_filter=SimpleCrawler.is_html_content_type)
+            try:
+                return await asyncio.gather(*(fetcher.fetch(f"{self.base_url}/{path}") for path in ("huge", "pdf", "gzip")))
+            finally:
+                fetcher.close()
+
+        huge, pdf, compressed = asyncio.run(fetch_all())
+        self.assertEqual((huge.status, len(huge.body)), (200, 4096))
+        self.assertEqual((pdf.status, pdf.body), (200, b''))
+        self.assertIn("application/pdf", pdf.error)
+        self.assertEqual(compressed.body, PAGE % 0)
+
+        crawler = SimpleCrawler(max_page_bytes=4096)
+        articles = AsyncCrawler(crawler).crawl_urls([f"{self.base_url}/huge", f"{self.base_url}/pdf"])
+        self.assertEqual([a["title"] for a in articles], ["Huge"])
+        self.assertLess(len(articles[0]["content"]), 4096)
+
+    def test_fetcher_reports_reuse(self):
+        async def fetch_all():
+            fetcher = AsyncFetcher(per_host=1)
+            try:
+                return [await fetcher.fetch(f"{self.base_url}/page?{i}") for i in range(5)], fetcher
+            finally:
+                fetcher.close()
+
+        results, fetcher = asyncio.run(fetch_all())
+        self.assertEqual([r.status for r in results], [200] * 5)
+        self.assertEqual((fetcher.pool.opened, fetcher.pool.reused, fetcher.requests), (1, 4, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
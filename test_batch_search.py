@@ -0,0 +1,26 @@
+import io
+import json
+import unittest
+from batch_search import run_batch, read_queries
+
+
+class TestBatchSearch(unittest.TestCase):
+    def test_parallel_output_matches_serial_and_keeps_order(self):
+        queries = "What is phishing?\n\nsql injecton\nfirewall\nencryption keys\n"
+        serial, parallel = io.StringIO(), io.StringIO()
+        self.assertEqual(run_batch(read_queries(io.StringIO(queries)), serial, workers=1, top_k=5), 4)
+        self.assertEqual(run_batch(read_queries(io.StringIO(queries)), parallel, workers=2, top_k=5), 4)
+
+        serial_records = [json.loads(line) for line in serial.getvalue().splitlines()]
+        parallel_records = [json.loads(line) for line in parallel.getvalue().splitlines()]
+        self.assertEqual([r["query"] for r in parallel_records],
+                         ["What is phishing?", "sql injecton", "firewall", "encryption keys"])
+        for s, p in zip(serial_records, parallel_records):
+            self.assertEqual(s["results"], p["results"])
+            self.assertEqual(s["suggestion"], p["suggestion"])
+            self.assertIn("latency_ms", p)
+        self.assertEqual(parallel_records[1]["suggestion"], "sql injection")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+import unittest
+from crawl_checkpoint import CrawlCheckpoint, compact, read_records
+from crawler3 import SimpleCrawler
+from indexer import ArticleIndexer
+from test_support import FixtureHandler, make_article, serve
+
+
+class CountingHandler(FixtureHandler):
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        body = f"<html><title>Page {self.path}</title><body>encryption keys</body></html>".encode()
+        # .pdf paths fail the crawler's content-type check
+        self.send_page(body, content_type="application/pdf" if self.path.endswith(".pdf") else "text/html")
+
+
+class TestCrawlCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "crawl.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_resume_discards_torn_line(self):
+        with CrawlCheckpoint(self.path) as checkpoint:
+            checkpoint.append("1. Firewall", ["q"], make_article("article_1_001", "A", "x", "https://a.test/1"))
+            checkpoint.append("1. Firewall", ["q"], make_article("article_1_002", "B", "y", "https://a.test/2"))
+        # Simulate a crash in the middle of writing a third record
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"topic": "1. Firewall", "article": {"url": "https://a.te')
+
+        with CrawlCheckpoint(self.path) as checkpoint:
+            self.assertEqual(len(checkpoint), 2)
+            self.assertTrue(checkpoint.is_completed("HTTPS://a.test/1#top"))
+            self.assertFalse(checkpoint.is_completed("https://a.test/3"))
+            checkpoint.append("1. Firewall", ["q"], make_article("article_1_003", "C", "z", "https://a.test/3"))
+        self.assertEqual([r["article"]["unique_id"] for r in read_records(self.path)],
+                         ["article_1_001", "article_1_002", "article_1_003"])
+
+    def test_corrupt_line_in_the_middle_keeps_later_records(self):
+        with CrawlCheckpoint(self.path) as checkpoint:
+            checkpoint.append("1. Firewall", ["q"], make_article("article_1_001", "A", "x", "https://a.test/1"))
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"topic": garbage\n')
+        with CrawlCheckpoint(self.path) as checkpoint:
+            checkpoint.append("1. Firewall", ["q"], make_article("article_1_002", "B", "y", "https://a.test/2"))
+
+        with CrawlCheckpoint(self.path) as checkpoint:
+            self.assertTrue(checkpoint.is_completed("https://a.test/1"))
+            self.assertTrue(checkpoint.is_completed("https://a.test/2"))
+        self.assertEqual([r["article"]["unique_id"] for r in read_records(self.path)],
+                         ["article_1_001", "article_1_002"])
+
+    def test_compact_produces_indexer_input(self):
+        with CrawlCheckpoint(self.path) as checkpoint:
+            checkpoint.append("2. Phishing", ["p"], make_article("article_2_002", "Two", "phishing mail"))
+            checkpoint.append("1. Firewall", ["f"], make_article("article_1_001", "One", "packet filter"))
+            checkpoint.append("2. Phishing", ["p"], make_article("article_2_001", "Three", "spear phishing"))
+            checkpoint.append("2. Phishing", ["p"], make_article("article_2_002", "Two v2", "phishing mail again"))
+        output = os.path.join(self.tmpdir.name, "articles.json")
+        self.assertEqual(compact(self.path, output), 3)
+
+        with open(output, encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertEqual([t["topic"] for t in data], ["2. Phishing", "1. Firewall"])
+        self.assertEqual([a["unique_id"] for a in data[0]["articles"]], ["article_2_001", "article_2_002"])
+        articles = ArticleIndexer.read_articles(output)
+        self.assertEqual([a.title for a in articles], ["Three", "Two v2", "One"])
+
+    def test_failed_fetches_are_not_completed(self):
+        server, base = serve(self, CountingHandler, paths=[])
+        crawler = SimpleCrawler()
+        crawler.politeness_delay = 0
+        with CrawlCheckpoint(self.path) as checkpoint:
+            crawler.crawl_topic("3. Malware", ["m"], [f"{base}/ok", f"{base}/report.pdf"], checkpoint=checkpoint)
+            self.assertTrue(checkpoint.is_completed(f"{base}/ok"))
+            self.assertFalse(checkpoint.is_completed(f"{base}/report.pdf"))
+            self.assertFalse(crawler.is_seen(f"{base}/report.pdf"))
+            # Retried in the same session, the fetched page is not
+            crawler.crawl_topic("3. Malware", ["m"], [f"{base}/ok", f"{base}/report.pdf"])
+        self.assertEqual(sorted(server.paths), ["/ok", "/report.pdf", "/report.pdf"])
+        self.assertEqual([r["article"]["url"] for r in read_records(self.path)], [f"{base}/ok"])
+
+    def test_crawl_topic_resumes_from_checkpoint(self):
+        server, base = serve(self, CountingHandler, paths=[])
+        urls = [f"{base}/{i}" for i in range(4)]
+        crawler = SimpleCrawler()
+        crawler.politeness_delay = 0
+        with CrawlCheckpoint(self.path) as checkpoint:
+            crawler.crawl_topic("3. Malware", ["m"], urls[:2], checkpoint=checkpoint)
+
+        # A fresh process: new crawler, same checkpoint file
+        crawler = SimpleCrawler()
+        crawler.politeness_delay = 0
+        with CrawlCheckpoint(self.path) as checkpoint:
+            topic = crawler.crawl_topic("3. Malware", ["m"], urls, checkpoint=checkpoint)
+
+        self.assertEqual(sorted(server.paths), ["/0", "/1", "/2", "/3"])
+        self.assertEqual([a["unique_id"] for a in topic["articles"]], ["article_3_003", "article_3_004"])
+        output = os.path.join(self.tmpdir.name, "articles.json")
+        self.assertEqual(compact(self.path, output), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
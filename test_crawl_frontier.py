@@ -0,0 +1,83 @@
+import time
+import unittest
+from crawl_frontier import CrawlFrontier
+from crawler3 import SimpleCrawler
+from test_support import FixtureHandler, serve
+
+
+class TestCrawlFrontier(unittest.TestCase):
+    def test_priority_order_and_dedup(self):
+        frontier = CrawlFrontier(politeness_delay=0)
+        self.assertTrue(frontier.add("http://a.test/low", priority=5))
+        self.assertTrue(frontier.add("http://a.test/high", priority=1))
+        self.assertFalse(frontier.add("HTTP://A.test/high#section"))
+        order = []
+        while True:
+            url = frontier.next_url(timeout=1)
+            if url is None:
+                break
+            order.append(url)
+            frontier.done(url)
+        self.assertEqual(order, ["http://a.test/high", "http://a.test/low"])
+
+    def test_one_fetch_per_host_with_delay(self):
+        frontier = CrawlFrontier(politeness_delay=0.2)
+        for url in ["http://a.test/1", "http://a.test/2", "http://b.test/1"]:
+            frontier.add(url)
+        first, second = frontier.next_url(), frontier.next_url()
+        # Both hosts are handed out at once; the second a.test URL must wait
+        self.assertEqual({CrawlFrontier.host_of(first), CrawlFrontier.host_of(second)}, {"a.test", "b.test"})
+        self.assertIsNone(frontier.next_url(timeout=0.05))
+        done_at = time.monotonic()
+        frontier.done(first if "a.test" in first else second)
+        self.assertEqual(frontier.next_url(timeout=1), "http://a.test/2")
+        self.assertGreaterEqual(time.monotonic() - done_at, 0.19)
+
+    def test_exhausted_frontier_returns_none(self):
+        frontier = CrawlFrontier()
+        self.assertIsNone(frontier.next_url())
+        frontier.add("http://a.test/")
+        url = frontier.next_url()
+        frontier.close()
+        self.assertIsNone(frontier.next_url())
+        frontier.done(url)
+
+
+class SlowHandler(FixtureHandler):
+    def do_GET(self):
+        self.server.requests.append(time.monotonic())
+        time.sleep(0.05)
+        self.send_page(f"<html><title>{self.path}</title><body>firewall rules</body></html>".encode())
+
+
+class TestParallelTopicCrawl(unittest.TestCase):
+    HOSTS = ["127.0.0.2", "127.0.0.3", "127.0.0.4", "127.0.0.5"]
+
+    def setUp(self):
+        self.servers = [serve(self, SlowHandler, host, requests=[])[0] for host in self.HOSTS]
+
+    def test_hosts_in_parallel_each_rate_limited(self):
+        crawler = SimpleCrawler()
+        crawler.politeness_delay = 0.3
+        urls = [f"http://{s.server_address[0]}:{s.server_address[1]}/page{i}"
+                for i in range(3) for s in self.servers]
+        start = time.monotonic()
+        topic = crawler.crawl_topic("9. Test", ["q"], urls + urls[:2])
+        elapsed = time.monotonic() - start
+
+        # Sequential would be 12 * (0.05 + 0.3) s; parallel is one host's 3 fetches and 2 delays
+        self.assertLess(elapsed, 2.0)
+        self.assertEqual([a["url"] for a in topic["articles"]], urls)
+        self.assertEqual(topic["articles"][0]["unique_id"], "article_9_001")
+        for server in self.servers:
+            gaps = [b - a for a, b in zip(server.requests, server.requests[1:])]
+            self.assertEqual(len(server.requests), 3)
+            self.assertTrue(all(gap >= 0.3 for gap in gaps), gaps)
+
+        # Already crawled URLs are skipped by later crawls
+        self.assertEqual(crawler.crawl_topic("9. Test", ["q"], urls[:1])["articles"], [])
+        self.assertEqual(crawler.crawl_urls(urls[:1]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import glob
+import os
+import unittest
+from crawler3 import (SimpleCrawler, SoupExtractor, StreamingExtractor, MainContentExtractor, HTMLExtractor,
+                      available_extractors, get_extractor)
+from benchmark_extractors import load_pages, token_reduction, DEFAULT_FIXTURES
+from test_support import FixtureHandler, start_server, stop_server
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "html", "*.html")))
+
+HUGE_PAGE = b"<html><head><title>Huge page</title></head><body><p>" + b"botnet " * 200000 + b"</p></body></html>"
+
+
+class PageHandler(FixtureHandler):
+    def do_GET(self):
+        if self.path == "/report.pdf":
+            self.send_page(b"%PDF-1.4" + b"\0" * 200000, content_type="application/pdf")
+        else:
+            self.send_page(HUGE_PAGE, content_type="text/html; charset=utf-8")
+
+
+class TestStreamingDownload(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server, cls.base_url = start_server(PageHandler)
+
+    @classmethod
+    def tearDownClass(cls):
+        stop_server(cls.server)
+
+    def test_content_type_check(self):
+        self.assertTrue(SimpleCrawler.is_html_content_type("text/html; charset=utf-8"))
+        self.assertTrue(SimpleCrawler.is_html_content_type("application/xhtml+xml"))
+        self.assertTrue(SimpleCrawler.is_html_content_type(""))
+        self.assertFalse(SimpleCrawler.is_html_content_type("application/pdf"))
+
+    def test_download_stops_at_byte_budget(self):
+        title, content = SimpleCrawler(max_page_bytes=10000).get_page_info(self.base_url + "/big.html")
+        self.assertEqual(title, "Huge page")
+        self.assertLess(len(content), 10000)
+        self.assertTrue(content.startswith("botnet botnet"))
+
+    def test_crawl_with_extraction_processes(self):
+        crawler = SimpleCrawler(max_page_bytes=10000, extraction_workers=1)
+        try:
+            articles = crawler.crawl_urls([self.base_url + "/a.html", self.base_url + "/b.html"])
+        finally:
+            crawler.close()
+        self.assertEqual(sorted(a["url"] for a in articles), [self.base_url + "/a.html", self.base_url + "/b.html"])
+        self.assertEqual({a["title"] for a in articles}, {"Huge page"})
+        self.assertEqual(set(articles[0]), {"url", "title", "content", "timestamp"})
+
+    def test_non_html_is_rejected_before_download(self):
+        title, content = SimpleCrawler().get_page_info(self.base_url + "/report.pdf")
+        self.assertEqual(title, "Error fetching page")
+        self.assertIn("application/pdf", content)
+        self.assertEqual(SimpleCrawler().crawl_urls([self.base_url + "/report.pdf"]), [])
+
+
+class TestExtractors(unittest.TestCase):
+    def test_streaming_matches_reference_on_fixtures(self):
+        self.assertTrue(FIXTURES)
+        for path in FIXTURES:
+            with open(path, "rb") as f:
+                html = f.read()
+            with self.subTest(fixture=os.path.basename(path)):
+                self.assertEqual(StreamingExtractor().extract(html), SoupExtractor().extract(html))
+                # Already-decoded markup skips encoding detection
+                text = html.decode("latin-1")
+                self.assertEqual(StreamingExtractor().extract(text), SoupExtractor().extract(text))
+
+    def test_skips_scripts_styles_and_comments(self):
+        html = ("<html><head><title> Botnets </title><style>p{color:red}</style></head>"
+                "<body><p>zombie  devices</p><script>var s = '<p>hidden</p>';</script><!-- note --></body></html>")
+        self.assertEqual(StreamingExtractor().extract(html), ("Botnets", "Botnets zombie devices"))
+        self.assertEqual(StreamingExtractor().extract(""), ("No title found", ""))
+
+    def test_extractor_selection(self):
+        self.assertIn("soup", available_extractors())
+        self.assertIsInstance(SimpleCrawler().extractor, MainContentExtractor)
+        self.assertIsInstance(SimpleCrawler(extractor="soup").extractor, SoupExtractor)
+        custom = StreamingExtractor()
+        self.assertIs(get_extractor(custom), custom)
+        with self.assertRaises(NotImplementedError):
+            HTMLExtractor().extract("<p>x</p>")
+
+    def test_process_pool_extraction_matches_in_thread(self):
+        crawler = SimpleCrawler(extraction_workers=2)
+        self.assertIsNone(crawler._extraction_pool)
+        try:
+            for path in FIXTURES:
+                with open(path, "rb") as f:
+                    html = f.read()
+                self.assertEqual(crawler.extract_page_info(html), MainContentExtractor().extract(html))
+            self.assertIsNotNone(crawler._extraction_pool)
+        finally:
+            crawler.close()
+        self.assertIsNone(crawler._extraction_pool)
+        self.assertIsNone(SimpleCrawler()._extraction_executor())
+
+    def test_main_content_drops_navigation_and_footer(self):
+        html = ("<html><head><title>Ransomware</title></head><body>"
+                "<nav><a href='/'>Home</a> <a href='/blog'>Blog</a> <a href='/about'>About us</a></nav>"
+                "<header><div class='menu'>Products Solutions Pricing Support Login</div></header>"
+                "<main><h1>What is ransomware</h1>"
+                "<p>Ransomware is malware that encrypts the files of its victim and demands a payment "
+                "before the attacker hands over the key that decrypts them again.</p>"
+                "<ul><li>Back up files offline</li><li>Patch exposed services</li><li>Phishing</li></ul>"
+                "<p>Most infections start with a phishing email or an exposed remote desktop service "
+                "that was never patched by its administrators.</p></main>"
+                "<div class='sidebar'><p>Subscribe to our newsletter for weekly security news and offers</p></div>"
+                "<footer>Copyright 2024 Example Inc. Privacy Terms Cookies</footer></body></html>")
+        title, content = MainContentExtractor().extract(html)
+        self.assertEqual(title, "Ransomware")
+        self.assertTrue(content.startswith("What is ransomware Ransomware is malware"))
+        for kept in ("Back up files offline", "Phishing", "never patched by its administrators"):
+            self.assertIn(kept, content)
+        for dropped in ("Home", "Pricing", "newsletter", "Copyright"):
+            self.assertNotIn(dropped, content)
+
+    def test_main_content_falls_back_on_pages_without_article_text(self):
+        html = "<html><head><title>Login</title></head><body><a href='/in'>Sign in</a> here</body></html>"
+        self.assertEqual(MainContentExtractor().extract(html), StreamingExtractor().extract(html))
+        self.assertEqual(MainContentExtractor().extract(""), ("No title found", ""))
+
+    def test_main_content_reduces_indexed_tokens_on_fixtures(self):
+        report = token_reduction(load_pages([DEFAULT_FIXTURES]))
+        self.assertEqual(len(report["pages"]), len(FIXTURES))
+        for page_name, baseline, reduced in report["pages"]:
+            with self.subTest(fixture=page_name):
+                self.assertLessEqual(reduced, baseline)
+                self.assertGreater(reduced, baseline // 2)
+        self.assertGreater(report["reduction"], 0.05)
+
+    def test_lxml_backend_when_installed(self):
+        if "lxml" not in available_extractors():
+            self.skipTest("lxml is not installed")
+        with open(FIXTURES[0], "rb") as f:
+            html = f.read()
+        title, content = get_extractor("lxml").extract(html)
+        self.assertEqual(title, SoupExtractor().extract(html)[0])
+        self.assertIn("botnet", content)
+
+
+if __name__ == "__main__":
+    unittest.main()
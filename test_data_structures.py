@@ -0,0 +1,132 @@
+import unittest
+from collections import namedtuple
+from data_structures import BinarySearchTree, MinHashLSH, SimHashIndex, BloomFilter, Trie
+
+Record = namedtuple('Record', ['unique_id'])
+
+
+class TestBinarySearchTree(unittest.TestCase):
+    def test_sequential_inserts_stay_balanced(self):
+        tree = BinarySearchTree()
+        ids = [f"article_{t}_{i:03d}" for t in range(1, 11) for i in range(1, 501)]
+        for unique_id in ids:
+            tree.insert(Record(unique_id))
+        self.assertEqual(tree.size(), 5000)
+        self.assertLessEqual(tree.height(), 18)  # 1.44 * log2(5000)
+        self.assertEqual([r.unique_id for r in tree.inorder_traversal()], sorted(ids))
+        self.assertEqual(tree.search(Record("article_7_250")).data.unique_id, "article_7_250")
+        self.assertIsNone(tree.search(Record("article_11_001")))
+
+    def test_prefix_and_range_scans(self):
+        tree = BinarySearchTree()
+        for unique_id in ["article_2_001", "article_1_002", "web_abc", "article_1_001", "article_10_001"]:
+            tree.insert(Record(unique_id))
+        self.assertEqual([r.unique_id for r in tree.prefix_scan("article_1_")],
+                         ["article_1_001", "article_1_002"])
+        self.assertEqual([r.unique_id for r in tree.range_scan("article_10", "article_2")],
+                         ["article_10_001", "article_1_001", "article_1_002"])
+        self.assertEqual(tree.prefix_scan("missing_"), [])
+
+    def test_plain_values(self):
+        tree = BinarySearchTree()
+        for value in [5, 3, 8, 1, 4]:
+            tree.insert(value)
+        self.assertEqual(tree.inorder_traversal(), [1, 3, 4, 5, 8])
+        self.assertEqual(tree.preorder_traversal()[0], tree.root.data)
+        self.assertIsNotNone(tree.search(4))
+
+
+class TestMinHashLSH(unittest.TestCase):
+    def test_identical_documents_are_candidates(self):
+        lsh = MinHashLSH()
+        tokens = ["firewall", "network", "traffic", "packet", "filter", "rules"]
+        lsh.insert("a", tokens)
+        lsh.insert("b", list(reversed(tokens)))
+        lsh.insert("c", ["encryption", "cipher", "key", "plaintext"])
+        self.assertIn("b", lsh.candidates("a"))
+        self.assertNotIn("c", lsh.candidates("a"))
+        self.assertEqual(lsh.similarity("a", "b"), 1.0)
+
+    def test_similarity_estimate(self):
+        lsh = MinHashLSH(num_perm=256, bands=64)
+        base = [f"word{i}" for i in range(400)]
+        lsh.insert("a", base)
+        lsh.insert("b", base[:300] + [f"other{i}" for i in range(100)])
+        # True Jaccard is 300 / 500 = 0.6
+        self.assertAlmostEqual(lsh.similarity("a", "b"), 0.6, delta=0.12)
+        self.assertEqual(lsh.query("a", limit=1)[0][0], "b")
+
+    def test_empty_document_has_no_neighbours(self):
+        lsh = MinHashLSH()
+        lsh.insert("a", [])
+        lsh.insert("b", [])
+        self.assertEqual(lsh.candidates("a"), set())
+
+    def test_invalid_banding(self):
+        with self.assertRaises(ValueError):
+            MinHashLSH(num_perm=100, bands=30)
+
+
+class TestSimHashIndex(unittest.TestCase):
+    def fingerprint(self, text):
+        return SimHashIndex.fingerprint(SimHashIndex.shingles(text.split()))
+
+    def test_near_duplicates_are_found(self):
+        text = " ".join(f"token{i}" for i in range(300))
+        index = SimHashIndex(max_distance=3)
+        index.add("original", self.fingerprint(text))
+        self.assertEqual(index.find_near_duplicate(self.fingerprint(text)), "original")
+        mirrored = text + " footer"
+        self.assertLessEqual(
+            SimHashIndex.hamming_distance(self.fingerprint(text), self.fingerprint(mirrored)), 3)
+        self.assertEqual(index.find_near_duplicate(self.fingerprint(mirrored)), "original")
+
+    def test_different_documents_are_not_duplicates(self):
+        index = SimHashIndex(max_distance=3)
+        index.add("a", self.fingerprint(" ".join(f"alpha{i}" for i in range(200))))
+        self.assertIsNone(index.find_near_duplicate(self.fingerprint(" ".join(f"beta{i}" for i in range(200)))))
+
+    def test_exact_matching_with_zero_distance(self):
+        index = SimHashIndex(max_distance=0)
+        index.add("a", 0b1011)
+        self.assertEqual(index.find_near_duplicate(0b1011), "a")
+        self.assertIsNone(index.find_near_duplicate(0b1010))
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        urls = [f"https://example.com/page/{i}" for i in range(1000)]
+        for url in urls:
+            self.assertTrue(bloom.add(url))
+        self.assertTrue(all(url in bloom for url in urls))
+        self.assertFalse(bloom.add(urls[0]))
+        self.assertEqual(len(bloom), 1000)
+
+    def test_false_positive_rate_near_target(self):
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for i in range(2000):
+            bloom.add(f"seen-{i}")
+        false_positives = sum(f"unseen-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.03)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            BloomFilter(capacity=0)
+        with self.assertRaises(ValueError):
+            BloomFilter(error_rate=1.5)
+
+
+class TestTrie(unittest.TestCase):
+    def test_words_with_prefix_shortest_first(self):
+        trie = Trie()
+        for word in ("firewalls", "fire", "firewall", "firmware", "phishing"):
+            trie.insert(word)
+        self.assertEqual(trie.words_with_prefix("fir"), ["fire", "firewall", "firmware", "firewalls"])
+        self.assertEqual(trie.words_with_prefix("FIRE", limit=2), ["fire", "firewall"])
+        self.assertEqual(trie.words_with_prefix("xyz"), [])
+        self.assertEqual(len(trie.words_with_prefix("")), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from distributed_search import ShardedSearchCoordinator
+from indexer import ArticleIndexer
+from tfidf import TFIDFRanker
+
+QUERIES = [
+    "What is a DDoS attack?",
+    "How can I protect myself from phishing emails?",
+    "sql injecton",
+    "firewall network traffic",
+    "encryptoin keys",
+    "the",
+]
+
+
+class TestShardedSearch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.indexer = ArticleIndexer("articles.json")
+        cls.indexer.index_all()
+        cls.ranker = TFIDFRanker(cls.indexer)
+        cls.coordinator = ShardedSearchCoordinator.from_json("articles.json", num_shards=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.coordinator.close()
+
+    def assertSameRanking(self, query):
+        expected, expected_suggestion = self.ranker.rank_articles(query, top_k=15)
+        actual, suggestion = self.coordinator.rank_articles(query, top_k=15)
+        self.assertEqual(suggestion, expected_suggestion)
+        self.assertEqual([a.unique_id for a, _ in actual], [a.unique_id for a, _ in expected])
+        for (_, score), (_, expected_score) in zip(actual, expected):
+            self.assertAlmostEqual(score, expected_score, places=12)
+
+    def test_matches_single_node_ranking(self):
+        for query in QUERIES:
+            with self.subTest(query=query):
+                self.assertSameRanking(query)
+
+    def test_corpus_is_split_across_shards(self):
+        stats = self.coordinator.stats()
+        self.assertEqual(len(stats), 3)
+        self.assertEqual(sum(s["articles"] for s in stats), self.indexer.total_articles)
+        self.assertTrue(all(s["articles"] > 0 for s in stats))
+
+    def test_add_articles_matches_single_node(self):
+        new_articles = [{
+            "url": "https://example.com/ransomware",
+            "title": "Ransomware attacks on hospitals",
+            "content": "Ransomware encrypts hospital records and demands a ransom payment in bitcoin",
+        }]
+        self.assertEqual(self.coordinator.add_articles(new_articles), self.indexer.add_articles(new_articles))
+        self.assertSameRanking("ransomware hospital")
+        self.assertSameRanking("encryption")
+
+
+if __name__ == '__main__':
+    unittest.main()
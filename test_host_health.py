@@ -0,0 +1,96 @@
+import time
+import unittest
+from crawler3 import SimpleCrawler
+from host_health import HostHealth
+from test_support import FixtureHandler, serve
+
+
+class FlakyHandler(FixtureHandler):
+    def do_GET(self):
+        self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+        if self.path.startswith("/loop"):
+            self.send_page(status=302, content_type=None, Location=self.path)
+            return
+        if self.path.startswith("/hang"):
+            time.sleep(1.0)
+        if self.path.startswith("/flaky") and self.server.hits[self.path] <= 2:
+            self.send_page(status=503, content_type=None)
+            return
+        if self.path.startswith("/down") and self.server.down:
+            self.send_page(status=502, content_type=None)
+            return
+        self.send_page(b"<html><title>Recovered</title><body>intrusion detection</body></html>")
+
+
+class TestHostHealth(unittest.TestCase):
+    def setUp(self):
+        self.server, self.base_url = serve(self, FlakyHandler, hits={}, down=True)
+        self.crawler = SimpleCrawler()
+        self.crawler.host_health = HostHealth(failure_threshold=3, cooldown=60, max_retries=2, backoff_base=0.01)
+
+    def test_transient_errors_are_retried(self):
+        self.assertEqual(self.crawler.get_page_info(self.base_url + "/flaky")[0], "Recovered")
+        metrics = self.crawler.host_health.metrics()
+        self.assertEqual((metrics["retries"], metrics["recovered_by_retry"], metrics["failures"]), (2, 1, 2))
+        self.assertEqual(metrics["open_hosts"], [])
+
+    def test_circuit_opens_for_timing_out_host(self):
+        self.crawler.timeout = 0.2
+        urls = [f"{self.base_url}/hang/{i}" for i in range(8)]
+        start = time.monotonic()
+        results = [self.crawler.get_page_info(url) for url in urls]
+        elapsed = time.monotonic() - start
+
+        self.assertTrue(all(title == "Error fetching page" for title, _ in results))
+        # Timeouts are not retried; after three the remaining five are skipped
+        self.assertEqual(sum(self.server.hits.values()), 3)
+        self.assertLess(elapsed, 8 * 0.2)
+        metrics = self.crawler.host_health.metrics()
+        self.assertEqual((metrics["skipped_open_circuit"], metrics["circuits_opened"]), (5, 1))
+        self.assertEqual(metrics["open_hosts"], ["127.0.0.1"])
+        self.assertGreater(metrics["time_saved_s"], 5 * 0.15)
+
+    def test_half_open_probe_closes_circuit(self):
+        self.crawler.host_health.cooldown = 0.2
+        # Three 502s in one fetch (first try + two retries) open the circuit
+        self.assertEqual(self.crawler.get_page_info(self.base_url + "/down/1")[0], "Error fetching page")
+        self.assertTrue(self.crawler.host_health.is_open("127.0.0.1"))
+        self.assertIn("cool-down", self.crawler.get_page_info(self.base_url + "/down/2")[1])
+
+        self.server.down = False
+        time.sleep(0.25)
+        self.assertEqual(self.crawler.get_page_info(self.base_url + "/down/3")[0], "Recovered")
+        self.assertFalse(self.crawler.host_health.is_open("127.0.0.1"))
+
+    def test_failed_probe_of_any_kind_reopens_circuit(self):
+        health = self.crawler.host_health
+        health.cooldown = 0.2
+        self.crawler.get_page_info(self.base_url + "/down/1")
+        time.sleep(0.25)
+        # The half-open probe dies on a redirect loop, not a timeout or HTTP error
+        self.assertIn("redirects", self.crawler.get_page_info(self.base_url + "/loop")[1])
+        self.assertTrue(health.is_open("127.0.0.1"))
+        self.assertEqual(health.metrics()["circuits_opened"], 2)
+
+        self.server.down = False
+        time.sleep(0.25)
+        self.assertEqual(self.crawler.get_page_info(self.base_url + "/down/2")[0], "Recovered")
+        self.assertFalse(health.is_open("127.0.0.1"))
+
+    def test_refused_connections_are_retried_then_fail(self):
+        title, content = self.crawler.get_page_info("http://127.0.0.1:9/closed")
+        self.assertEqual(title, "Error fetching page")
+        metrics = self.crawler.host_health.metrics()
+        self.assertEqual((metrics["failures"], metrics["retries"]), (3, 2))
+
+    def test_backoff_growth_and_retry_after(self):
+        health = HostHealth(backoff_base=1.0, backoff_max=4.0)
+        self.assertTrue(0.5 <= health.backoff(0) <= 1.0)
+        self.assertTrue(2.0 <= health.backoff(2) <= 4.0)
+        self.assertTrue(2.0 <= health.backoff(10) <= 4.0)
+        self.assertEqual(health.backoff(0, retry_after="3"), 3.0)
+        self.assertEqual(health.backoff(0, retry_after="120"), 4.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import unittest
+from indexer import ArticleIndexer
+from tfidf import TFIDFRanker
+from test_support import make_article
+
+
+def letters(number):
+    """Spell a number with letters so the tokenizer keeps it as one word"""
+    word = ""
+    while True:
+        number, digit = divmod(number, 26)
+        word += chr(ord("a") + digit)
+        if not number:
+            return "term" + word
+
+
+SAMPLE_TOPICS = [
+    {
+        "topic": "1. Firewall",
+        "queries": ["What is a firewall?"],
+        "articles": [
+            make_article("article_1_001", "What is a firewall",
+                         "A firewall filters network traffic using packet rules and stateful inspection"),
+            make_article("article_1_002", "Firewall types",
+                         "Stateful inspection firewall filters packet traffic with network rules and proxies"),
+        ],
+    },
+    {
+        "topic": "2. Encryption",
+        "queries": ["What is encryption?"],
+        "articles": [
+            make_article("article_2_001", "What is encryption",
+                         "Encryption turns plaintext into ciphertext using a secret key and cipher algorithms"),
+        ],
+    },
+]
+
+
+class IndexerTestCase(unittest.TestCase):
+    topics = SAMPLE_TOPICS
+
+    def setUp(self):
+        fd, self.json_file = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.topics, f)
+        self.indexer = ArticleIndexer(self.json_file)
+        self.indexer.index_all()
+
+    def tearDown(self):
+        os.remove(self.json_file)
+
+
+class TestRelatedArticles(IndexerTestCase):
+    def test_related_articles_prefers_similar_content(self):
+        related = self.indexer.get_related_articles("article_1_001", limit=1)
+        self.assertEqual(related, ["article_1_002"])
+
+    def test_added_articles_join_the_lsh(self):
+        self.indexer.add_articles([{
+            "url": "https://example.com/fw",
+            "title": "Firewall guide",
+            "content": "A firewall filters network traffic using packet rules and stateful inspection",
+        }])
+        related = self.indexer.get_related_articles("article_1_001", limit=5)
+        new_id = "web_" + hashlib.md5(b"https://example.com/fw").hexdigest()[:10]
+        self.assertIn(new_id, related)
+
+
+class TestArticleBST(IndexerTestCase):
+    def test_lookup_and_prefix_scan(self):
+        self.assertEqual(self.indexer.search_article_bst("article_2_001").title, "What is encryption")
+        self.assertIsNone(self.indexer.search_article_bst("article_9_001"))
+        self.assertEqual([a.unique_id for a in self.indexer.get_articles_by_id_prefix("article_1_")],
+                         ["article_1_001", "article_1_002"])
+
+
+class TestLazyAuxiliaryStructures(IndexerTestCase):
+    def test_index_all_builds_core_index_only(self):
+        self.assertEqual(self.indexer._auxiliary_structures, {})
+        self.assertIn("firewall", self.indexer.word_to_articles)
+        self.assertTrue(self.indexer.vocabulary_trie.search("firewall"))
+        self.assertEqual(set(self.indexer._auxiliary_structures), {"vocabulary_trie"})
+
+    def test_built_structures_follow_add_articles(self):
+        self.indexer.warm_auxiliary_structures(background=False)
+        self.indexer.add_articles([make_article("web_ransomware", "Ransomware explained",
+                                                "Ransomware encrypts victim files and demands payment",
+                                                "https://example.com/ransomware")])
+        self.assertIsNotNone(self.indexer.search_article_bst("web_ransomware"))
+        self.assertTrue(self.indexer.vocabulary_trie.search("ransomware"))
+        self.assertIn("web_ransomware", self.indexer.article_graph.get_all_vertices())
+        self.assertEqual(len(self.indexer.get_articles_by_topic_tree("Web Search")), 1)
+
+    def test_background_warmup(self):
+        thread = self.indexer.warm_auxiliary_structures(background=True)
+        thread.join(timeout=5)
+        self.assertEqual(set(self.indexer._auxiliary_structures), set(ArticleIndexer.AUXILIARY_STRUCTURES))
+
+
+class TestSnapshotIsolation(IndexerTestCase):
+    def new_articles(self, start, count):
+        return [make_article(f"web_{n}", f"Firewall note {n}",
+                             "firewall packet inspection " + " ".join(letters(n * 20 + k) for k in range(20)),
+                             f"https://example.com/{n}")
+                for n in range(start, start + count)]
+
+    def test_published_snapshot_is_unchanged_by_writers(self):
+        before = self.indexer.snapshot()
+        postings_before = set(before.get_articles_by_word("firewall"))
+        self.indexer.add_articles(self.new_articles(0, 3))
+        after = self.indexer.snapshot()
+        self.assertEqual(after.generation, before.generation + 1)
+        self.assertEqual(before.total_articles, 3)
+        self.assertEqual(before.get_articles_by_word("firewall"), postings_before)
+        self.assertEqual(after.total_articles, 6)
+        self.assertIn("web_0", after.get_articles_by_word("firewall"))
+
+    def test_idf_follows_snapshot_generation(self):
+        ranker = TFIDFRanker(self.indexer)
+        self.indexer.add_articles(self.new_articles(0, 3))
+        results, _ = ranker.rank_articles("firewall packet", top_k=10)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(ranker._idf_state[0], self.indexer.generation)
+
+    def test_concurrent_searches_during_add_articles(self):
+        ranker = TFIDFRanker(self.indexer)
+        errors = []
+
+        def search():
+            try:
+                for _ in range(30):
+                    ranker.rank_articles("firewall packet inspection", top_k=15)
+            except Exception as exc:  # pragma: no cover - failure path
+                errors.append(exc)
+
+        readers = [threading.Thread(target=search) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for batch in range(20):
+            self.indexer.add_articles(self.new_articles(batch * 5, 5))
+            ranker.update_idf()
+        for reader in readers:
+            reader.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.indexer.total_articles, 103)
+
+
+class TestPrefixRanking(IndexerTestCase):
+    def test_unfinished_word_is_expanded(self):
+        ranker = TFIDFRanker(self.indexer)
+        results, completions = ranker.rank_prefix("Stateful fire")
+        self.assertEqual(completions, ["Stateful firewall"])
+        self.assertEqual([a.unique_id for a, _ in results], ["article_1_002", "article_1_001"])
+        results, completions = ranker.rank_prefix("encr")
+        self.assertEqual(completions, ["encryption"])
+        self.assertEqual([a.unique_id for a, _ in results], ["article_2_001"])
+
+    def test_finished_words_match_exactly(self):
+        ranker = TFIDFRanker(self.indexer)
+        results, completions = ranker.rank_prefix("cipher ")
+        self.assertEqual(completions, [])
+        self.assertEqual([a.unique_id for a, _ in results], ["article_2_001"])
+        # Prefixes shorter than MIN_PREFIX and stop words are not expanded
+        self.assertEqual(ranker.rank_prefix("the f"), ([], []))
+        self.assertEqual(ranker.rank_prefix(""), ([], []))
+
+    def test_postings_cache_follows_generation(self):
+        ranker = TFIDFRanker(self.indexer)
+        ranker.rank_prefix("packet ")
+        self.assertIn("packet", ranker._postings_state[1])
+        self.indexer.add_articles([make_article("web_fw", "Packet filter", "packet filter rules for routers")])
+        results, _ = ranker.rank_prefix("packet ")
+        self.assertIn("web_fw", [a.unique_id for a, _ in results])
+        self.assertEqual(ranker._postings_state[0], self.indexer.generation)
+
+    def test_budget_limits_expansion_scoring(self):
+        ranker = TFIDFRanker(self.indexer)
+        results, completions = ranker.rank_prefix("fi", budget=0)
+        # Completions are still offered, but no posting list was scored
+        self.assertIn("firewall", completions)
+        self.assertEqual(results, [])
+
+
+class TestNearDuplicateFiltering(IndexerTestCase):
+    topics = SAMPLE_TOPICS + [
+        {
+            "topic": "3. Mirrors",
+            "queries": [],
+            "articles": [
+                make_article("article_3_001", "Just a moment...",
+                             "Just a moment...Enable JavaScript and cookies to continue"),
+                make_article("article_3_002", "Just a moment...",
+                             "Just a moment...Enable JavaScript and cookies to continue"),
+            ],
+        },
+    ]
+
+    def test_duplicates_skipped_at_load(self):
+        self.assertEqual(self.indexer.total_articles, 4)
+        self.assertEqual(self.indexer.duplicate_of, {"article_3_002": "article_3_001"})
+        self.assertEqual(self.indexer.get_article("article_3_002").unique_id, "article_3_001")
+
+    def test_duplicates_skipped_in_add_articles(self):
+        added = self.indexer.add_articles([{
+            "url": "https://mirror.example.com/firewall",
+            "title": "What is a firewall",
+            "content": "A firewall filters network traffic using packet rules and stateful inspection",
+        }])
+        self.assertEqual(added, 0)
+        self.assertEqual(self.indexer.total_articles, 4)
+
+    def test_filtering_can_be_disabled(self):
+        indexer = ArticleIndexer(self.json_file, near_duplicate_distance=None)
+        indexer.index_all()
+        self.assertEqual(indexer.total_articles, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
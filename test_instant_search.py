@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from indexer import ArticleIndexer
+from instant_search import InstantSearch
+from tfidf import TFIDFRanker
+from test_indexer import SAMPLE_TOPICS
+
+
+class ManualScheduler:
+    """Stands in for root.after/after_cancel; jobs run when the test says so"""
+
+    def __init__(self):
+        self.jobs = {}
+        self.next_id = 0
+
+    def schedule(self, delay_ms, fn):
+        self.next_id += 1
+        self.jobs[self.next_id] = fn
+        return self.next_id
+
+    def unschedule(self, job_id):
+        self.jobs.pop(job_id, None)
+
+    def run_pending(self):
+        jobs, self.jobs = list(self.jobs.values()), {}
+        for fn in jobs:
+            fn()
+
+
+class SlowRanker:
+    def __init__(self, delay):
+        self.delay = delay
+        self.queries = []
+
+    def rank_prefix(self, query, top_k=5, budget=None):
+        self.queries.append(query)
+        time.sleep(self.delay)
+        return [], [query + "s"]
+
+
+class TestInstantSearch(unittest.TestCase):
+    def setUp(self):
+        fd, self.json_file = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(SAMPLE_TOPICS, f)
+        indexer = ArticleIndexer(self.json_file)
+        indexer.index_all()
+        self.ranker = TFIDFRanker(indexer)
+        self.scheduler = ManualScheduler()
+        self.delivered = []
+        self.arrived = threading.Event()
+
+    def tearDown(self):
+        os.remove(self.json_file)
+
+    def deliver(self, token, preview):
+        self.delivered.append(preview)
+        self.arrived.set()
+
+    def instant(self, ranker):
+        search = InstantSearch(ranker, self.deliver, self.scheduler.schedule, self.scheduler.unschedule)
+        self.addCleanup(search.shutdown)
+        return search
+
+    def test_keystrokes_are_debounced_into_one_preview(self):
+        search = self.instant(self.ranker)
+        for text in ("f", "fi", "fir", "fire"):
+            search.on_text(text)
+        self.assertEqual(len(self.scheduler.jobs), 1)
+        self.scheduler.run_pending()
+        self.assertTrue(self.arrived.wait(2))
+
+        preview = self.delivered[0]
+        self.assertEqual(preview.query, "fire")
+        self.assertEqual(preview.completions, ["firewall"])
+        self.assertEqual(sorted(a.unique_id for a, _ in preview.results), ["article_1_001", "article_1_002"])
+        self.assertEqual((search.keystrokes, search.dropped, search.previews), (4, 3, 1))
+
+    def test_preview_superseded_while_ranking_is_dropped(self):
+        ranker = SlowRanker(0.3)
+        search = self.instant(ranker)
+        search.on_text("ran")
+        self.scheduler.run_pending()
+        time.sleep(0.05)
+        search.on_text("rans")
+        self.scheduler.run_pending()
+        self.assertTrue(self.arrived.wait(2))
+        time.sleep(0.4)
+        self.assertEqual([p.query for p in self.delivered], ["rans"])
+        self.assertEqual(ranker.queries, ["ran", "rans"])
+
+    def test_blank_text_and_submit_cancel_pending_previews(self):
+        ranker = SlowRanker(0)
+        search = self.instant(ranker)
+        search.on_text("worm")
+        search.on_text("   ")
+        self.assertEqual(self.scheduler.jobs, {})
+        search.on_text("worm")
+        search.cancel()
+        self.scheduler.run_pending()
+        time.sleep(0.05)
+        self.assertEqual((ranker.queries, self.delivered), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
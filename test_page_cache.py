@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from crawler3 import SimpleCrawler
+from page_cache import PageCache, normalize_url
+from test_support import FixtureHandler, serve
+
+PAGE = b"<html><head><title>Cached page</title></head><body><p>ransomware encryption keys</p></body></html>"
+ETAG = '"v1"'
+
+
+class ValidatingHandler(FixtureHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == ETAG:
+            self.server.not_modified += 1
+            self.send_page(status=304, content_type=None, ETag=ETAG)
+            return
+        self.server.full_responses += 1
+        self.send_page(PAGE, ETag=ETAG)
+
+
+class TestPageCache(unittest.TestCase):
+    def setUp(self):
+        self.server, base_url = serve(self, ValidatingHandler, not_modified=0, full_responses=0, connections=0)
+        self.url = base_url + "/article?b=2&a=1#intro"
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmpdir.name, "cache.sqlite3")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_normalize_url(self):
+        self.assertEqual(normalize_url("HTTPS://Example.COM:443/a?z=1&b=2#frag"), "https://example.com/a?b=2&z=1")
+        self.assertEqual(normalize_url("http://example.com"), "http://example.com/")
+        self.assertEqual(normalize_url("http://example.com:8080/x"), "http://example.com:8080/x")
+
+    def test_fresh_entries_skip_the_network(self):
+        crawler = SimpleCrawler(cache=PageCache(self.cache_path))
+        first = crawler.get_page_info(self.url)
+        second = crawler.get_page_info(self.url.replace("b=2&a=1", "a=1&b=2"))
+        self.assertEqual(first, second)
+        self.assertEqual(first[0], "Cached page")
+        self.assertEqual((self.server.full_responses, self.server.not_modified), (1, 0))
+        self.assertEqual((crawler.cache.misses, crawler.cache.hits), (1, 1))
+
+    def test_stale_entries_are_revalidated(self):
+        SimpleCrawler(cache=PageCache(self.cache_path)).get_page_info(self.url)
+        # Reopen the file with a zero TTL: every lookup must revalidate
+        crawler = SimpleCrawler(cache=PageCache(self.cache_path, ttl=0))
+        crawler.extract_page_info = None  # a 304 must not reach the parser
+        self.assertEqual(crawler.get_page_info(self.url)[0], "Cached page")
+        self.assertEqual((self.server.full_responses, self.server.not_modified), (1, 1))
+        self.assertEqual(crawler.cache.revalidated, 1)
+
+    def test_entries_of_another_extractor_are_misses(self):
+        SimpleCrawler(cache=PageCache(self.cache_path), extractor="streaming").get_page_info(self.url)
+        crawler = SimpleCrawler(cache=PageCache(self.cache_path), extractor="main_content")
+        # Fresh, but extracted differently: fetched and parsed again in full
+        self.assertEqual(crawler.get_page_info(self.url)[0], "Cached page")
+        self.assertEqual((self.server.full_responses, self.server.not_modified), (2, 0))
+        self.assertEqual(crawler.cache.get(self.url).extractor, "main_content")
+        crawler.get_page_info(self.url)
+        self.assertEqual((crawler.cache.misses, crawler.cache.hits), (1, 1))
+
+    def test_cache_files_without_extractor_column_are_upgraded(self):
+        import sqlite3
+        conn = sqlite3.connect(self.cache_path)
+        conn.execute("CREATE TABLE pages (url TEXT PRIMARY KEY, title TEXT, content TEXT,"
+                     " etag TEXT, last_modified TEXT, fetched_at REAL)")
+        conn.execute("INSERT INTO pages VALUES (?, 'Old', 'Old Old text', NULL, NULL, 9e99)", (normalize_url(self.url),))
+        conn.commit()
+        conn.close()
+        crawler = SimpleCrawler(cache=PageCache(self.cache_path))
+        self.assertEqual(crawler.get_page_info(self.url)[0], "Cached page")
+        self.assertEqual(self.server.full_responses, 1)
+
+    def test_fetches_reuse_one_keep_alive_connection(self):
+        crawler = SimpleCrawler()
+        self.addCleanup(crawler.close)
+        for _ in range(3):
+            self.assertEqual(crawler.get_page_info(self.url)[0], "Cached page")
+        self.assertEqual((self.server.full_responses, self.server.connections), (3, 1))
+
+    def test_crawl_urls_shares_the_cache(self):
+        # crawl_urls runs on the asyncio engine; it reads and revalidates the same entries
+        pages = SimpleCrawler(cache=PageCache(self.cache_path, ttl=0)).crawl_urls([self.url])
+        pages += SimpleCrawler(cache=PageCache(self.cache_path, ttl=0)).crawl_urls([self.url])
+        self.assertEqual([p["title"] for p in pages], ["Cached page"] * 2)
+        self.assertEqual((self.server.full_responses, self.server.not_modified), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
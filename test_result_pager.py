@@ -0,0 +1,68 @@
+import unittest
+from indexer import Article
+from result_pager import ResultPager
+
+
+def ranked(count):
+    articles = [Article(f"article_{i:03d}", f"Title {chr(ord('z') - i % 26)}", "content", f"https://example.com/{i}",
+                        f"2024-01-{i % 28 + 1:02d}T00:00:00Z", "1. Test")
+                for i in range(count)]
+    return [(article, 1.0 / (i + 1)) for i, article in enumerate(articles)]
+
+
+class TestResultPager(unittest.TestCase):
+    def test_pages_through_cached_results(self):
+        pager = ResultPager(page_size=15)
+        pager.set_results(ranked(40))
+        self.assertEqual((pager.page_number, pager.page_count, len(pager)), (1, 3, 40))
+        self.assertEqual([a.unique_id for a, _ in pager.page()][:2], ["article_000", "article_001"])
+        self.assertFalse(pager.has_prev)
+        self.assertTrue(pager.next_page())
+        self.assertTrue(pager.next_page())
+        self.assertEqual(len(pager.page()), 10)
+        self.assertEqual(pager.page()[0][0].unique_id, "article_030")
+        self.assertFalse(pager.next_page())
+        self.assertTrue(pager.prev_page())
+        self.assertEqual(pager.cursor, 15)
+
+    def test_sorting_reorders_cache_and_restores_relevance(self):
+        pager = ResultPager(page_size=5)
+        results = ranked(12)
+        pager.set_results(results)
+        pager.next_page()
+        pager.sort("A-z")
+        self.assertEqual(pager.cursor, 0)
+        titles = [a.title for a, _ in pager.results]
+        self.assertEqual(titles, sorted(titles, key=str.lower))
+        pager.sort("Newest")
+        self.assertEqual(pager.results[0][0].timestamp, "2024-01-12T00:00:00Z")
+        # A new ranking keeps the chosen order
+        pager.set_results(results[:3])
+        self.assertEqual([a.unique_id for a, _ in pager.results], ["article_002", "article_001", "article_000"])
+        pager.sort("Relevance")
+        self.assertEqual(pager.results, results[:3])
+
+    def test_refresh_keeps_the_current_page(self):
+        pager = ResultPager(page_size=5)
+        results = ranked(12)
+        pager.set_results(results[:8])
+        pager.next_page()
+        # Web results arrive while page 2 is shown
+        pager.set_results(results, keep_page=True)
+        self.assertEqual((pager.page_number, pager.page_count), (2, 3))
+        self.assertEqual(pager.page()[0][0].unique_id, "article_005")
+        pager.next_page()
+        pager.set_results(results[:7], keep_page=True)
+        self.assertEqual((pager.page_number, pager.page_count), (2, 2))
+        # A new query starts over
+        pager.set_results(results)
+        self.assertEqual(pager.page_number, 1)
+
+    def test_empty(self):
+        pager = ResultPager()
+        pager.clear()
+        self.assertEqual((pager.page(), pager.page_count, pager.has_next), ([], 1, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
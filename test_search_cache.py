@@ -0,0 +1,77 @@
+import os
+import tempfile
+import time
+import unittest
+from search_cache import SearchCache, normalize_query
+from web_searcher import WebSearcher, StaticProvider
+
+URLS = ["https://a.example/xss", "https://b.example/xss", "https://c.example/xss"]
+
+
+class TestSearchCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmpdir.name, "searches.sqlite3")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def searcher(self, provider, **cache_options):
+        cache = SearchCache(self.cache_path, **cache_options)
+        searcher = WebSearcher(providers=[provider], cache=cache)
+        self.addCleanup(searcher.close)
+        self.addCleanup(cache.close)
+        return searcher
+
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query("  Cross  Site\tScripting cybersecurity "), "cross site scripting cybersecurity")
+
+    def test_repeated_query_skips_providers_across_restarts(self):
+        provider = StaticProvider(URLS)
+        self.assertEqual(self.searcher(provider).get_search_results("XSS", limit=3), URLS)
+        # A new searcher over the same file: as after an app restart
+        searcher = self.searcher(provider)
+        self.assertEqual(searcher.get_search_results("  xss ", limit=3), URLS)
+        self.assertEqual(searcher.get_search_results("xss", limit=2), URLS[:2])
+        self.assertEqual(provider.calls, 1)
+        self.assertEqual(searcher.cache.hits, 2)
+
+    def test_smaller_cached_answer_does_not_serve_bigger_request(self):
+        provider = StaticProvider(URLS)
+        searcher = self.searcher(provider)
+        searcher.get_search_results("xss", limit=1)
+        self.assertEqual(searcher.get_search_results("xss", limit=3), URLS)
+        self.assertEqual(provider.calls, 2)
+
+    def test_expired_entries_are_refetched(self):
+        provider = StaticProvider(URLS)
+        searcher = self.searcher(provider, ttl=0.05)
+        searcher.get_search_results("xss", limit=3)
+        time.sleep(0.1)
+        searcher.get_search_results("xss", limit=3)
+        self.assertEqual(provider.calls, 2)
+
+    def test_negative_results_are_cached_briefly(self):
+        blocked = StaticProvider([], error=ConnectionError("blocked"))
+        searcher = self.searcher(blocked, negative_ttl=0.2)
+        first = searcher.get_search_results("xss", limit=3)
+        self.assertEqual(first[0], "https://en.wikipedia.org/wiki/xss")
+        self.assertEqual(searcher.get_search_results("xss", limit=3), first)
+        self.assertEqual(blocked.calls, 1)
+        self.assertEqual(searcher.cache.get("xss cybersecurity"), [])
+        time.sleep(0.25)
+        self.assertIsNone(searcher.cache.get("xss cybersecurity"))
+
+    def test_size_cap_evicts_oldest(self):
+        cache = SearchCache(self.cache_path, max_entries=2)
+        self.addCleanup(cache.close)
+        for query in ("worm", "trojan", "rootkit"):
+            cache.put(query, URLS, 3)
+            time.sleep(0.01)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("worm"))
+        self.assertEqual(cache.get("rootkit", 3), URLS)
+
+
+if __name__ == "__main__":
+    unittest.main()
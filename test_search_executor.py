@@ -0,0 +1,55 @@
+import threading
+import time
+import unittest
+from search_executor import SearchExecutor
+
+
+class TestSearchExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = SearchExecutor(max_workers=1)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_new_search_supersedes_the_running_one(self):
+        started = threading.Event()
+
+        def slow_search(token):
+            started.set()
+            # Stands in for a crawl that checks its token between pages
+            return "cancelled" if token.wait(5) else "finished"
+
+        first_token, first = self.executor.submit(slow_search)
+        started.wait(1)
+        second_token, second = self.executor.submit(lambda token: "latest")
+        self.assertEqual(first.result(timeout=1), "cancelled")
+        self.assertEqual(second.result(timeout=1), "latest")
+        self.assertTrue(first_token.is_set())
+        self.assertFalse(self.executor.is_current(first_token))
+        self.assertTrue(self.executor.is_current(second_token))
+        self.assertEqual(self.executor.superseded, 1)
+
+    def test_queued_searches_never_start(self):
+        ran = []
+        blocker = threading.Event()
+        # Keeps the only worker busy until both searches below are submitted
+        self.executor.submit(lambda token: blocker.wait(5))
+        _, queued = self.executor.submit(lambda token: ran.append("queued"))
+        _, latest = self.executor.submit(lambda token: ran.append("latest"))
+        self.assertTrue(queued.cancelled())
+        blocker.set()
+        latest.result(timeout=1)
+        self.assertEqual(ran, ["latest"])
+        self.assertEqual(self.executor.submitted, 3)
+
+    def test_cancel_without_replacement(self):
+        token, future = self.executor.submit(lambda token: token.wait(5))
+        start = time.monotonic()
+        self.executor.cancel()
+        self.assertTrue(future.result(timeout=1) or future.cancelled())
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertFalse(self.executor.is_current(token))
+
+
+if __name__ == "__main__":
+    unittest.main()
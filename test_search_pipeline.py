@@ -0,0 +1,142 @@
+import threading
+import time
+import unittest
+from crawler3 import SimpleCrawler
+from indexer import ArticleIndexer
+from search_pipeline import stream_search, local_first_search, result_ids
+from tfidf import TFIDFRanker
+from web_searcher import WebSearcher, StaticProvider
+from test_indexer import letters, SAMPLE_TOPICS
+from test_support import FixtureHandler, serve
+
+SLOW_SECONDS = 1.5
+
+
+class TopicHandler(FixtureHandler):
+    def do_GET(self):
+        number = int(self.path.strip("/").split("/")[-1])
+        if self.path.startswith("/slow"):
+            time.sleep(SLOW_SECONDS)
+        words = " ".join(letters(number * 100 + i) for i in range(60))
+        self.send_page(f"<html><title>Ransomware page {letters(number)}</title><body>ransomware {words}</body></html>".encode())
+
+
+class PipelineTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server, self.base_url = serve(self, TopicHandler)
+        self.indexer = ArticleIndexer(None)
+        # Unrelated articles so that "ransomware" has a non-zero IDF
+        self.indexer.add_articles([a for topic in SAMPLE_TOPICS for a in topic["articles"]])
+        self.ranker = TFIDFRanker(self.indexer)
+
+
+class TestStreamSearch(PipelineTestCase):
+    def test_updates_arrive_per_page_and_slow_pages_are_dropped(self):
+        urls = [f"{self.base_url}/fast/{i}" for i in (1, 2, 3)] + [f"{self.base_url}/slow/4"]
+        start = time.monotonic()
+        updates = list(stream_search("ransomware", urls, SimpleCrawler(), self.indexer, self.ranker, deadline=0.7,
+                                     batch_window=0))
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, SLOW_SECONDS)
+        final = updates[-1]
+        self.assertTrue(final.done)
+        self.assertEqual(final.indexed, 3)
+        self.assertEqual(len(final.results), 3)
+        self.assertNotIn(f"{self.base_url}/slow/4", [a.url for a, _ in final.results])
+
+        # One progressive update per page, each with one more result
+        progress = [u for u in updates if not u.done]
+        self.assertEqual([len(u.results) for u in progress], [1, 2, 3])
+        self.assertEqual([u.indexed for u in progress], [1, 2, 3])
+        self.assertEqual(self.indexer.total_articles, 6)
+
+    def test_pages_arriving_together_are_indexed_in_one_batch(self):
+        calls = []
+        add_articles = self.indexer.add_articles
+        self.indexer.add_articles = lambda batch: calls.append(len(batch)) or add_articles(batch)
+        urls = [f"{self.base_url}/fast/{i}" for i in range(1, 21)]
+        updates = list(stream_search("ransomware", urls, SimpleCrawler(), self.indexer, self.ranker, batch_window=0.5))
+        self.assertEqual(sum(calls), 20)
+        self.assertLess(len(calls), 20)
+        self.assertEqual(updates[-1].indexed, 20)
+        self.assertEqual(self.indexer.total_articles, 23)
+
+    def test_duplicate_pages_do_not_produce_updates(self):
+        crawler = SimpleCrawler()
+        url = f"{self.base_url}/fast/7"
+        first = list(stream_search("ransomware", [url], crawler, self.indexer, self.ranker))
+        # A second crawler has not seen the URL, but the index already holds the page
+        again = list(stream_search("ransomware", [url], SimpleCrawler(), self.indexer, self.ranker))
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(again), 1)
+        self.assertEqual((again[0].indexed, len(again[0].results)), (0, 1))
+
+
+class BrokenSearcher:
+    def get_search_results(self, query, limit=5, cancel=None):
+        raise ConnectionError("offline")
+
+
+class TestLocalFirstSearch(PipelineTestCase):
+    def web(self, paths, delay=0.0):
+        searcher = WebSearcher(providers=[StaticProvider([self.base_url + p for p in paths], delay=delay)])
+        self.addCleanup(searcher.close)
+        return searcher
+
+    def test_local_results_do_not_wait_for_the_web(self):
+        built = []
+
+        def build(factory, *args):
+            built.append(factory.__name__)
+            return factory(*args)
+
+        start = time.monotonic()
+        updates = local_first_search("firewall", lambda: build(self.web, ["/fast/1"], 0.5),
+                                     lambda: build(SimpleCrawler), self.indexer, self.ranker)
+        local = next(updates)
+        self.assertLess(time.monotonic() - start, 0.2)
+        # Neither the web searcher nor the crawler is built before the local results are out
+        self.assertEqual(built, [])
+        self.assertEqual((local.indexed, local.done), (0, False))
+        self.assertEqual(sorted(result_ids(local.results)), ["article_1_001", "article_1_002"])
+
+        # The crawled page does not mention firewalls: no refresh, only the final update
+        rest = list(updates)
+        self.assertEqual(built, ["web", "SimpleCrawler"])
+        self.assertEqual(len(rest), 1)
+        self.assertTrue(rest[0].done)
+        self.assertEqual(rest[0].indexed, 1)
+        self.assertEqual(result_ids(rest[0].results), result_ids(local.results))
+
+    def test_web_articles_refresh_the_ranking(self):
+        updates = list(local_first_search("ransomware", lambda: self.web(["/fast/1", "/fast/2"]),
+                                          SimpleCrawler, self.indexer, self.ranker))
+        self.assertEqual(updates[0].results, [])
+        # Both pages arrive within one batch window, or one after the other
+        self.assertIn([len(u.results) for u in updates[1:]], ([2, 2], [1, 2, 2]))
+        self.assertTrue(updates[-1].done)
+
+    def test_web_failure_keeps_local_results(self):
+        updates = list(local_first_search("encryption", BrokenSearcher, SimpleCrawler, self.indexer, self.ranker))
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(result_ids(updates[1].results), ["article_2_001"])
+        self.assertTrue(updates[1].done)
+
+
+    def test_cancelled_search_stops_crawling(self):
+        cancel = threading.Event()
+        updates = local_first_search("ransomware", lambda: self.web([f"/slow/{i}" for i in range(1, 9)]),
+                                     SimpleCrawler, self.indexer, self.ranker, cancel=cancel)
+        self.assertEqual(next(updates).results, [])
+        threading.Timer(0.3, cancel.set).start()
+        start = time.monotonic()
+        self.assertEqual(list(updates), [])
+        self.assertLess(time.monotonic() - start, SLOW_SECONDS)
+        # Only the first batch of fetches started; the queued ones were dropped
+        time.sleep(SLOW_SECONDS + 0.2)
+        self.assertEqual(self.indexer.total_articles, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
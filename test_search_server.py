@@ -0,0 +1,55 @@
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import urlopen
+from search_server import SearchService, SearchHTTPServer
+
+
+class TestSearchServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = SearchService("articles.json")
+        cls.server = SearchHTTPServer(("127.0.0.1", 0), cls.service, workers=4, max_queue=16)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def get(self, path):
+        with urlopen(self.base_url + path, timeout=10) as response:
+            return response.status, json.loads(response.read())
+
+    def test_search_returns_ranked_json(self):
+        status, body = self.get("/search?q=sql+injecton&k=3")
+        self.assertEqual(status, 200)
+        self.assertEqual(body["suggestion"], "sql injection")
+        self.assertEqual(len(body["results"]), 3)
+        expected, _ = self.service.ranker.rank_articles("sql injecton", top_k=3)
+        self.assertEqual([r["id"] for r in body["results"]], [a.unique_id for a, _ in expected])
+
+    def test_bad_requests(self):
+        for path, status in [("/search", 400), ("/search?q=x&k=abc", 400), ("/nope", 404)]:
+            with self.subTest(path=path):
+                with self.assertRaises(HTTPError) as ctx:
+                    self.get(path)
+                self.assertEqual(ctx.exception.code, status)
+
+    def test_concurrent_requests_and_stats(self):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            statuses = list(pool.map(lambda _: self.get("/search?q=phishing")[0], range(24)))
+        self.assertEqual(statuses, [200] * 24)
+        status, health = self.get("/health")
+        self.assertEqual((status, health["status"]), (200, "ok"))
+        _, stats = self.get("/stats")
+        self.assertGreaterEqual(stats["requests"], 24)
+        self.assertIsNotNone(stats["latency_ms"]["p95"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+from startup_profile import ImportTimer, StartupProfile, format_import_report
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def modules_loaded_by(statement):
+    """Module names in sys.modules after running `statement` in a fresh interpreter"""
+    output = subprocess.run([sys.executable, "-c", f"import sys; {statement}; print(' '.join(sys.modules))"],
+                            cwd=HERE, capture_output=True, text=True, check=True).stdout
+    return set(output.split())
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_gui_import_leaves_networking_and_viewers_unloaded(self):
+        loaded = modules_loaded_by("import search_gui")
+        for module in ("requests", "bs4", "googlesearch", "crawler3", "web_searcher",
+                       "search_pipeline", "article_viewers"):
+            self.assertNotIn(module, loaded)
+
+    def test_crawler_and_web_searcher_import_without_http_stack(self):
+        loaded = modules_loaded_by("import crawler3, web_searcher, search_pipeline")
+        for module in ("requests", "bs4", "googlesearch", "lxml"):
+            self.assertNotIn(module, loaded)
+
+
+class TestImportTimer(unittest.TestCase):
+    def setUp(self):
+        self.package_dir = tempfile.mkdtemp()
+        for name, source in (("timed_outer", "import timed_inner\n"), ("timed_inner", "VALUE = 1\n")):
+            with open(os.path.join(self.package_dir, name + ".py"), "w") as f:
+                f.write(source)
+        sys.path.insert(0, self.package_dir)
+        self.addCleanup(sys.path.remove, self.package_dir)
+        self.addCleanup(lambda: [sys.modules.pop(name, None) for name in ("timed_outer", "timed_inner")])
+
+    def test_nested_imports_are_recorded_with_depth_and_self_time(self):
+        timer = ImportTimer()
+        timer.install()
+        try:
+            import timed_outer
+        finally:
+            timer.uninstall()
+        self.assertEqual([(depth, name) for depth, name, _, _ in timer.records],
+                         [(1, "timed_inner"), (0, "timed_outer")])
+        (_, _, inner_self, inner_total), (_, _, outer_self, outer_total) = timer.records
+        self.assertAlmostEqual(outer_self, outer_total - inner_total)
+        # The real loader is restored once the module has run
+        self.assertNotIn("Timed", type(timed_outer.__loader__).__name__)
+        self.assertEqual(timed_outer.timed_inner.VALUE, 1)
+
+        report = format_import_report(timer.records, min_us=0)
+        self.assertIn("|   timed_inner", report)
+        self.assertIn("timed_outer", report.splitlines()[-1])
+
+
+class TestStartupProfile(unittest.TestCase):
+    def test_report_is_printed_once_at_finish(self):
+        profile = StartupProfile(report=True)
+        profile.mark("imports")
+        out = io.StringIO()
+        with redirect_stdout(out):
+            profile.finish()
+            profile.finish()
+            profile.mark("index loaded")
+        self.assertNotIn(profile.import_timer, sys.meta_path)
+        self.assertEqual([phase for phase, _ in profile.phases], ["imports", "interactive", "index loaded"])
+        text = out.getvalue()
+        self.assertEqual(text.count("Startup phases"), 1)
+        self.assertIn("Startup: index loaded at", text)
+
+    def test_silent_without_report(self):
+        with mock.patch.dict(os.environ, {"DSA_STARTUP_REPORT": ""}):
+            profile = StartupProfile.from_environment(["main.py"])
+        self.assertIsNone(profile.import_timer)
+        out = io.StringIO()
+        with redirect_stdout(out):
+            profile.mark("imports")
+            profile.finish()
+        self.assertEqual(out.getvalue(), "")
+
+    def test_enabled_by_flag_or_environment(self):
+        with mock.patch.dict(os.environ, {"DSA_STARTUP_REPORT": "1"}):
+            from_env = StartupProfile.from_environment(["main.py"])
+        from_flag = StartupProfile.from_environment(["main.py", "--startup-report"])
+        for profile in (from_env, from_flag):
+            profile.import_timer.uninstall()
+            self.assertTrue(profile.report)
+
+
+if __name__ == "__main__":
+    unittest.main()
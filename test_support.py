@@ -0,0 +1,73 @@
+"""
+Helpers shared by the test modules: a throwaway local HTTP server for the
+crawler tests and article dicts in the indexer's input format.
+
+    class Handler(FixtureHandler):
+        def do_GET(self):
+            self.send_page(b"<html><title>T</title><body>text</body></html>")
+
+    server, base_url = serve(self, Handler, hits=0)
+"""
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Tuple
+
+
+def make_article(unique_id, title, content, url=None, timestamp="2025-12-01T00:00:00Z"):
+    return {
+        "unique_id": unique_id,
+        "timestamp": timestamp,
+        "url": url or f"https://example.com/{unique_id}",
+        "title": title,
+        "content": content,
+    }
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Quiet request handler; subclasses implement do_GET with send_page()"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_page(self, body: bytes = b"", status: int = 200, content_type: Optional[str] = "text/html",
+                  **headers) -> None:
+        """Send a complete response; header names use _ for - (ETag=..., Retry_After=...)"""
+        self.send_response(status)
+        if content_type is not None:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name.replace("_", "-"), value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The crawler hung up early (byte budget, deadline, timeout)
+            pass
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The async crawler opens many connections at once
+    request_queue_size = 128
+
+
+def start_server(handler, host: str = "127.0.0.1", **attributes) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve on a free port in a daemon thread; attributes are set on the server for the handler"""
+    server = FixtureServer((host, 0), handler)
+    for name, value in attributes.items():
+        setattr(server, name, value)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def stop_server(server: ThreadingHTTPServer) -> None:
+    server.shutdown()
+    server.server_close()
+
+
+def serve(test_case, handler, host: str = "127.0.0.1", **attributes) -> Tuple[ThreadingHTTPServer, str]:
+    """start_server() that is stopped when the test finishes"""
+    server, base_url = start_server(handler, host, **attributes)
+    test_case.addCleanup(stop_server, server)
+    return server, base_url
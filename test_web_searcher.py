@@ -0,0 +1,87 @@
+import threading
+import time
+import unittest
+from web_searcher import WebSearcher, StaticProvider, CuratedProvider
+
+
+class TestWebSearcher(unittest.TestCase):
+    def searcher(self, *providers, deadline=2.0):
+        searcher = WebSearcher(providers=providers, deadline=deadline)
+        self.addCleanup(searcher.close)
+        return searcher
+
+    def test_first_sufficient_answer_wins_and_late_providers_are_cancelled(self):
+        slow = StaticProvider(["https://slow.example/a", "https://slow.example/b"], delay=5.0, name="slow")
+        fast = StaticProvider(["https://fast.example/a", "https://fast.example/b"], delay=0.05, name="fast")
+        start = time.monotonic()
+        urls = self.searcher(slow, fast).get_search_results("phishing", limit=2)
+        elapsed = time.monotonic() - start
+        self.assertEqual(urls, ["https://fast.example/a", "https://fast.example/b"])
+        self.assertLess(elapsed, 1.0)
+        time.sleep(0.05)
+        self.assertTrue(slow.cancelled)
+
+    def test_failures_do_not_add_up(self):
+        broken = StaticProvider([], delay=0.3, error=ConnectionError("blocked"), name="broken")
+        empty = StaticProvider([], delay=0.3, name="empty")
+        healthy = StaticProvider(["https://ok.example/1", "https://ok.example/2"], delay=0.4, name="healthy")
+        start = time.monotonic()
+        urls = self.searcher(broken, empty, healthy).get_search_results("malware", limit=2)
+        self.assertEqual(urls, ["https://ok.example/1", "https://ok.example/2"])
+        # Concurrent: one 0.4s wait, not 0.3 + 0.3 + 0.4
+        self.assertLess(time.monotonic() - start, 0.9)
+
+    def test_partial_answers_are_merged_in_priority_order(self):
+        first = StaticProvider(["https://a.example/1", "https://shared.example/"], name="first")
+        second = StaticProvider(["https://shared.example/", "https://b.example/1"], delay=0.05, name="second")
+        urls = self.searcher(first, second).get_search_results("botnet", limit=5)
+        self.assertEqual(urls, ["https://a.example/1", "https://shared.example/", "https://b.example/1"])
+
+    def test_deadline_falls_back_to_curated_sources(self):
+        slow = StaticProvider(["https://slow.example/"], delay=5.0, name="slow")
+        start = time.monotonic()
+        urls = self.searcher(slow, deadline=0.2).get_search_results("zero day", limit=3)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(urls, CuratedProvider().search("zero day cybersecurity", 3, None))
+        self.assertEqual(urls[0], "https://en.wikipedia.org/wiki/zero_day")
+
+    def test_failing_provider_is_skipped_after_repeated_failures(self):
+        broken = StaticProvider([], error=ConnectionError("blocked"), name="broken")
+        healthy = StaticProvider(["https://ok.example/1"], delay=0.05, name="healthy")
+        searcher = self.searcher(broken, healthy)
+        for _ in range(4):
+            self.assertEqual(searcher.get_search_results("ransomware", limit=1), ["https://ok.example/1"])
+        self.assertEqual(broken.calls, 2)
+        self.assertEqual(healthy.calls, 4)
+        self.assertTrue(searcher.health.is_open("broken"))
+
+    def test_provider_missing_the_deadline_is_skipped_after_repeated_misses(self):
+        hanging = StaticProvider(["https://slow.example/"], delay=1.0, name="hanging")
+        searcher = self.searcher(hanging, deadline=0.2)
+        for _ in range(4):
+            searcher.race("worm", 1)
+        self.assertEqual(hanging.calls, 2)
+        self.assertTrue(searcher.health.is_open("hanging"))
+
+    def test_losing_the_race_does_not_count_as_a_failure(self):
+        slow = StaticProvider(["https://slow.example/"], delay=5.0, name="slow")
+        fast = StaticProvider(["https://fast.example/"], delay=0.05, name="fast")
+        searcher = self.searcher(slow, fast)
+        for _ in range(3):
+            self.assertEqual(searcher.race("worm", 1), ["https://fast.example/"])
+        self.assertEqual(slow.calls, 3)
+        self.assertFalse(searcher.health.is_open("slow"))
+
+    def test_cancelled_search_returns_nothing(self):
+        slow = StaticProvider(["https://slow.example/"], delay=5.0, name="slow")
+        cancel = threading.Event()
+        threading.Timer(0.2, cancel.set).start()
+        start = time.monotonic()
+        self.assertEqual(self.searcher(slow).get_search_results("worm", limit=1, cancel=cancel), [])
+        self.assertLess(time.monotonic() - start, 1.0)
+        time.sleep(0.05)
+        self.assertTrue(slow.cancelled)
+
+
+if __name__ == "__main__":
+    unittest.main()
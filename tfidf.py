@@ -1,34 +1,60 @@
+import heapq
 import math
+import time
 from collections import Counter
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterable, Callable
 from data_structures import levenshtein_distance
-from indexer import ArticleIndexer, Article
+from indexer import ArticleIndexer, Article, IndexSnapshot
 
 class TFIDFRanker:
     
     def __init__(self, indexer: ArticleIndexer):
         self.indexer = indexer
-        self.idf_cache: Dict[str, float] = {}  # Cache IDF values
-        self._calculate_idf()
+        # IDF values tagged with the index generation they were computed for.
+        # Replaced as a whole (never mutated) so concurrent queries stay consistent.
+        self._idf_state: Tuple[int, Dict[str, float]] = (-1, {})
+        # Per-word (article_id, tf-idf) postings for rank_prefix, same generation tagging
+        self._postings_state: Tuple[int, Dict[str, List[Tuple[str, float]]]] = (-1, {})
+        self.update_idf()
+    
+    @property
+    def idf_cache(self) -> Dict[str, float]:
+        """IDF values for the most recently computed index generation"""
+        return self._idf_state[1]
+    
     def update_idf(self) -> None:
         """Recalculate IDF values (useful after adding new articles)"""
-        self.idf_cache.clear()
-        self._calculate_idf()
+        self._idf_for(self.indexer.snapshot())
+    
+    def _idf_for(self, snapshot: IndexSnapshot) -> Dict[str, float]:
+        """IDF table matching the given snapshot, computed once per generation"""
+        generation, idf = self._idf_state
+        if generation == snapshot.generation:
+            return idf
+        idf = self._calculate_idf(snapshot)
+        # Never let a slow reader replace a newer generation's table
+        if snapshot.generation > self._idf_state[0]:
+            self._idf_state = (snapshot.generation, idf)
+        return idf
 
-    def _calculate_idf(self) -> None:
-        total_docs = self.indexer.total_articles
+    def _calculate_idf(self, snapshot: IndexSnapshot) -> Dict[str, float]:
+        total_docs = snapshot.total_articles
+        idf: Dict[str, float] = {}
         
-        for word in self.indexer.all_words_set:
+        for word, postings in snapshot.word_to_articles.items():
             # Number of documents containing this word
-            doc_freq = len(self.indexer.get_articles_by_word(word))
-            if doc_freq > 0:
-                # IDF = log(total_docs / doc_freq)
-                self.idf_cache[word] = math.log(total_docs / doc_freq)
-            else:
-                self.idf_cache[word] = 0.0
+            idf[word] = self.compute_idf(total_docs, len(postings))
+        return idf
     
-    def _calculate_tf(self, word: str, article_id: str) -> float:
-        word_freq = self.indexer.get_article_word_freq(article_id)
+    @staticmethod
+    def compute_idf(total_docs: int, doc_freq: int) -> float:
+        if doc_freq > 0:
+            # IDF = log(total_docs / doc_freq)
+            return math.log(total_docs / doc_freq)
+        return 0.0
+    
+    def _calculate_tf(self, snapshot: IndexSnapshot, word: str, article_id: str) -> float:
+        word_freq = snapshot.get_article_word_freq(article_id)
         total_words = sum(word_freq.values())
         
         if total_words == 0:
@@ -36,90 +62,92 @@ class TFIDFRanker:
         
         return word_freq.get(word.lower(), 0) / total_words
     
-    def _calculate_tfidf(self, word: str, article_id: str) -> float:
-        tf = self._calculate_tf(word, article_id)
-        idf = self.idf_cache.get(word.lower(), 0.0)
-        return tf * idf
+    def _calculate_tfidf(self, snapshot: IndexSnapshot, idf: Dict[str, float], word: str, article_id: str) -> float:
+        tf = self._calculate_tf(snapshot, word, article_id)
+        return tf * idf.get(word.lower(), 0.0)
     
-    def _tokenize_query(self, query: str) -> List[str]:
+    @staticmethod
+    def _tokenize_query(query: str) -> List[str]:
         import re
         words = re.findall(r'\b[a-z]+\b', query.lower())
         return words
     
-    def rank_articles(self, query: str, top_k: int = 10, min_score: float = 0.001) -> Tuple[List[Tuple[Article, float]], Optional[str]]:
-        query_words = self._tokenize_query(query)
-        
-        if not query_words:
-            return [], None
-        
-        stop_words = {'what', 'is', 'a', 'an', 'the', 'how', 'does', 'do', 'are', 'can', 'i', 'you', 'we', 'they', 'this', 'that', 'these', 'those', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'from', 'by', 'about', 'into', 'through', 'during', 'including', 'against', 'among', 'throughout', 'despite', 'towards', 'upon', 'concerning', 'to', 'of', 'in', 'for', 'on', 'at', 'by', 'with', 'from', 'up', 'about', 'into', 'through', 'during', 'including', 'against', 'among', 'throughout', 'despite', 'towards', 'upon', 'concerning', 'attack', 'attacks'}  # Remove 'attack' as it's too common
-        filtered_query = [w for w in query_words if w not in stop_words and len(w) > 2]
-        
-        if not filtered_query:
-            return [], None
+    STOP_WORDS = {'what', 'is', 'a', 'an', 'the', 'how', 'does', 'do', 'are', 'can', 'i', 'you', 'we', 'they', 'this', 'that', 'these', 'those', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'from', 'by', 'about', 'into', 'through', 'during', 'including', 'against', 'among', 'throughout', 'despite', 'towards', 'upon', 'concerning', 'up', 'attack', 'attacks'}  # 'attack' is too common to be useful
+    
+    @classmethod
+    def filter_query(cls, query: str) -> List[str]:
+        """Query words with stop words and very short words removed"""
+        return [w for w in cls._tokenize_query(query) if w not in cls.STOP_WORDS and len(w) > 2]
+    
+    @staticmethod
+    def closest_word(word: str, vocabulary: Iterable[str]) -> Optional[Tuple[int, str]]:
+        """
+        (distance, word) of the closest vocabulary word within edit distance 2.
+        Ties go to the alphabetically first word so results are deterministic.
+        """
+        best: Optional[Tuple[int, str]] = None
+        for vocab_word in vocabulary:
+            # Optimization: skip words with large length difference
+            if abs(len(vocab_word) - len(word)) > 2:
+                continue
             
-        # Check for misspellings and build suggestion
+            dist = levenshtein_distance(word, vocab_word)
+            if dist <= 2 and (best is None or (dist, vocab_word) < best):
+                best = (dist, vocab_word)
+        return best
+    
+    @staticmethod
+    def correct_terms(filtered_query: List[str], is_known: Callable[[str], bool],
+                      find_match: Callable[[str], Optional[str]]) -> Tuple[List[str], Optional[str]]:
+        """
+        Spell-correct the filtered query. Returns the terms to search for
+        (original words plus any corrections) and the "did you mean" suggestion.
+        """
         suggestion_parts = []
         has_typo = False
         
-        # Get all words from vocabulary if needed (lazy load via trie collection or existing set)
-        vocab_words = None
-        
         processed_query_words = []
         
         for word in filtered_query:
             # If word is in vocabulary, assume it's correct
-            if word in self.indexer.all_words_set:
+            if is_known(word):
                 suggestion_parts.append(word)
                 processed_query_words.append(word)
+                continue
+            
+            # Word matching failed, try fuzzy search
+            best_match = find_match(word)
+            if best_match:
+                suggestion_parts.append(best_match)
+                processed_query_words.append(best_match)
+                has_typo = True
             else:
-                # Word matching failed, try fuzzy search
-                if vocab_words is None:
-                    vocab_words = self.indexer.vocabulary_trie.collect_all_words()
-                
-                best_match = None
-                min_dist = 3  # Start with max distance allowed + 1
-                
-                for vocab_word in vocab_words:
-                    # Optimization: skip words with large length difference
-                    if abs(len(vocab_word) - len(word)) > 2:
-                        continue
-                        
-                    dist = levenshtein_distance(word, vocab_word)
-                    if dist <= 2 and dist < min_dist:
-                        min_dist = dist
-                        best_match = vocab_word
-                
-                if best_match:
-                    suggestion_parts.append(best_match)
-                    processed_query_words.append(best_match)
-                    has_typo = True
-                else:
-                    suggestion_parts.append(word)
-                    processed_query_words.append(word)
+                suggestion_parts.append(word)
+                processed_query_words.append(word)
         
         # Construct suggestion string
         suggestion = " ".join(suggestion_parts) if has_typo else None
         
         # Perform search (using original words if no typo, or corrected words if typo found)
         # We search using BOTH original and corrected to be safe, but boost corrected
-        
         search_terms = filtered_query + ([w for w in processed_query_words if w not in filtered_query])
-        
-        # Calculate TF-IDF score for each article
+        return search_terms, suggestion
+    
+    def score_articles(self, snapshot: IndexSnapshot, idf: Dict[str, float], search_terms: List[str]) -> Dict[str, float]:
+        """TF-IDF score (with match boosts) of every article matching the search terms"""
         article_scores: Dict[str, float] = {}
         
-        for article in self.indexer.get_all_articles():
+        for article in snapshot.get_all_articles():
             score = 0.0
             matched_words = 0
             important_word_matches = 0
             
             for word in search_terms:
-                word_score = self._calculate_tfidf(word, article.unique_id)
+                word_score = self._calculate_tfidf(snapshot, idf, word, article.unique_id)
                 if word_score > 0:
                     score += word_score
                     matched_words += 1
-                    if word in article.title.lower() or self.idf_cache.get(word, 0) > 2.0:
+                    if word in article.title.lower() or idf.get(word, 0) > 2.0:
                         important_word_matches += 1
             
             if matched_words > 0 and (important_word_matches > 0 or score > 0.05):
@@ -129,31 +157,130 @@ class TFIDFRanker:
                 score = score * boost
                 article_scores[article.unique_id] = score
         
-        sorted_articles = sorted(
-            article_scores.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        
+        return article_scores
+    
+    @staticmethod
+    def select_results(sorted_articles: List[Tuple[Article, float]], top_k: int, min_score: float) -> List[Tuple[Article, float]]:
+        """Cut a best-first list of (article, score) down to the final results"""
         if not sorted_articles:
-            return [], suggestion
+            return []
         
         top_score = sorted_articles[0][1]
         
         dynamic_threshold = max(min_score, top_score * 0.05)
         results = []
-        for article_id, score in sorted_articles:
+        for article, score in sorted_articles:
             # Only filter out if score is very low and we already have good results
             if score < dynamic_threshold and len(results) >= 10:
                 break
             
-            article = self.indexer.get_article(article_id)
             if article and score > 0:
                 results.append((article, score))
                 if len(results) >= top_k:
                     break
         
-        return results, suggestion
+        return results
+    
+    def rank_articles(self, query: str, top_k: int = 10, min_score: float = 0.001) -> Tuple[List[Tuple[Article, float]], Optional[str]]:
+        filtered_query = self.filter_query(query)
+        
+        if not filtered_query:
+            return [], None
+        
+        # Pin one index generation for the whole query
+        snapshot = self.indexer.snapshot()
+        idf = self._idf_for(snapshot)
+        
+        def find_match(word: str) -> Optional[str]:
+            match = self.closest_word(word, snapshot.all_words_set)
+            return match[1] if match else None
+        
+        search_terms, suggestion = self.correct_terms(filtered_query, snapshot.all_words_set.__contains__, find_match)
+        
+        # Calculate TF-IDF score for each article
+        article_scores = self.score_articles(snapshot, idf, search_terms)
+        
+        sorted_articles = sorted(
+            ((snapshot.get_article(article_id), score) for article_id, score in article_scores.items()),
+            key=lambda x: x[1],
+            reverse=True
+        )
+        
+        return self.select_results(sorted_articles, top_k, min_score), suggestion
+    
+    MIN_PREFIX = 2
+    
+    def _term_postings(self, snapshot: IndexSnapshot, idf: Dict[str, float], word: str) -> List[Tuple[str, float]]:
+        """(article_id, tf-idf) for every article containing the word, cached per index generation"""
+        generation, cache = self._postings_state
+        if generation != snapshot.generation:
+            cache = {}
+            # A reader pinned to an older generation computes without caching
+            if snapshot.generation > generation:
+                self._postings_state = (snapshot.generation, cache)
+        postings = cache.get(word)
+        if postings is None:
+            postings = [(article_id, self._calculate_tfidf(snapshot, idf, word, article_id))
+                        for article_id in snapshot.get_articles_by_word(word)]
+            cache[word] = postings
+        return postings
+    
+    def rank_prefix(self, query: str, top_k: int = 5, max_expansions: int = 8,
+                    budget: Optional[float] = None) -> Tuple[List[Tuple[Article, float]], List[str]]:
+        """
+        Cheap ranking for search-as-you-type. The last word may be unfinished:
+        it is expanded through the vocabulary trie to its most common
+        completions. Only the postings of the query words are scored (no spell
+        correction, no full scan). Scoring stops once `budget` seconds have
+        passed. Returns (results, completions), where completions are the
+        query with its last word completed.
+        """
+        start = time.perf_counter()
+        words = self._tokenize_query(query)
+        if not words:
+            return [], []
+        # The last word is still being typed unless a space or punctuation follows it
+        partial = words.pop() if query.lower().endswith(words[-1]) else None
+        terms = [w for w in words if w not in self.STOP_WORDS and len(w) > 2]
+        
+        snapshot = self.indexer.snapshot()
+        idf = self._idf_for(snapshot)
+        
+        expansions: List[str] = []
+        if partial and len(partial) >= self.MIN_PREFIX:
+            candidates = [w for w in self.indexer.vocabulary_trie.words_with_prefix(partial, limit=max_expansions * 8)
+                          if w not in self.STOP_WORDS and len(w) > 2]
+            # Most common completions first
+            expansions = heapq.nsmallest(max_expansions, candidates,
+                                         key=lambda w: (-len(snapshot.get_articles_by_word(w)), w))
+        
+        def over_budget() -> bool:
+            return budget is not None and time.perf_counter() - start > budget
+        
+        scores: Dict[str, float] = {}
+        for word in terms:
+            for article_id, weight in self._term_postings(snapshot, idf, word):
+                scores[article_id] = scores.get(article_id, 0.0) + weight
+            if over_budget():
+                break
+        
+        # An article counts once for the unfinished word, by its best completion
+        prefix_scores: Dict[str, float] = {}
+        for word in expansions:
+            if over_budget():
+                break
+            for article_id, weight in self._term_postings(snapshot, idf, word):
+                if weight > prefix_scores.get(article_id, 0.0):
+                    prefix_scores[article_id] = weight
+        for article_id, weight in prefix_scores.items():
+            scores[article_id] = scores.get(article_id, 0.0) + weight
+        
+        top = heapq.nlargest(top_k, ((score, article_id) for article_id, score in scores.items() if score > 0))
+        results = [(snapshot.get_article(article_id), score) for score, article_id in top]
+        
+        base = query[:len(query) - len(partial)] if partial else query
+        completions = [base + word for word in expansions if word != partial]
+        return results, completions
     
     def get_top_articles_for_query(self, query: str, limit: int = 5) -> List[Article]:
         ranked, _ = self.rank_articles(query, top_k=limit)
@@ -1,119 +1,297 @@
-from typing import List
-try:
-    from googlesearch import search
-except ImportError:
-    search = None
+"""
+Web search for the live-crawl phase of the GUI.
+
+Every search provider is queried at the same time. The first provider that
+returns a full page of URLs wins and the others are cancelled. Otherwise the
+partial answers that arrived before the deadline are merged. Only when no
+provider answered in time are the curated sources used. The search phase
+therefore takes as long as the fastest healthy provider, not the sum of
+every failed attempt. With a SearchCache, repeated queries skip the race
+entirely.
+"""
+import importlib.util
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Optional, Sequence, Dict
+from urllib.parse import quote_plus
+
+from host_health import HostHealth
+from search_cache import SearchCache
+
+DEFAULT_SEARCH_DEADLINE = 4.0  # seconds
+CANCEL_POLL_INTERVAL = 0.1  # seconds
+
+CURATED_SOURCES = [
+    "https://thehackernews.com/",
+    "https://www.bleepingcomputer.com/",
+    "https://www.darkreading.com/",
+    "https://krebsonsecurity.com/",
+    "https://www.cisa.gov/news-events/cybersecurity-advisories",
+]
+
+
+class SearchProvider:
+    """A source of result URLs for a query"""
+    name = "base"
+
+    def available(self) -> bool:
+        return True
+
+    def search(self, query: str, limit: int, cancel: threading.Event) -> List[str]:
+        """Up to `limit` URLs; should stop early once `cancel` is set"""
+        raise NotImplementedError
+
+
+class GoogleProvider(SearchProvider):
+    name = "google"
+
+    def __init__(self, lang: str = "en"):
+        self.lang = lang
+
+    def available(self) -> bool:
+        return importlib.util.find_spec("googlesearch") is not None
+
+    def search(self, query: str, limit: int, cancel: threading.Event) -> List[str]:
+        # Imported on first use: googlesearch pulls in requests and bs4 (~115ms)
+        from googlesearch import search
+        results = []
+        # Use advanced=False to get simple URL strings which crawler expects
+        for url in search(query, num_results=limit, lang=self.lang, advanced=False):
+            if cancel.is_set():
+                break
+            results.append(url)
+            if len(results) >= limit:
+                break
+        return results
+
+
+class DuckDuckGoProvider(SearchProvider):
+    """Scrapes the DuckDuckGo HTML endpoint"""
+    name = "duckduckgo"
+
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+
+    def __init__(self, timeout: float = 10):
+        self.timeout = timeout
+
+    def search(self, query: str, limit: int, cancel: threading.Event) -> List[str]:
+        import requests
+        from bs4 import BeautifulSoup
+
+        url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
+        print(f"    Requesting DDG: {url}")
+        resp = requests.get(url, headers=self.HEADERS, timeout=self.timeout)
+        print(f"    DDG Status: {resp.status_code}")
+        if resp.status_code != 200 or cancel.is_set():
+            return []
+
+        soup = BeautifulSoup(resp.content, "html.parser")
+        # DDG HTML results are in 'a.result__a'
+        links = soup.find_all("a", class_="result__a")
+        print(f"    DDG Links found: {len(links)}")
+        if not links:
+            # Try alternative class
+            links = soup.find_all("a", class_="result__url")
+
+        urls = []
+        for link in links:
+            href = link.get("href")
+            if href and href.startswith("http"):
+                urls.append(href)
+                if len(urls) >= limit:
+                    break
+        return urls
+
+
+class CuratedProvider(SearchProvider):
+    """
+    Last resort when live search is blocked: a likely Wikipedia article
+    (very crawlable) plus well-known cybersecurity news sites.
+    """
+    name = "curated"
+
+    def search(self, query: str, limit: int, cancel: threading.Event) -> List[str]:
+        wiki_query = query.replace(" cybersecurity", "").strip().replace(" ", "_")
+        return [f"https://en.wikipedia.org/wiki/{wiki_query}"] + CURATED_SOURCES[:max(0, limit - 1)]
+
+
+class StaticProvider(SearchProvider):
+    """
+    Local provider for tests and offline runs: answers with fixed URLs after
+    `delay` seconds, or raises `error`.
+    """
+
+    def __init__(self, urls: Sequence[str], delay: float = 0.0, error: Optional[Exception] = None,
+                 name: str = "static"):
+        self.urls = list(urls)
+        self.delay = delay
+        self.error = error
+        self.name = name
+        self.calls = 0
+        self.cancelled = False
+
+    def search(self, query: str, limit: int, cancel: threading.Event) -> List[str]:
+        self.calls += 1
+        if cancel.wait(self.delay):
+            self.cancelled = True
+            return []
+        if self.error is not None:
+            raise self.error
+        return self.urls[:limit]
+
 
 class WebSearcher:
     """
-    Fetches search results from the web using Google Search.
+    Fetches search results from the web by racing the search providers.
     """
-    def __init__(self):
+    def __init__(self, providers: Optional[Sequence[SearchProvider]] = None,
+                 deadline: float = DEFAULT_SEARCH_DEADLINE, fallback: Optional[SearchProvider] = None,
+                 cache: Optional[SearchCache] = None):
         self.max_results = 5
         self.lang = "en"
+        # In priority order: merged answers list the earlier providers' URLs first
+        if providers is None:
+            providers = [GoogleProvider(self.lang), DuckDuckGoProvider()]
+        self.providers = list(providers)
+        self.fallback = fallback if fallback is not None else CuratedProvider()
+        self.deadline = deadline
+        # Optional persistent query -> URLs cache (see search_cache.py)
+        self.cache = cache
+        # A provider that keeps failing (usually an IP block) is left out for a while
+        self.health = HostHealth(failure_threshold=2, cooldown=300, max_retries=0)
+        # Seconds each provider took in the latest race, for diagnostics
+        self.last_timings: Dict[str, float] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(4, 2 * len(self.providers)),
+                                            thread_name_prefix="web-search")
 
-    def get_search_results(self, query: str, limit: int = 5) -> List[str]:
+    def get_search_results(self, query: str, limit: int = 5,
+                           cancel: Optional[threading.Event] = None) -> List[str]:
         """
-        Search Google for the query and return a list of URLs.
+        Search the web for the query and return a list of URLs. Once `cancel`
+        is set, the providers are abandoned and an empty list is returned.
         """
-        if not search:
-            print("Error: googlesearch-python library not installed.")
-            return []
-
         print(f"Searching web for: '{query}'...")
-        results = []
+        # Append cybersecurity context to ensure relevant results
+        query += " cybersecurity"
+
+        results = None
+        if self.cache is not None:
+            results = self.cache.get(query, limit)
+            if results is not None:
+                print(f"Using cached search results ({len(results)} URLs)")
+        if results is None:
+            results = self.race(query, limit, cancel=cancel)
+            if cancel is not None and cancel.is_set():
+                return []
+            if self.cache is not None:
+                # Empty results are kept only for the cache's short negative TTL
+                self.cache.put(query, results, limit)
+        if not results:
+            # This ensures the user ALWAYS sees the application working.
+            print("Live search blocked. Using curated cybersecurity sources.")
+            results = self.fallback.search(query, limit, threading.Event())
+        return results[:limit]
+
+    def race(self, query: str, limit: int, deadline: Optional[float] = None,
+             cancel: Optional[threading.Event] = None) -> List[str]:
+        """
+        Query every healthy provider concurrently. Returns the first answer
+        with `limit` URLs, or the merged partial answers once all providers
+        finished, the deadline passed or the caller set `cancel`. Providers
+        still running are cancelled.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        start = time.monotonic()
+        # Tells the providers to give up; set when the race is decided
+        stop = threading.Event()
+        self.last_timings = {}
+
+        futures = {}
+        for position, provider in enumerate(self.providers):
+            if provider.available() and self.health.allow(provider.name):
+                future = self._executor.submit(self._run_provider, provider, query, limit, stop, start)
+                futures[future] = position
+
+        answers: Dict[int, List[str]] = {}
+        pending = set(futures)
         try:
-            # Append cybersecurity context to ensure relevant results
-            query += " cybersecurity"
-            
-            # Use advanced=False to get simple URL strings which crawler expects
-            for url in search(query, num_results=limit, lang=self.lang, advanced=False):
-                results.append(url)
-                if len(results) >= limit:
+            while pending:
+                remaining = deadline - (time.monotonic() - start)
+                if remaining <= 0:
+                    print(f"Web search deadline of {deadline}s reached; "
+                          f"{len(pending)} provider(s) still running")
+                    # Missing the deadline is a failure (e.g. a blocked IP that
+                    # hangs); a provider that always does gets its circuit opened
+                    for future in pending:
+                        self.health.record_failure(self.providers[futures[future]].name, deadline)
                     break
-            # Fallback to DuckDuckGo HTML scraping if Google fails or returns 0
-            if not results:
-                print("Google search returned 0 results. Trying DuckDuckGo...")
-                results = self.search_duckduckgo(query, limit)
+                if cancel is not None:
+                    if cancel.is_set():
+                        break
+                    remaining = min(remaining, CANCEL_POLL_INTERVAL)
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    urls = future.result()
+                    if len(urls) >= limit:
+                        return urls[:limit]
+                    if urls:
+                        answers[futures[future]] = urls
+        finally:
+            # Late providers stop at their next check; queued ones never start
+            stop.set()
+            for future in pending:
+                future.cancel()
 
-            # FINAL FALLBACK: If both fail (likely IP block), return curated cybersecurity URLs + Wikipedia
-            # This ensures the user ALWAYS sees the application working.
-            if not results:
-                print("Live search blocked. Using curated cybersecurity sources.")
-                # Try to construct a likely wikipedia article (very crawlable)
-                wiki_query = query.replace(" cybersecurity", "").strip().replace(" ", "_")
-                
-                results = [
-                    f"https://en.wikipedia.org/wiki/{wiki_query}",
-                    "https://thehackernews.com/",
-                    "https://www.bleepingcomputer.com/",
-                    "https://www.darkreading.com/",
-                    "https://krebsonsecurity.com/",
-                    "https://www.cisa.gov/news-events/cybersecurity-advisories"
-                ][:limit]
+        return self.merge([answers[position] for position in sorted(answers)], limit)
 
+    def _run_provider(self, provider: SearchProvider, query: str, limit: int,
+                      cancel: threading.Event, start: float) -> List[str]:
+        try:
+            urls = provider.search(query, limit, cancel)
         except Exception as e:
-            print(f"Web search failed: {e}")
-            # Try DDG as backup
-            try:
-                results = self.search_duckduckgo(query, limit)
-            except Exception:
-                pass
-            
-            if not results:
-                 results = [
-                    "https://thehackernews.com/",
-                    "https://www.bleepingcomputer.com/",
-                    "https://www.darkreading.com/"
-                ][:limit]
-            
-        return results
+            print(f"{provider.name} search failed: {e}")
+            urls = []
+        elapsed = time.monotonic() - start
+        self.last_timings[provider.name] = elapsed
+        if cancel.is_set():
+            # Lost the race or was cancelled by the caller: says nothing about
+            # the provider's health (race() records missed deadlines itself)
+            return urls
+        if urls:
+            self.health.record_success(provider.name)
+        else:
+            self.health.record_failure(provider.name, elapsed)
+        return urls
+
+    @staticmethod
+    def merge(answers: List[List[str]], limit: int) -> List[str]:
+        """Interleave answers (best provider first) without duplicates"""
+        merged = []
+        seen = set()
+        for rank in range(max((len(urls) for urls in answers), default=0)):
+            for urls in answers:
+                if rank < len(urls) and urls[rank] not in seen:
+                    seen.add(urls[rank])
+                    merged.append(urls[rank])
+        return merged[:limit]
 
     def search_duckduckgo(self, query: str, limit: int = 5) -> List[str]:
-        """Scrape DuckDuckGo HTML (robust fallback)"""
-        import requests
-        from bs4 import BeautifulSoup
-        
-        urls = []
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        
-        # DDG HTML endpoint
-        url = f"https://html.duckduckgo.com/html/?q={query}"
-        
+        """Scrape DuckDuckGo HTML on its own, outside the race"""
         try:
-            print(f"    Requesting DDG: {url}")
-            resp = requests.get(url, headers=headers, timeout=10)
-            print(f"    DDG Status: {resp.status_code}")
-            
-            if resp.status_code == 200:
-                # Debug: save html
-                # with open("ddg_debug.html", "wb") as f: f.write(resp.content)
-                
-                soup = BeautifulSoup(resp.content, "html.parser")
-                
-                # DDG HTML results are in 'a.result__a'
-                links = soup.find_all("a", class_="result__a")
-                print(f"    DDG Links found: {len(links)}")
-                
-                if not links:
-                     # Try alternative class
-                     links = soup.find_all("a", class_="result__url")
-                
-                for link in links:
-                    href = link.get("href")
-                    if href and href.startswith("http"):
-                        urls.append(href)
-                        if len(urls) >= limit:
-                            break
+            return DuckDuckGoProvider().search(query, limit, threading.Event())
         except Exception as e:
             print(f"Error scraping DDG: {e}")
-            
-        return urls
+            return []
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 if __name__ == "__main__":
     # Test
     ws = WebSearcher()
     urls = ws.get_search_results("python 3.12 features", 3)
     print("Found URLs:", urls)
+    print("Provider timings:", ws.last_timings)